@@ -7,95 +7,49 @@ Tracks audit findings and remediation status.
 Features:
 - Add new findings
 - Update existing findings (status, owner, etc.)
-- List and filter findings
-- Storage via JSON file
+- List and filter findings, including due/created date ranges, streamed
+  as a JSON array or JSON lines with paging and field selection
+- Storage via JSON file, an indexed SQLite database or an append-only
+  change log (finding_store.py), with locking so that concurrent calls do
+  not overwrite each other
+- Reconstruct the findings as of a past date from the change log
+- Migrate findings between storage backends
 - Configurable via CLI arguments and optional config file
 """
 
 import argparse
 import json
 import logging
+import os
 import sys
-from dataclasses import dataclass, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any
+
+from finding_store import (
+    BACKEND_CHOICES,
+    FINDING_FIELDS,
+    Finding,
+    FindingQuery,
+    FindingStore,
+    StorageError,
+    date_bound,
+    filter_findings,
+    finding_to_dict,
+    open_store,
+    parse_timestamp,
+)
+
+OUTPUT_FORMATS = ("json", "jsonl")
+
+# Records per write when streaming JSON lines.
+WRITE_BATCH_RECORDS = 1000
 
 # -------------------------
-# Data models
+# Utilities
 # -------------------------
 
 
-@dataclass
-class Finding:
-    """Represents a single audit finding."""
-    id: str
-    title: str
-    description: str
-    status: str
-    owner: str
-    severity: str
-    created_at: str
-    updated_at: str
-    due_date: Optional[str] = None
-    tags: Optional[List[str]] = None
-
-
-# -------------------------
-# Storage and utilities
-# -------------------------
-
-
-def load_findings(storage_path: Path) -> List[Finding]:
-    """
-    Load findings from the JSON storage file.
-
-    Returns an empty list if the file does not exist yet.
-    """
-    if not storage_path.exists():
-        logging.debug("Storage file does not exist yet, returning empty findings list.")
-        return []
-
-    try:
-        with storage_path.open("r", encoding="utf-8") as f:
-            raw = json.load(f)
-    except json.JSONDecodeError as exc:
-        logging.error("Failed to parse JSON from storage file: %s", exc)
-        raise SystemExit(1)
-
-    findings: List[Finding] = []
-    for item in raw:
-        try:
-            findings.append(Finding(**item))
-        except TypeError as exc:
-            logging.warning("Skipping malformed finding entry: %s | error: %s", item, exc)
-    logging.debug("Loaded %d findings from storage.", len(findings))
-    return findings
-
-
-def save_findings(storage_path: Path, findings: List[Finding]) -> None:
-    """
-    Persist findings to the JSON storage file.
-    """
-    try:
-        with storage_path.open("w", encoding="utf-8") as f:
-            json.dump([asdict(finding) for finding in findings], f, indent=2, sort_keys=True)
-        logging.debug("Successfully saved %d findings to storage.", len(findings))
-    except OSError as exc:
-        logging.error("Unable to write findings to storage file: %s", exc)
-        raise SystemExit(1)
-
-
-def find_finding(findings: List[Finding], finding_id: str) -> Optional[Finding]:
-    """
-    Locate a finding by ID.
-    """
-    for finding in findings:
-        if finding.id == finding_id:
-            return finding
-    return None
-
-
 def now_iso() -> str:
     """
     Returns current time in ISO 8601 format.
@@ -108,16 +62,10 @@ def now_iso() -> str:
 # -------------------------
 
 
-def op_add(args: argparse.Namespace, storage_path: Path) -> None:
+def op_add(args: argparse.Namespace, store: FindingStore) -> None:
     """
     Add a new finding to storage.
     """
-    findings = load_findings(storage_path)
-
-    if find_finding(findings, args.id):
-        logging.error("Finding with ID '%s' already exists.", args.id)
-        raise SystemExit(1)
-
     finding = Finding(
         id=args.id,
         title=args.title,
@@ -130,22 +78,32 @@ def op_add(args: argparse.Namespace, storage_path: Path) -> None:
         due_date=args.due_date,
         tags=args.tags or [],
     )
-    findings.append(finding)
-    save_findings(storage_path, findings)
+    with store.transaction():
+        if store.get(args.id) is not None:
+            logging.error("Finding with ID '%s' already exists.", args.id)
+            raise SystemExit(1)
+        store.put(finding)
     logging.info("Added finding with ID '%s'.", finding.id)
 
 
-def op_update(args: argparse.Namespace, storage_path: Path) -> None:
+def op_update(args: argparse.Namespace, store: FindingStore) -> None:
     """
     Update fields of an existing finding.
     """
-    findings = load_findings(storage_path)
-    finding = find_finding(findings, args.id)
+    with store.transaction():
+        finding = store.get(args.id)
+        if not finding:
+            logging.error("Finding with ID '%s' not found.", args.id)
+            raise SystemExit(1)
+        apply_update(finding, args)
+        store.put(finding)
+    logging.info("Updated finding with ID '%s'.", finding.id)
 
-    if not finding:
-        logging.error("Finding with ID '%s' not found.", args.id)
-        raise SystemExit(1)
 
+def apply_update(finding: Finding, args: argparse.Namespace) -> None:
+    """
+    Apply the fields given on the command line to ``finding``.
+    """
     # Update fields only if provided to avoid unintentionally overwriting values
     if args.title:
         finding.title = args.title
@@ -163,34 +121,115 @@ def op_update(args: argparse.Namespace, storage_path: Path) -> None:
         finding.tags = args.tags
 
     finding.updated_at = now_iso()
-    save_findings(storage_path, findings)
-    logging.info("Updated finding with ID '%s'.", finding.id)
 
 
-def op_list(args: argparse.Namespace, storage_path: Path) -> None:
+def op_list(args: argparse.Namespace, store: FindingStore) -> None:
     """
-    List findings, optionally filtered by status/severity/owner/tag.
+    List findings, optionally filtered by status/severity/owner/tag and
+    due/created date ranges.
+
+    Filters are handed to the storage backend (SQLite evaluates them with
+    its indexes) and results are written as they arrive: a JSON array
+    (the default, formatted as before) or JSON lines. With --as-of, the
+    findings are reconstructed as they were at that time.
     """
-    findings = load_findings(storage_path)
+    criteria = FindingQuery(
+        status=args.status,
+        severity=args.severity,
+        owner=args.owner,
+        tag=args.tag,
+        due_from=args.due_from,
+        due_until=args.due_to,
+        created_from=args.created_from,
+        created_until=args.created_to,
+        limit=args.limit,
+        offset=args.offset,
+    )
+    if args.as_of:
+        findings = filter_findings(store.as_of(args.as_of), criteria)
+    else:
+        findings = store.query(criteria)
 
-    def matches(f: Finding) -> bool:
-        """Filter predicate for findings."""
-        if args.status and f.status.lower() != args.status.lower():
-            return False
-        if args.severity and f.severity.lower() != args.severity.lower():
-            return False
-        if args.owner and f.owner.lower() != args.owner.lower():
-            return False
-        if args.tag and (not f.tags or args.tag not in f.tags):
-            return False
-        return True
+    if args.fields:
+        records = ({name: getattr(f, name) for name in args.fields} for f in findings)
+    else:
+        records = (finding_to_dict(f) for f in findings)
 
-    filtered = [f for f in findings if matches(f)]
-    logging.info("Found %d matching findings.", len(filtered))
+    try:
+        count = write_records(records, args.format, sys.stdout)
+    except BrokenPipeError:
+        # The reader (e.g. `head`) has gone; stop quietly.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    logging.info("Found %d matching findings.", count)
+
+
+def write_records(records: Iterator[Dict[str, Any]], output_format: str, out: Any) -> int:
+    """
+    Stream records to ``out`` as a JSON array or as JSON lines.
 
-    # Output in a simple, machine-readable format (JSON to stdout)
-    results: List[Dict[str, Any]] = [asdict(f) for f in filtered]
-    print(json.dumps(results, indent=2, sort_keys=True))
+    The array layout is identical to ``json.dumps(list, indent=2,
+    sort_keys=True)`` but written one record at a time.
+
+    Returns
+    -------
+    int
+        Number of records written.
+    """
+    count = 0
+    if output_format == "jsonl":
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        lines: List[str] = []
+        for record in records:
+            lines.append(encode(record))
+            if len(lines) >= WRITE_BATCH_RECORDS:
+                out.write("\n".join(lines) + "\n")
+                count += len(lines)
+                lines = []
+        if lines:
+            out.write("\n".join(lines) + "\n")
+            count += len(lines)
+        return count
+
+    for record in records:
+        text = json.dumps(record, indent=2, sort_keys=True).replace("\n", "\n  ")
+        out.write(("[\n  " if count == 0 else ",\n  ") + text)
+        count += 1
+    out.write("\n]\n" if count else "[]\n")
+    return count
+
+
+def op_migrate(args: argparse.Namespace, store: FindingStore) -> None:
+    """
+    Copy every finding from another store (e.g., the JSON file) into this one.
+
+    Findings already present are replaced, so the migration can be re-run.
+    """
+    if args.source.resolve() == store.path.resolve():
+        logging.error("Migration source and destination are the same file: %s", args.source)
+        raise SystemExit(1)
+    if not args.source.exists():
+        logging.error("Migration source '%s' does not exist.", args.source)
+        raise SystemExit(1)
+
+    with open_store(args.source, args.source_backend) as source:
+        with store.transaction():
+            count = store.put_many(source.query())
+    logging.info(
+        "Migrated %d findings from %s (%s) to %s (%s).",
+        count,
+        args.source,
+        source.backend,
+        store.path,
+        store.backend,
+    )
+
+
+def op_compact(args: argparse.Namespace, store: FindingStore) -> None:
+    """
+    Compact the storage (journal snapshot, SQLite write-ahead log).
+    """
+    store.compact()
 
 
 # -------------------------
@@ -228,6 +267,52 @@ def load_config(config_path: Optional[Path]) -> Dict[str, Any]:
     return cfg
 
 
+def parse_as_of(value: str) -> datetime:
+    """
+    argparse type for --as-of.
+    """
+    try:
+        return parse_timestamp(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO 8601 date/time: {value!r}")
+
+
+def parse_bound(value: str, upper: bool) -> str:
+    """
+    argparse type for the date range options.
+    """
+    try:
+        return date_bound(value, upper)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO 8601 date/time: {value!r}")
+
+
+def non_negative_int(value: str) -> int:
+    """
+    argparse type for --limit/--offset.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"expected a non-negative integer, got {value!r}")
+    return number
+
+
+def parse_fields(value: str) -> List[str]:
+    """
+    argparse type for --fields.
+    """
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FINDING_FIELDS]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"unknown field(s) {', '.join(unknown) or value!r}; choose from {', '.join(FINDING_FIELDS)}"
+        )
+    return names
+
+
 def build_parser() -> argparse.ArgumentParser:
     """
     Construct the top-level CLI argument parser.
@@ -249,6 +334,15 @@ def build_parser() -> argparse.ArgumentParser:
         help="Path to findings storage JSON file (overrides config)."
     )
 
+    parser.add_argument(
+        "--backend",
+        choices=BACKEND_CHOICES,
+        help=(
+            "Storage backend (overrides config). 'auto' uses sqlite for "
+            ".db/.sqlite/.sqlite3 paths, journal for .jsonl paths and json otherwise."
+        )
+    )
+
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -306,6 +400,81 @@ def build_parser() -> argparse.ArgumentParser:
     list_p.add_argument("--severity", help="Filter by severity.")
     list_p.add_argument("--owner", help="Filter by owner.")
     list_p.add_argument("--tag", help="Filter by single tag.")
+    list_p.add_argument(
+        "--due-from",
+        type=lambda value: parse_bound(value, upper=False),
+        help="Only findings due on/after this ISO date or time."
+    )
+    list_p.add_argument(
+        "--due-to",
+        type=lambda value: parse_bound(value, upper=True),
+        help="Only findings due on/before this ISO date or time."
+    )
+    list_p.add_argument(
+        "--created-from",
+        type=lambda value: parse_bound(value, upper=False),
+        help="Only findings created on/after this ISO date or time."
+    )
+    list_p.add_argument(
+        "--created-to",
+        type=lambda value: parse_bound(value, upper=True),
+        help="Only findings created on/before this ISO date or time."
+    )
+    list_p.add_argument(
+        "--limit",
+        type=non_negative_int,
+        help="Return at most this many findings."
+    )
+    list_p.add_argument(
+        "--offset",
+        type=non_negative_int,
+        default=0,
+        help="Skip this many matching findings first."
+    )
+    list_p.add_argument(
+        "--fields",
+        type=parse_fields,
+        help=f"Comma-separated fields to output (default: all of {','.join(FINDING_FIELDS)})."
+    )
+    list_p.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="Output a JSON array or JSON lines (one finding per line)."
+    )
+    list_p.add_argument(
+        "--as-of",
+        type=parse_as_of,
+        help=(
+            "List findings as they were at this ISO date/time (a bare date means "
+            "the end of that day). Requires the journal backend."
+        )
+    )
+
+    # migrate
+    mig_p = subparsers.add_parser(
+        "migrate", help="Copy findings from another storage file into the configured storage."
+    )
+    mig_p.add_argument(
+        "--from",
+        dest="source",
+        type=Path,
+        required=True,
+        help="Storage file to copy from (e.g., the existing findings.json)."
+    )
+    mig_p.add_argument(
+        "--from-backend",
+        dest="source_backend",
+        choices=BACKEND_CHOICES,
+        default="auto",
+        help="Backend of the --from file."
+    )
+
+    # compact
+    subparsers.add_parser(
+        "compact",
+        help="Fold the change log into a fresh snapshot (journal) or checkpoint the SQLite WAL."
+    )
 
     return parser
 
@@ -342,6 +511,7 @@ def main(argv: Optional[List[str]] = None) -> None:
 
     config = load_config(args.config)
     storage_path = resolve_storage_path(args, config)
+    backend = args.backend or config.get("storage_backend", "auto")
 
     # Apply defaults for add command if not provided via CLI
     if args.command == "add":
@@ -350,18 +520,28 @@ def main(argv: Optional[List[str]] = None) -> None:
         if args.severity is None:
             args.severity = config.get("default_severity", "MEDIUM")
 
-    if args.command == "add":
-        op_add(args, storage_path)
-    elif args.command == "update":
+    operations = {
+        "add": op_add,
+        "update": op_update,
+        "list": op_list,
+        "migrate": op_migrate,
+        "compact": op_compact,
+    }
+    if args.command not in operations:
+        # This should not occur due to `required=True` on subparsers
+        parser.error("Unknown command.")
+
+    if args.command == "update":
         # Special handling to allow clearing due_date when empty string given
         if args.due_date == "":
             args.due_date = None
-        op_update(args, storage_path)
-    elif args.command == "list":
-        op_list(args, storage_path)
-    else:
-        # This should not occur due to `required=True` on subparsers
-        parser.error("Unknown command.")
+
+    try:
+        with open_store(storage_path, backend) as store:
+            operations[args.command](args, store)
+    except StorageError as exc:
+        logging.error("%s", exc)
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
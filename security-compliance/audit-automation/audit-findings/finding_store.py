@@ -0,0 +1,1124 @@
+"""
+finding_store.py
+
+Pluggable storage backends for finding-tracker.py.
+
+Backends:
+- json: the original single JSON array file, now rewritten atomically
+  (temp file + rename) under an exclusive lock file
+- sqlite: a SQLite database in WAL mode with indexes on id, status,
+  severity, owner, tag, due date and creation time; list filters run in
+  SQLite and updates are single-row upserts
+- journal: an append-only JSONL change log (one record per add/update)
+  plus a materialized current-state snapshot that is brought up to date
+  by replaying the log tail and compacted periodically; writes append
+  without loading the snapshot, finding existing ids through a small ID
+  index, and the log also answers point-in-time queries by append time
+
+Every read-modify-write runs inside ``FindingStore.transaction()``, which
+serializes concurrent CLI calls instead of letting the last writer win.
+
+The scripts in this directory import this module by name; it is resolved
+from the script directory, so no installation step is required.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore
+
+BACKEND_CHOICES = ("auto", "json", "sqlite", "journal")
+
+# Storage paths with these suffixes use the sqlite backend under "auto".
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# Storage paths with these suffixes use the journal backend under "auto".
+JOURNAL_SUFFIXES = (".jsonl",)
+
+# Journal records appended after the last snapshot before it is rewritten.
+COMPACT_AFTER_RECORDS = 1000
+
+# Seconds a SQLite writer waits for another process's lock before failing.
+LOCK_TIMEOUT_SECONDS = 30.0
+
+# Rows per executemany() call when importing findings.
+IMPORT_BATCH_ROWS = 5000
+
+
+# -------------------------
+# Data models
+# -------------------------
+
+
+@dataclass
+class Finding:
+    """Represents a single audit finding."""
+    id: str
+    title: str
+    description: str
+    status: str
+    owner: str
+    severity: str
+    created_at: str
+    updated_at: str
+    due_date: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+
+FINDING_FIELDS = tuple(field.name for field in fields(Finding))
+
+_finding_values = attrgetter(*FINDING_FIELDS)
+
+
+@dataclass(frozen=True)
+class FindingQuery:
+    """
+    Filters and result window for FindingStore.query.
+
+    Status, severity and owner match case-insensitively and tags exactly.
+    Date bounds are compared with the stored ISO 8601 strings: ``*_from``
+    is inclusive and ``*_until`` exclusive (see date_bound). A finding
+    without a due date never matches a due date bound. Results come in
+    insertion order; ``offset`` and ``limit`` apply after filtering.
+    """
+    status: Optional[str] = None
+    severity: Optional[str] = None
+    owner: Optional[str] = None
+    tag: Optional[str] = None
+    due_from: Optional[str] = None
+    due_until: Optional[str] = None
+    created_from: Optional[str] = None
+    created_until: Optional[str] = None
+    limit: Optional[int] = None
+    offset: int = 0
+
+    def predicate(self) -> Callable[[Finding], bool]:
+        """
+        Return a function testing one finding against the filters.
+        """
+        # Lowercase the filter values once, not per comparison.
+        status = self.status.lower() if self.status else None
+        severity = self.severity.lower() if self.severity else None
+        owner = self.owner.lower() if self.owner else None
+        tag = self.tag
+        due_from, due_until = self.due_from, self.due_until
+        created_from, created_until = self.created_from, self.created_until
+        due_bounded = due_from is not None or due_until is not None
+
+        def matches(finding: Finding) -> bool:
+            if status and finding.status.lower() != status:
+                return False
+            if severity and finding.severity.lower() != severity:
+                return False
+            if owner and finding.owner.lower() != owner:
+                return False
+            if tag and (not finding.tags or tag not in finding.tags):
+                return False
+            if due_bounded:
+                due = finding.due_date
+                if not due:
+                    return False
+                if due_from is not None and due < due_from:
+                    return False
+                if due_until is not None and due >= due_until:
+                    return False
+            if created_from is not None and finding.created_at < created_from:
+                return False
+            if created_until is not None and finding.created_at >= created_until:
+                return False
+            return True
+
+        return matches
+
+
+ALL_FINDINGS = FindingQuery()
+
+
+class StorageError(RuntimeError):
+    """
+    Raised when the findings storage cannot be read or written.
+    """
+
+
+# -------------------------
+# Storage interface
+# -------------------------
+
+
+class FindingStore:
+    """
+    Interface shared by the storage backends.
+
+    Reads may happen outside a transaction; writes (``put``/``put_many``)
+    must happen inside ``transaction()``, which holds the backend's
+    exclusive lock and commits on success.
+    """
+
+    backend = ""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def __enter__(self) -> "FindingStore":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator["FindingStore"]:
+        """
+        Hold the exclusive write lock; commit when the block succeeds.
+        """
+        raise NotImplementedError
+
+    def get(self, finding_id: str) -> Optional[Finding]:
+        """
+        Return the finding with ``finding_id``, or None.
+        """
+        raise NotImplementedError
+
+    def put(self, finding: Finding) -> None:
+        """
+        Insert or replace a finding (keyed by id).
+        """
+        raise NotImplementedError
+
+    def put_many(self, findings: Iterable[Finding]) -> int:
+        """
+        Insert or replace many findings; returns how many were written.
+        """
+        count = 0
+        for finding in findings:
+            self.put(finding)
+            count += 1
+        return count
+
+    def query(self, criteria: FindingQuery = ALL_FINDINGS) -> Iterator[Finding]:
+        """
+        Yield the findings selected by ``criteria``, in insertion order.
+
+        Results are produced lazily, so callers can stream them.
+        """
+        raise NotImplementedError
+
+    def as_of(self, when: datetime) -> Iterator[Finding]:
+        """
+        Yield the findings as they were at ``when`` (journal backend only).
+        """
+        raise StorageError(f"The {self.backend} backend keeps no history; use the journal backend.")
+
+    def compact(self) -> None:
+        """
+        Reclaim space and fold pending changes into the stored state.
+        """
+        logging.info("Nothing to compact for the %s backend.", self.backend)
+
+    def close(self) -> None:
+        """
+        Release the backend's resources.
+        """
+
+
+def finding_from_dict(item: Dict[str, Any]) -> Finding:
+    """
+    Build a Finding from a stored mapping.
+
+    Raises
+    ------
+    TypeError
+        If fields are missing or unknown.
+    """
+    return Finding(**item)
+
+
+def finding_to_dict(finding: Finding) -> Dict[str, Any]:
+    """
+    Return the fields of a Finding as a mapping.
+
+    Unlike dataclasses.asdict(), values are not deep-copied, which makes
+    serializing many findings several times faster.
+    """
+    return dict(zip(FINDING_FIELDS, _finding_values(finding)))
+
+
+def filter_findings(findings: Iterable[Finding], criteria: FindingQuery) -> Iterator[Finding]:
+    """
+    Apply a query's filters and result window to findings in memory.
+    """
+    selected: Iterator[Finding] = filter(criteria.predicate(), findings)
+    if criteria.offset or criteria.limit is not None:
+        stop = None if criteria.limit is None else criteria.offset + criteria.limit
+        selected = islice(selected, criteria.offset, stop)
+    return selected
+
+
+def date_bound(value: str, upper: bool) -> str:
+    """
+    Turn an ISO 8601 date or timestamp into a FindingQuery bound.
+
+    Bounds are strings in the format the tracker stores (YYYY-MM-DD for
+    dates, YYYY-MM-DDTHH:MM:SSZ for timestamps), so that they compare
+    correctly with stored values and can use the SQLite indexes. Both ends
+    of a user-facing range are inclusive; an upper bound is returned as
+    the exclusive bound just after it (the next day, or the next second).
+
+    Raises
+    ------
+    ValueError
+        If the value is not ISO 8601.
+    """
+    text = value.strip()
+    if len(text) == 10:
+        day = datetime.strptime(text, "%Y-%m-%d")
+        if upper:
+            day += timedelta(days=1)
+        return day.strftime("%Y-%m-%d")
+    moment = parse_timestamp(text)
+    if upper:
+        moment = moment.replace(microsecond=0) + timedelta(seconds=1)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse an ISO 8601 date or timestamp as an aware UTC datetime.
+
+    A bare date (YYYY-MM-DD) means the end of that day, so "as of
+    2025-03-31" includes everything recorded on March 31.
+
+    Raises
+    ------
+    ValueError
+        If the value is not ISO 8601.
+    """
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(text)
+    if len(text) == 10:
+        parsed += timedelta(days=1) - timedelta(microseconds=1)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+# -------------------------
+# JSON file backend
+# -------------------------
+
+
+class JsonFindingStore(FindingStore):
+    """
+    Findings kept as one JSON array file (the original format).
+
+    The whole file is read on first access and indexed by id. A
+    transaction holds an exclusive ``flock`` on ``<path>.lock`` and, if
+    anything changed, replaces the file atomically when it ends.
+    """
+
+    backend = "json"
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._findings: Optional[List[Finding]] = None
+        self._positions: Dict[str, int] = {}
+        self._dirty = False
+        self._lock_file: Optional[Any] = None
+
+    def _load(self) -> List[Finding]:
+        if self._findings is not None:
+            return self._findings
+        findings: List[Finding] = []
+        if not self.path.exists():
+            logging.debug("Storage file does not exist yet, returning empty findings list.")
+        else:
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    raw = json.load(f)
+            except json.JSONDecodeError as exc:
+                raise StorageError(f"Failed to parse JSON from storage file: {exc}") from exc
+            except OSError as exc:
+                raise StorageError(f"Unable to read storage file {self.path}: {exc}") from exc
+            for item in raw:
+                try:
+                    findings.append(finding_from_dict(item))
+                except TypeError as exc:
+                    logging.warning("Skipping malformed finding entry: %s | error: %s", item, exc)
+            logging.debug("Loaded %d findings from storage.", len(findings))
+        self._findings = findings
+        self._positions = {finding.id: index for index, finding in enumerate(findings)}
+        return findings
+
+    def _save(self) -> None:
+        findings = self._load()
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump([finding_to_dict(finding) for finding in findings], f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            raise StorageError(f"Unable to write findings to storage file: {exc}") from exc
+        logging.debug("Successfully saved %d findings to storage.", len(findings))
+
+    @contextmanager
+    def transaction(self) -> Iterator["JsonFindingStore"]:
+        lock_path = self.path.with_name(self.path.name + ".lock")
+        try:
+            self._lock_file = lock_path.open("a")
+        except OSError as exc:
+            raise StorageError(f"Unable to open lock file {lock_path}: {exc}") from exc
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            # Another process may have written since this store last read.
+            self._findings = None
+            self._dirty = False
+            yield self
+            if self._dirty:
+                self._save()
+                self._dirty = False
+        finally:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def get(self, finding_id: str) -> Optional[Finding]:
+        findings = self._load()
+        position = self._positions.get(finding_id)
+        return findings[position] if position is not None else None
+
+    def put(self, finding: Finding) -> None:
+        if self._lock_file is None:
+            raise StorageError("Writes to the findings store require a transaction.")
+        findings = self._load()
+        position = self._positions.get(finding.id)
+        if position is None:
+            self._positions[finding.id] = len(findings)
+            findings.append(finding)
+        else:
+            findings[position] = finding
+        self._dirty = True
+
+    def query(self, criteria: FindingQuery = ALL_FINDINGS) -> Iterator[Finding]:
+        return filter_findings(self._load(), criteria)
+
+
+# -------------------------
+# SQLite backend
+# -------------------------
+
+
+# Schema upgrade scripts; script N brings a database from version N to N + 1.
+SQLITE_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS findings (
+    seq         INTEGER PRIMARY KEY,
+    id          TEXT NOT NULL UNIQUE,
+    title       TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    owner       TEXT NOT NULL,
+    severity    TEXT NOT NULL,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    due_date    TEXT,
+    tags        TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_status ON findings (status COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS findings_severity ON findings (severity COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS findings_owner ON findings (owner COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS finding_tags (
+    tag         TEXT NOT NULL,
+    seq         INTEGER NOT NULL REFERENCES findings (seq),
+    PRIMARY KEY (tag, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS finding_tags_seq ON finding_tags (seq);
+""",
+    """
+CREATE INDEX IF NOT EXISTS findings_due_date ON findings (due_date);
+CREATE INDEX IF NOT EXISTS findings_created_at ON findings (created_at);
+CREATE INDEX IF NOT EXISTS findings_status_severity
+    ON findings (status COLLATE NOCASE, severity COLLATE NOCASE);
+""",
+)
+
+SQLITE_SCHEMA_VERSION = len(SQLITE_SCHEMA)
+
+_UPSERT_SQL = (
+    "INSERT INTO findings ({columns}) VALUES ({placeholders}) "
+    "ON CONFLICT (id) DO UPDATE SET {updates}"
+).format(
+    columns=", ".join(FINDING_FIELDS),
+    placeholders=", ".join("?" for _ in FINDING_FIELDS),
+    updates=", ".join(f"{name} = excluded.{name}" for name in FINDING_FIELDS if name != "id"),
+)
+
+_SELECT_SQL = "SELECT {columns} FROM findings".format(
+    columns=", ".join(f"findings.{name}" for name in FINDING_FIELDS)
+)
+
+
+def _finding_row(finding: Finding) -> Tuple[Any, ...]:
+    # Attribute access; dataclasses.asdict() deep-copies every value.
+    row = _finding_values(finding)
+    if row[-1] is not None:
+        row = row[:-1] + (json.dumps(row[-1]),)
+    return row
+
+
+def _row_finding(row: Tuple[Any, ...]) -> Finding:
+    finding = Finding(*row)
+    if finding.tags is not None:
+        finding.tags = json.loads(finding.tags)
+    return finding
+
+
+class SqliteFindingStore(FindingStore):
+    """
+    Findings in a SQLite database (WAL journal, one row per finding).
+
+    Lookups by id and the status/severity/owner/tag filters use indexes,
+    and an update touches a single row. Transactions start with
+    ``BEGIN IMMEDIATE``, so concurrent writers queue on SQLite's lock
+    (waiting up to LOCK_TIMEOUT_SECONDS) while readers proceed.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        try:
+            # Transactions are managed explicitly in transaction().
+            self._conn = sqlite3.connect(str(path), timeout=LOCK_TIMEOUT_SECONDS, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SQLITE_SCHEMA_VERSION:
+                upgrade = "".join(SQLITE_SCHEMA[version:])
+                self._conn.executescript(
+                    f"BEGIN IMMEDIATE; {upgrade} PRAGMA user_version = {SQLITE_SCHEMA_VERSION}; COMMIT;"
+                )
+            elif version > SQLITE_SCHEMA_VERSION:
+                raise StorageError(
+                    f"{path} uses schema version {version}; this tool supports {SQLITE_SCHEMA_VERSION}."
+                )
+        except sqlite3.Error as exc:
+            raise StorageError(f"Unable to open SQLite storage {path}: {exc}") from exc
+        self._in_transaction = False
+
+    @contextmanager
+    def transaction(self) -> Iterator["SqliteFindingStore"]:
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as exc:
+            raise StorageError(f"Unable to lock SQLite storage {self.path}: {exc}") from exc
+        self._in_transaction = True
+        try:
+            yield self
+            self._conn.execute("COMMIT")
+        except sqlite3.Error as exc:
+            self._conn.execute("ROLLBACK")
+            raise StorageError(f"SQLite storage {self.path}: {exc}") from exc
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._in_transaction = False
+
+    def get(self, finding_id: str) -> Optional[Finding]:
+        try:
+            row = self._conn.execute(f"{_SELECT_SQL} WHERE id = ?", (finding_id,)).fetchone()
+        except sqlite3.Error as exc:
+            raise StorageError(f"SQLite storage {self.path}: {exc}") from exc
+        return _row_finding(row) if row is not None else None
+
+    def _write(self, findings: List[Finding]) -> None:
+        conn = self._conn
+        conn.executemany(_UPSERT_SQL, [_finding_row(finding) for finding in findings])
+        conn.executemany(
+            "DELETE FROM finding_tags WHERE seq = (SELECT seq FROM findings WHERE id = ?)",
+            [(finding.id,) for finding in findings],
+        )
+        tag_rows = [
+            (tag, finding.id)
+            for finding in findings
+            for tag in set(finding.tags or ())
+        ]
+        if tag_rows:
+            conn.executemany(
+                "INSERT INTO finding_tags (tag, seq) SELECT ?, seq FROM findings WHERE id = ?",
+                tag_rows,
+            )
+
+    def put(self, finding: Finding) -> None:
+        self.put_many([finding])
+
+    def put_many(self, findings: Iterable[Finding]) -> int:
+        if not self._in_transaction:
+            raise StorageError("Writes to the findings store require a transaction.")
+        count = 0
+        batch: List[Finding] = []
+        for finding in findings:
+            batch.append(finding)
+            if len(batch) >= IMPORT_BATCH_ROWS:
+                self._write(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+            count += len(batch)
+        return count
+
+    def query(self, criteria: FindingQuery = ALL_FINDINGS) -> Iterator[Finding]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (
+            ("status", criteria.status),
+            ("severity", criteria.severity),
+            ("owner", criteria.owner),
+        ):
+            if value:
+                clauses.append(f"findings.{column} = ? COLLATE NOCASE")
+                params.append(value)
+        for column, operator, value in (
+            ("due_date", ">=", criteria.due_from),
+            ("due_date", "<", criteria.due_until),
+            ("created_at", ">=", criteria.created_from),
+            ("created_at", "<", criteria.created_until),
+        ):
+            if value is not None:
+                clauses.append(f"findings.{column} {operator} ?")
+                params.append(value)
+        if criteria.due_from is not None or criteria.due_until is not None:
+            # Matches the in-memory backends: "" is no due date there too.
+            clauses.append("findings.due_date != ''")
+
+        sql = _SELECT_SQL
+        if criteria.tag:
+            sql += " JOIN finding_tags ON finding_tags.seq = findings.seq AND finding_tags.tag = ?"
+            params.insert(0, criteria.tag)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY findings.seq"
+        if criteria.limit is not None or criteria.offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [criteria.limit if criteria.limit is not None else -1, criteria.offset]
+        try:
+            for row in self._conn.execute(sql, params):
+                yield _row_finding(row)
+        except sqlite3.Error as exc:
+            raise StorageError(f"SQLite storage {self.path}: {exc}") from exc
+
+    def compact(self) -> None:
+        try:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.execute("PRAGMA optimize")
+        except sqlite3.Error as exc:
+            raise StorageError(f"SQLite storage {self.path}: {exc}") from exc
+        logging.info("Checkpointed the write-ahead log of %s.", self.path)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# -------------------------
+# Journal backend
+# -------------------------
+
+
+SNAPSHOT_VERSION = 1
+
+
+def _apply_record(findings: Dict[str, Finding], record: Dict[str, Any]) -> None:
+    """
+    Apply one change log record to a state mapping (id -> Finding).
+
+    Raises
+    ------
+    KeyError, TypeError, ValueError
+        If the record is malformed or updates an unknown finding.
+    """
+    op = record["op"]
+    if op == "add":
+        findings[record["id"]] = finding_from_dict(record["finding"])
+    elif op == "update":
+        finding = findings[record["id"]]
+        changes = record["changes"]
+        unknown = set(changes) - set(FINDING_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown fields {sorted(unknown)}")
+        findings[record["id"]] = replace(finding, **changes)
+    else:
+        raise ValueError(f"unknown op {op!r}")
+
+
+def _index_line(seq: int, start: int, end: int, finding_id: Any) -> bytes:
+    """
+    Return the ID index line for the change log record at [start, end).
+
+    The id goes last, as a JSON string: tabs or newlines in it cannot
+    break the line, and ``\\t"<id>"\\n`` matches the lines of that id only.
+    """
+    return f"{seq}\t{start}\t{end}\t{json.dumps(finding_id)}\n".encode("utf-8")
+
+
+class JournalFindingStore(FindingStore):
+    """
+    Findings as an append-only JSONL change log plus a state snapshot.
+
+    Every add or update appends one record to the log::
+
+        {"seq": 2, "op": "update", "at": "...", "logged_at": "...", "id": "F-1", "changes": {...}}
+
+    "at" is the finding's updated_at as given by the caller; "logged_at"
+    is when the record was appended, and is what ``as_of`` goes by.
+
+    A write costs one append and does not load the stored state: the ID
+    index (``<path>.index``, one ``seq<TAB>start<TAB>end<TAB>id`` line per
+    log record) tells whether a finding exists and where its records are,
+    so an update replays only the records of the finding it changes.
+
+    Reads use the snapshot (``<path>.snapshot``), which holds the state
+    after the first ``offset`` bytes of the log: they load it and replay
+    only the records appended since, and a read that finds
+    COMPACT_AFTER_RECORDS or more records past the snapshot rewrites it.
+    The log itself is never rewritten: it is the audit trail from which
+    ``as_of`` reconstructs past states.
+
+    Writers hold an exclusive ``flock`` on the log. A record left without
+    its newline by a crashed writer is cut off by the next writer, which
+    also indexes any records the index is missing.
+    """
+
+    backend = "journal"
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self.snapshot_path = path.with_name(path.name + ".snapshot")
+        self.index_path = path.with_name(path.name + ".index")
+        self._findings: Dict[str, Finding] = {}
+        self._loaded = False
+        self._offset = 0
+        self._seq = 0
+        self._snapshot_seq = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._log_fd: Optional[int] = None
+        self._log_end = 0
+        # Only during a transaction: the lines of the ID index.
+        self._index: Optional[bytearray] = None
+        self._index_fd: Optional[int] = None
+
+    def _load_snapshot(self) -> None:
+        self._findings, self._offset, self._seq, self._snapshot_seq = {}, 0, 0, 0
+        try:
+            with self.snapshot_path.open("r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logging.warning("Ignoring unreadable snapshot %s: %s", self.snapshot_path, exc)
+            return
+        try:
+            log_size = self.path.stat().st_size
+        except FileNotFoundError:
+            log_size = 0
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("offset", 0) > log_size:
+            logging.warning(
+                "Snapshot %s does not match the change log; rebuilding from the log.",
+                self.snapshot_path,
+            )
+            return
+        findings: Dict[str, Finding] = {}
+        if snapshot.get("fields") != list(FINDING_FIELDS):
+            logging.warning("Snapshot %s has different fields; rebuilding from the log.", self.snapshot_path)
+            return
+        for row in snapshot.get("rows", []):
+            try:
+                finding = Finding(*row)
+            except TypeError as exc:
+                logging.warning("Skipping malformed finding entry: %s | error: %s", row, exc)
+                continue
+            findings[finding.id] = finding
+        self._findings = findings
+        self._offset = snapshot["offset"]
+        self._seq = self._snapshot_seq = snapshot.get("seq", 0)
+
+
+    def _read_records(self, offset: int) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Yield (start, end offset, record) for each complete log line after ``offset``.
+        """
+        try:
+            f = self.path.open("rb")
+        except FileNotFoundError:
+            return
+        with f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # a write in progress, or torn by a crash
+                start, offset = offset, offset + len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError as exc:
+                    logging.warning("Skipping malformed change log line at byte %d: %s", start, exc)
+                    continue
+                if not isinstance(record, dict):
+                    logging.warning("Skipping change log line at byte %d: not a JSON object.", start)
+                    continue
+                yield start, offset, record
+
+    def _refresh(self) -> None:
+        """
+        Bring the in-memory state up to date with the log.
+        """
+        loading = not self._loaded
+        if loading:
+            self._load_snapshot()
+            self._loaded = True
+        replayed = 0
+        for _, offset, record in self._read_records(self._offset):
+            try:
+                _apply_record(self._findings, record)
+            except (KeyError, TypeError, ValueError) as exc:
+                logging.warning("Skipping invalid change log record %s: %s", record.get("seq"), exc)
+            self._offset = offset
+            self._seq = max(self._seq, record.get("seq", 0))
+            replayed += 1
+        if replayed:
+            logging.debug("Replayed %d change log records after the snapshot.", replayed)
+        # Writers never load the state, so the snapshot is kept up by readers.
+        if not self._pending and self._seq - self._snapshot_seq >= COMPACT_AFTER_RECORDS:
+            try:
+                self._write_snapshot()
+            except StorageError as exc:
+                logging.warning("Keeping the previous snapshot: %s", exc)
+        if loading:
+            # Changes put() earlier in this transaction are not in the log yet.
+            for record in self._pending:
+                _apply_record(self._findings, record)
+                self._seq = max(self._seq, record["seq"])
+
+    def _write_snapshot(self) -> None:
+        # Rows in FINDING_FIELDS order: smaller and faster to load than objects.
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "offset": self._offset,
+            "seq": self._seq,
+            "fields": FINDING_FIELDS,
+            "rows": [_finding_values(finding) for finding in self._findings.values()],
+        }
+        # Per process: readers refresh the snapshot without holding the lock.
+        tmp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                # dumps() uses the C encoder; dump() writes many small chunks.
+                f.write(json.dumps(payload, separators=(",", ":")))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as exc:
+            raise StorageError(f"Unable to write snapshot {self.snapshot_path}: {exc}") from exc
+        self._snapshot_seq = self._seq
+        logging.debug("Wrote snapshot of %d findings at change %d.", len(self._findings), self._seq)
+
+    def _load_index(self) -> None:
+        """
+        Read the ID index and bring it up to date with the log.
+
+        Sets the offset and sequence number of the next append, cuts off
+        a record torn at the end of the log, and indexes the records that
+        a writer which crashed before updating the index left behind (or
+        that were written before the index existed).
+        """
+        log_size = os.fstat(self._log_fd).st_size
+        try:
+            with self.index_path.open("rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            data = b""
+        except OSError as exc:
+            raise StorageError(f"Unable to read ID index {self.index_path}: {exc}") from exc
+        valid = data.rfind(b"\n") + 1  # a last line without its newline is torn
+        seq = end = 0
+        if valid:
+            # Only the last line is parsed; lookups search the raw lines.
+            last = data[data.rfind(b"\n", 0, valid - 1) + 1:valid]
+            try:
+                seq_text, _, end_text, _ = last.split(b"\t", 3)
+                seq, end = int(seq_text), int(end_text)
+                if end > log_size:
+                    raise ValueError(f"it covers {end} bytes of a {log_size} byte log")
+            except ValueError as exc:
+                logging.warning("Rebuilding the ID index %s from the change log: %s", self.index_path, exc)
+                seq, end, valid = 0, 0, 0
+        try:
+            self._index_fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if valid < len(data):
+                os.ftruncate(self._index_fd, valid)
+        except OSError as exc:
+            raise StorageError(f"Unable to open ID index {self.index_path}: {exc}") from exc
+        self._index = bytearray(data[:valid])
+
+        missing: List[bytes] = []
+        for start, end, record in self._read_records(end):
+            try:
+                finding_id = record["id"]
+                seq = max(seq, int(record["seq"]))
+            except (KeyError, TypeError, ValueError) as exc:
+                logging.warning("Not indexing invalid change log record at byte %d: %s", start, exc)
+                finding_id = None  # indexed as null, which matches no id
+            missing.append(_index_line(seq, start, end, finding_id))
+        if missing:
+            logging.info("Indexed %d change log records missing from %s.", len(missing), self.index_path)
+            self._write_index(missing)
+
+        if log_size > end:
+            with self.path.open("rb") as f:
+                f.seek(end)
+                # Complete but unreadable lines stay; only a torn last line goes.
+                end += f.read().rfind(b"\n") + 1
+        if log_size > end:
+            logging.warning(
+                "Discarding %d bytes of an incomplete change log record in %s.",
+                log_size - end,
+                self.path,
+            )
+            os.ftruncate(self._log_fd, end)
+        self._log_end = end
+        self._seq = max(self._seq, seq)
+
+    def _write_index(self, lines: List[bytes]) -> None:
+        data = b"".join(lines)
+        self._index += data
+        # Not fatal: the log is already written, and the next writer
+        # indexes whatever did not make it into the index.
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(self._index_fd, view):]
+        except OSError as exc:
+            logging.warning("Unable to update the ID index %s: %s", self.index_path, exc)
+
+    @contextmanager
+    def transaction(self) -> Iterator["JournalFindingStore"]:
+        try:
+            self._log_fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError as exc:
+            raise StorageError(f"Unable to open change log {self.path}: {exc}") from exc
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._log_fd, fcntl.LOCK_EX)
+            self._load_index()
+            if self._loaded:
+                self._refresh()
+            self._pending = []
+            try:
+                yield self
+            except BaseException:
+                # The in-memory state already includes the discarded changes.
+                self._loaded = False
+                raise
+            if self._pending:
+                self._append(self._pending)
+                if self._loaded:
+                    self._offset = self._log_end
+        finally:
+            self._pending = []
+            self._index = None
+            if not self._loaded:
+                # Only the findings this transaction looked up or wrote.
+                self._findings = {}
+            if self._index_fd is not None:
+                os.close(self._index_fd)
+                self._index_fd = None
+            os.close(self._log_fd)
+            self._log_fd = None
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        logged_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        lines = []
+        for record in records:
+            record["logged_at"] = logged_at
+            lines.append((json.dumps(record, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8"))
+        try:
+            view = memoryview(b"".join(lines))
+            while view:
+                view = view[os.write(self._log_fd, view):]
+            os.fsync(self._log_fd)
+        except OSError as exc:
+            self._loaded = False
+            raise StorageError(f"Unable to append to change log {self.path}: {exc}") from exc
+
+        # Only once the records are durable: the index never points past the log.
+        index_lines = []
+        start = self._log_end
+        for record, line in zip(records, lines):
+            index_lines.append(_index_line(record["seq"], start, start + len(line), record["id"]))
+            start += len(line)
+        self._log_end = start
+        self._write_index(index_lines)
+
+    def _current(self, finding_id: str) -> Optional[Finding]:
+        """
+        Return the current state of one finding (not a copy).
+
+        In a write transaction that has not loaded the whole state, this
+        replays only the records of that finding, found by searching the
+        ID index for lines ending in its id.
+        """
+        if self._index is None:
+            self._refresh()
+        if self._loaded:
+            return self._findings.get(finding_id)
+        if finding_id not in self._findings:
+            index = self._index
+            suffix = b"\t" + json.dumps(finding_id).encode("utf-8") + b"\n"
+            pos = index.find(suffix)
+            if pos < 0:
+                return None
+            findings: Dict[str, Finding] = {}
+            with self.path.open("rb") as f:
+                while pos >= 0:
+                    line = index[index.rfind(b"\n", 0, pos) + 1:pos]
+                    try:
+                        f.seek(int(line.split(b"\t")[1]))
+                        _apply_record(findings, json.loads(f.readline()))
+                    except (IndexError, KeyError, TypeError, ValueError) as exc:
+                        logging.warning("Skipping invalid ID index entry %r: %s", bytes(line), exc)
+                    pos = index.find(suffix, pos + 1)
+            if finding_id not in findings:
+                return None
+            self._findings[finding_id] = findings[finding_id]
+        return self._findings[finding_id]
+
+    def get(self, finding_id: str) -> Optional[Finding]:
+        finding = self._current(finding_id)
+        # A copy, so that callers can modify it and put() it back.
+        return replace(finding) if finding is not None else None
+
+    def put(self, finding: Finding) -> None:
+        if self._log_fd is None:
+            raise StorageError("Writes to the findings store require a transaction.")
+        current = self._current(finding.id)
+        self._seq += 1
+        record: Dict[str, Any] = {"seq": self._seq, "at": finding.updated_at, "id": finding.id}
+        if current is None:
+            record["op"] = "add"
+            record["finding"] = finding_to_dict(finding)
+        else:
+            record["op"] = "update"
+            record["changes"] = {
+                name: getattr(finding, name)
+                for name in FINDING_FIELDS
+                if getattr(finding, name) != getattr(current, name)
+            }
+        self._findings[finding.id] = finding
+        self._pending.append(record)
+
+    def put_many(self, findings: Iterable[Finding]) -> int:
+        # One search of the ID index per finding adds up on an import;
+        # loading the state once is cheaper.
+        if self._log_fd is not None:
+            self._refresh()
+        return super().put_many(findings)
+
+    def query(self, criteria: FindingQuery = ALL_FINDINGS) -> Iterator[Finding]:
+        self._refresh()
+        return filter_findings(self._findings.values(), criteria)
+
+    def as_of(self, when: datetime) -> Iterator[Finding]:
+        """
+        Replay the change log up to ``when`` and yield the findings then.
+
+        Records are applied in log order; a record counts once it was
+        appended ("logged_at") at or before ``when``, whatever updated_at
+        the caller gave the finding. Records written before "logged_at"
+        was recorded go by their "at" time.
+        """
+        findings: Dict[str, Finding] = {}
+        for _, _, record in self._read_records(0):
+            try:
+                if parse_timestamp(record.get("logged_at", record["at"])) > when:
+                    continue
+                _apply_record(findings, record)
+            except (KeyError, TypeError, ValueError) as exc:
+                logging.warning("Skipping invalid change log record %s: %s", record.get("seq"), exc)
+        return iter(findings.values())
+
+    def compact(self) -> None:
+        with self.transaction():
+            self._refresh()
+            if self._snapshot_seq != self._seq:
+                self._write_snapshot()
+        logging.info(
+            "Compacted %s: snapshot of %d findings at change %d (%d log bytes).",
+            self.path,
+            len(self._findings),
+            self._seq,
+            self._offset,
+        )
+
+
+# -------------------------
+# Backend selection
+# -------------------------
+
+
+def resolve_backend(path: Path, backend: str = "auto") -> str:
+    """
+    Return the concrete backend for ``path`` ("auto" picks by suffix).
+    """
+    if backend not in BACKEND_CHOICES:
+        raise StorageError(f"Unsupported storage backend: {backend}")
+    if backend != "auto":
+        return backend
+    suffix = path.suffix.lower()
+    if suffix in SQLITE_SUFFIXES:
+        return "sqlite"
+    if suffix in JOURNAL_SUFFIXES:
+        return "journal"
+    return "json"
+
+
+def open_store(path: Path, backend: str = "auto") -> FindingStore:
+    """
+    Open the findings store at ``path`` with the given backend.
+
+    Parameters
+    ----------
+    path : Path
+        Storage file (JSON array file, SQLite database or change log).
+    backend : str
+        "auto", "json", "sqlite" or "journal".
+
+    Returns
+    -------
+    FindingStore
+        The opened store; close it (or use it as a context manager).
+
+    Raises
+    ------
+    StorageError
+        If the backend is unknown or the storage cannot be opened.
+    """
+    backend = resolve_backend(path, backend)
+    if backend == "sqlite":
+        return SqliteFindingStore(path)
+    if backend == "journal":
+        return JournalFindingStore(path)
+    return JsonFindingStore(path)
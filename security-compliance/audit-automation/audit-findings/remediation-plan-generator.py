@@ -5,24 +5,48 @@ remediation-plan-generator.py
 Auto-generates remediation plans for audit findings.
 
 Features:
-- Reads findings JSON (with risk scores if available)
+- Reads findings JSON (with risk scores if available) as a JSON array or
+  JSON lines, streamed one finding at a time
 - Uses YAML templates to suggest remediation actions and SLAs
-- Generates a structured remediation plan JSON or Markdown
+  (compiled once into an index, so matching a finding is O(1))
+- Generates a structured remediation plan as JSON, JSON lines or Markdown,
+  written as tasks are generated (memory does not grow with the input)
+- Optional process pool for Markdown rendering
 - Configurable via CLI and optional config file
 """
 
 import argparse
 import json
 import logging
+import multiprocessing
+import os
+import re
+import signal
 import sys
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+import threading
+from dataclasses import dataclass, fields
+from datetime import date, datetime, timedelta
+from itertools import islice
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
 import yaml  # Requires PyYAML; keep as a standard, non-credential dependency
 
 
+INPUT_FORMATS = ("auto", "json", "jsonl")
+OUTPUT_FORMATS = ("json", "jsonl", "md")
+
+# Characters read from the findings file at a time.
+READ_CHUNK_CHARS = 1 << 20
+
+# Findings per unit of work sent to a Markdown rendering process.
+RENDER_BATCH_FINDINGS = 500
+
+# JSON lines output is written in batches of this many tasks.
+WRITE_BATCH_TASKS = 1000
+
+
 # -------------------------
 # Data models
 # -------------------------
@@ -44,6 +68,23 @@ class RemediationTask:
     template_id: Optional[str] = None
 
 
+TASK_FIELDS = tuple(f.name for f in fields(RemediationTask))
+_task_values = attrgetter(*TASK_FIELDS)
+
+
+def task_to_dict(task: RemediationTask) -> Dict[str, Any]:
+    """
+    Convert a task to a plain dictionary (a flat, cheaper asdict).
+    """
+    return dict(zip(TASK_FIELDS, _task_values(task)))
+
+
+class FindingsInputError(ValueError):
+    """
+    Raised when the findings input cannot be parsed.
+    """
+
+
 # -------------------------
 # Template loading and mapping
 # -------------------------
@@ -82,67 +123,245 @@ def load_templates(path: Path) -> Dict[str, Any]:
     return {"templates": data}
 
 
-def load_findings(path: Path) -> List[Dict[str, Any]]:
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+def iter_json_array(f: TextIO) -> Iterator[Any]:
     """
-    Load findings JSON (any structure, but should include at least: id, title, severity).
+    Yield the elements of a top-level JSON array without loading it whole.
+
+    The file is read in chunks of READ_CHUNK_CHARS; an element spanning a
+    chunk boundary is decoded once the next chunk has been appended.
     """
-    if not path.exists():
-        logging.error("Findings file '%s' does not exist.", path)
-        raise SystemExit(1)
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    index = 0
+
+    def read_more() -> None:
+        nonlocal buffer, pos, eof
+        chunk = f.read(READ_CHUNK_CHARS)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            match = _NON_WHITESPACE.search(buffer, pos)
+            if match is not None:
+                pos = match.start()
+                return buffer[pos]
+            if eof:
+                pos = len(buffer)
+                return ""
+            read_more()
+
+    if next_char() != "[":
+        raise FindingsInputError("Findings file is expected to contain a list of objects.")
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            if not next_char():
+                raise FindingsInputError(f"unexpected end of data in element {index}")
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    if eof:
+                        raise FindingsInputError(f"element {index}: {exc.msg}") from exc
+                    read_more()
+                    continue
+                if not eof:
+                    # A number may continue in the next chunk: only accept
+                    # the value once its delimiter has been read.
+                    following = _NON_WHITESPACE.search(buffer, end)
+                    if following is None or following.group() not in ",]":
+                        read_more()
+                        continue
+                break
+            pos = end
+            yield value
+            index += 1
+
+            separator = next_char()
+            pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise FindingsInputError(f"expected ',' or ']' after element {index - 1}")
+    if next_char():
+        raise FindingsInputError("extra data after the findings array")
+
+
+def iter_json_lines(f: TextIO) -> Iterator[Any]:
+    """
+    Yield one decoded value per non-blank line.
+    """
+    for line_number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise FindingsInputError(f"line {line_number}: {exc.msg}") from exc
 
-    try:
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-    except json.JSONDecodeError as exc:
-        logging.error("Unable to parse findings JSON: %s", exc)
-        raise SystemExit(1)
 
-    if not isinstance(data, list):
-        logging.error("Findings file is expected to contain a list of objects.")
-        raise SystemExit(1)
+def detect_input_format(f: TextIO) -> str:
+    """
+    Return "json" if the content starts with an array, "jsonl" otherwise.
+    """
+    while True:
+        char = f.read(1)
+        if not char or not char.isspace():
+            break
+    f.seek(0)
+    return "json" if char == "[" else "jsonl"
 
-    logging.debug("Loaded %d findings for remediation plan generation.", len(data))
-    return data
 
+def iter_findings(path: Path, input_format: str = "auto") -> Iterator[Dict[str, Any]]:
+    """
+    Stream findings (any structure, but should include at least: id, title, severity)
+    from a JSON array or JSON lines file.
 
-def match_template_for_finding(
-    finding: Dict[str, Any],
-    templates: List[Dict[str, Any]],
-) -> Optional[Dict[str, Any]]:
+    Raises
+    ------
+    FindingsInputError
+        While iterating, if the input is malformed or an element is not an object.
     """
-    Select the most appropriate template for a given finding based on
-    severity, category, and optionally risk level.
+    count = 0
+    with path.open("r", encoding="utf-8") as f:
+        if input_format == "auto":
+            input_format = detect_input_format(f)
+        values = iter_json_array(f) if input_format == "json" else iter_json_lines(f)
+        for value in values:
+            if not isinstance(value, dict):
+                raise FindingsInputError(
+                    f"Findings file is expected to contain a list of objects (item {count} is not)."
+                )
+            count += 1
+            yield value
+
+    logging.debug("Read %d findings for remediation plan generation.", count)
+
+
+# Match fields and the score an exact match on each contributes.
+MATCH_FIELDS = ("severity", "category", "risk_level")
+MATCH_WEIGHTS = (2, 2, 1)
+
+# Score of a template without a match section (generic fallback).
+GENERIC_TEMPLATE_SCORE = 1
+
+MatchKey = Tuple[str, str, str]
+
+# Bound on memoized match results (distinct finding keys).
+MAX_RESOLVED_KEYS = 65536
+
+
+def normalize_match_value(value: Any) -> str:
+    """
+    Normalize a finding or template match value for comparison.
     """
-    severity = str(finding.get("severity", "")).upper()
-    category = str(finding.get("category", "")).upper()
-    risk_level = str(finding.get("risk_level", "")).upper()
+    return str(value).upper()
 
-    best_match: Optional[Dict[str, Any]] = None
-    best_score = -1
 
-    for template in templates:
-        match = template.get("match", {})
-        score = 0
+class TemplateIndex:
+    """
+    Templates compiled for constant-time matching.
+
+    A template scores 2 for a matching severity, 2 for a matching category
+    and 1 for a matching risk level (generic templates without a match
+    section score 1); the highest score wins and ties go to the template
+    listed first. When nothing scores, the first template is used.
+
+    Every template is registered under each combination of its non-empty
+    match fields, keeping the first template per key. For a finding, each
+    combination is looked up by the finding's values, and the best score
+    among the hits (earliest template on ties) is the same template the
+    pairwise scan selects. Results are memoized per
+    (severity, category, risk_level).
+    """
 
-        # Exact matches increase the score
-        tmpl_severity = str(match.get("severity", "")).upper()
-        tmpl_category = str(match.get("category", "")).upper()
-        tmpl_risk = str(match.get("risk_level", "")).upper()
+    def __init__(self, templates: List[Dict[str, Any]]) -> None:
+        self.templates = templates
+        # (field positions, weight, {values: template position}) per combination.
+        self._combinations: List[Tuple[Tuple[int, ...], int, Dict[Tuple[str, ...], int]]] = []
+        for mask in range(1, 1 << len(MATCH_FIELDS)):
+            positions = tuple(i for i in range(len(MATCH_FIELDS)) if mask & (1 << i))
+            weight = sum(MATCH_WEIGHTS[i] for i in positions)
+            self._combinations.append((positions, weight, {}))
+        self._combinations.sort(key=lambda combination: -combination[1])
+        self._generic: Optional[int] = None
+        self._resolved: Dict[MatchKey, Tuple[Optional[Dict[str, Any]], int]] = {}
+
+        for position, template in enumerate(templates):
+            if not isinstance(template, dict):
+                logging.error("Template #%d must be a mapping, not %s.", position + 1, type(template).__name__)
+                raise SystemExit(1)
+            match = template.get("match", {})
+            if not match:
+                if self._generic is None:
+                    self._generic = position
+                continue
+            if not isinstance(match, dict):
+                logging.error("Template '%s' has an invalid match section.", template.get("id"))
+                raise SystemExit(1)
+            values = tuple(normalize_match_value(match.get(name, "")) for name in MATCH_FIELDS)
+            for positions, _, index in self._combinations:
+                if all(values[i] for i in positions):
+                    index.setdefault(tuple(values[i] for i in positions), position)
+
+    def resolve(self, key: MatchKey) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Return the best template and its score for normalized finding values.
+        """
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            return resolved
+
+        best_position: Optional[int] = None
+        best_score = 0
+        for positions, weight, index in self._combinations:
+            if best_position is not None and weight < best_score:
+                break
+            position = index.get(tuple(key[i] for i in positions))
+            if position is not None and (best_position is None or position < best_position):
+                best_position, best_score = position, weight
+        if self._generic is not None and best_score <= GENERIC_TEMPLATE_SCORE:
+            if best_position is None or self._generic < best_position:
+                best_position, best_score = self._generic, GENERIC_TEMPLATE_SCORE
+        if best_position is None and self.templates:
+            best_position = 0
+
+        resolved = (self.templates[best_position] if best_position is not None else None, best_score)
+        if len(self._resolved) >= MAX_RESOLVED_KEYS:
+            self._resolved.clear()
+        self._resolved[key] = resolved
+        return resolved
 
-        if tmpl_severity and tmpl_severity == severity:
-            score += 2
-        if tmpl_category and tmpl_category == category:
-            score += 2
-        if tmpl_risk and tmpl_risk == risk_level:
-            score += 1
 
-        # Generic templates (with fewer constraints) can still apply
-        if score == 0 and not match:
-            score = 1
+def match_template_for_finding(
+    finding: Dict[str, Any],
+    templates: Any,
+) -> Optional[Dict[str, Any]]:
+    """
+    Select the most appropriate template for a given finding based on
+    severity, category, and optionally risk level.
 
-        if score > best_score:
-            best_score = score
-            best_match = template
+    `templates` is the template list or a TemplateIndex compiled from it;
+    pass an index when matching many findings.
+    """
+    if not isinstance(templates, TemplateIndex):
+        templates = TemplateIndex(templates)
+    key = (
+        normalize_match_value(finding.get("severity", "")),
+        normalize_match_value(finding.get("category", "")),
+        normalize_match_value(finding.get("risk_level", "")),
+    )
+    best_match, best_score = templates.resolve(key)
 
     if best_match:
         logging.debug(
@@ -157,24 +376,48 @@ def match_template_for_finding(
     return best_match
 
 
+class TargetDateCalendar:
+    """
+    Target completion dates relative to one reference day (UTC today by
+    default), memoized per SLA so a run needs one date computation per
+    distinct sla_days.
+    """
+
+    def __init__(self, today: Optional[date] = None) -> None:
+        self.today = today or datetime.utcnow().date()
+        self._dates: Dict[int, str] = {}
+
+    def target_date(self, sla_days: int) -> str:
+        """
+        Return the ISO date `sla_days` after the reference day.
+        """
+        target = self._dates.get(sla_days)
+        if target is None:
+            target = self._dates[sla_days] = (self.today + timedelta(days=sla_days)).isoformat()
+        return target
+
+
 def calculate_target_date(sla_days: int) -> str:
     """
     Calculate target completion date based on current date and SLA days.
     """
-    target = datetime.utcnow() + timedelta(days=sla_days)
-    return target.date().isoformat()
+    return TargetDateCalendar().target_date(sla_days)
 
 
 def build_remediation_tasks_for_finding(
     finding: Dict[str, Any],
     template: Optional[Dict[str, Any]],
     default_sla_days: int,
+    calendar: Optional[TargetDateCalendar] = None,
 ) -> List[RemediationTask]:
     """
     Create remediation tasks for a finding using a matched template.
 
     If no template is available, generate a generic remediation task to avoid gaps.
+    Pass a shared `calendar` when building tasks for many findings.
     """
+    if calendar is None:
+        calendar = TargetDateCalendar()
     tasks: List[RemediationTask] = []
     finding_id = str(finding.get("id"))
     title = str(finding.get("title", "Untitled Finding"))
@@ -184,7 +427,7 @@ def build_remediation_tasks_for_finding(
             "No remediation template found for finding '%s'; generating generic task.",
             finding_id,
         )
-        target_date = calculate_target_date(default_sla_days)
+        target_date = calendar.target_date(default_sla_days)
         tasks.append(
             RemediationTask(
                 id=f"{finding_id}-GENERIC-1",
@@ -210,7 +453,7 @@ def build_remediation_tasks_for_finding(
             "Template '%s' has no remediation_steps; generating single umbrella task.",
             tmpl_id,
         )
-        target_date = calculate_target_date(sla_days)
+        target_date = calendar.target_date(sla_days)
         tasks.append(
             RemediationTask(
                 id=f"{finding_id}-{tmpl_id}-1",
@@ -224,10 +467,10 @@ def build_remediation_tasks_for_finding(
         )
         return tasks
 
+    target_date = calendar.target_date(sla_days)
     for idx, step in enumerate(steps, start=1):
         description = str(step)
         task_id = f"{finding_id}-{tmpl_id}-{idx}"
-        target_date = calculate_target_date(sla_days)
         tasks.append(
             RemediationTask(
                 id=task_id,
@@ -243,70 +486,279 @@ def build_remediation_tasks_for_finding(
     return tasks
 
 
+def iter_finding_tasks(
+    findings: Iterable[Dict[str, Any]],
+    templates: TemplateIndex,
+    default_sla_days: int,
+    calendar: TargetDateCalendar,
+) -> Iterator[List[RemediationTask]]:
+    """
+    Lazily yield the remediation tasks of each finding, one finding at a time.
+    """
+    for finding in findings:
+        template = match_template_for_finding(finding, templates)
+        yield build_remediation_tasks_for_finding(finding, template, default_sla_days, calendar)
+
+
 # -------------------------
 # Output formatting
 # -------------------------
 
 
-def output_json(tasks: List[RemediationTask], output_path: Path) -> None:
+def write_json_tasks(
+    task_groups: Iterable[List[RemediationTask]],
+    output_format: str,
+    out: TextIO,
+) -> int:
     """
-    Write remediation tasks as JSON.
+    Stream tasks to `out` as a JSON array or as JSON lines.
+
+    The array layout is identical to ``json.dump(list, indent=2,
+    sort_keys=True)`` but written one task at a time.
+
+    Returns
+    -------
+    int
+        Number of tasks written.
     """
-    data = [asdict(t) for t in tasks]
+    count = 0
+    if output_format == "jsonl":
+        encode = json.JSONEncoder(separators=(",", ":"), sort_keys=True).encode
+        lines: List[str] = []
+        for tasks in task_groups:
+            lines.extend(encode(task_to_dict(task)) for task in tasks)
+            if len(lines) >= WRITE_BATCH_TASKS:
+                out.write("\n".join(lines) + "\n")
+                count += len(lines)
+                lines = []
+        if lines:
+            out.write("\n".join(lines) + "\n")
+            count += len(lines)
+        return count
+
+    for tasks in task_groups:
+        for task in tasks:
+            text = json.dumps(task_to_dict(task), indent=2, sort_keys=True).replace("\n", "\n  ")
+            out.write(("[\n  " if count == 0 else ",\n  ") + text)
+            count += 1
+    out.write("\n]" if count else "[]")
+    return count
+
+
+def render_markdown_section(tasks: List[RemediationTask]) -> str:
+    """
+    Render the Markdown section for one finding's tasks.
+    """
+    lines: List[str] = []
+    lines.append(f"## Finding {tasks[0].finding_id}")
+    lines.append("")
+    for task in sorted(tasks, key=lambda t: t.id):
+        lines.append(f"### Task {task.id}")
+        lines.append("")
+        lines.append(f"- **Title:** {task.title}")
+        lines.append(f"- **Owner role:** {task.owner_role}")
+        lines.append(f"- **Target date:** {task.target_date}")
+        lines.append(f"- **Status:** {task.status}")
+        if task.template_id:
+            lines.append(f"- **Template:** `{task.template_id}`")
+        if task.notes:
+            lines.append(f"- **Notes:** {task.notes}")
+        lines.append("")
+        lines.append("**Description:**")
+        lines.append("")
+        lines.append(task.description)
+        lines.append("")
+    lines.append("---")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def render_markdown_batch(
+    findings: List[Dict[str, Any]],
+    templates: TemplateIndex,
+    default_sla_days: int,
+    calendar: TargetDateCalendar,
+) -> Tuple[str, int]:
+    """
+    Build and render the tasks of a batch of findings.
+
+    Returns
+    -------
+    Tuple[str, int]
+        Markdown text (each section preceded by a newline) and the number of tasks.
+    """
+    parts: List[str] = []
+    count = 0
+    for tasks in iter_finding_tasks(findings, templates, default_sla_days, calendar):
+        parts.append("\n" + render_markdown_section(tasks))
+        count += len(tasks)
+    return "".join(parts), count
+
+
+# State for Markdown rendering processes, set by _init_render_worker.
+_RENDER_STATE: Dict[str, Any] = {}
+
+
+def _init_render_worker(
+    templates: List[Dict[str, Any]],
+    default_sla_days: int,
+    today: date,
+    log_level: str,
+) -> None:
+    """
+    Pool initializer: compile the templates once per rendering process.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(
+        level=getattr(logging, log_level),
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+    _RENDER_STATE["templates"] = TemplateIndex(templates)
+    _RENDER_STATE["default_sla_days"] = default_sla_days
+    _RENDER_STATE["calendar"] = TargetDateCalendar(today)
+
+
+def _render_markdown_in_worker(findings: List[Dict[str, Any]]) -> Tuple[str, int]:
+    return render_markdown_batch(
+        findings,
+        _RENDER_STATE["templates"],
+        _RENDER_STATE["default_sla_days"],
+        _RENDER_STATE["calendar"],
+    )
+
+
+def iter_finding_batches(
+    findings: Iterable[Dict[str, Any]],
+    size: int,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group findings into lists of at most `size`.
+    """
+    iterator = iter(findings)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_markdown_parts(
+    findings: Iterable[Dict[str, Any]],
+    templates: TemplateIndex,
+    default_sla_days: int,
+    calendar: TargetDateCalendar,
+    workers: int,
+    log_level: str,
+) -> Iterator[Tuple[str, int]]:
+    """
+    Yield rendered Markdown batches in input order.
+
+    With more than one worker, batches are rendered by a process pool; at
+    most `workers * 4` batches are in flight ahead of the writer.
+    """
+    batches = iter_finding_batches(findings, RENDER_BATCH_FINDINGS)
+    if workers <= 1:
+        for batch in batches:
+            yield render_markdown_batch(batch, templates, default_sla_days, calendar)
+        return
+
+    # Bounds the batches in flight; the pool's task feeder thread blocks
+    # here instead of buffering the whole input.
+    slots = threading.BoundedSemaphore(workers * 4)
+    stop = threading.Event()
+
+    def bounded_batches() -> Iterator[List[Dict[str, Any]]]:
+        for batch in batches:
+            while not slots.acquire(timeout=0.5):
+                if stop.is_set():
+                    return
+            yield batch
+
+    context = multiprocessing.get_context()
+    pool = context.Pool(
+        processes=workers,
+        initializer=_init_render_worker,
+        initargs=(templates.templates, default_sla_days, calendar.today, log_level),
+    )
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
-        logging.info("Wrote %d remediation tasks to JSON '%s'.", len(tasks), output_path)
-    except OSError as exc:
-        logging.error("Unable to write JSON remediation plan: %s", exc)
-        raise SystemExit(1)
+        for part in pool.imap(_render_markdown_in_worker, bounded_batches()):
+            yield part
+            slots.release()
+        pool.close()
+    finally:
+        stop.set()
+        pool.terminate()
+        pool.join()
 
 
-def output_markdown(tasks: List[RemediationTask], output_path: Path) -> None:
+def write_markdown(parts: Iterable[Tuple[str, int]], out: TextIO) -> int:
     """
     Write remediation tasks in Markdown format for human consumption.
-    """
-    # Group tasks by finding for more readable markdown
-    by_finding: Dict[str, List[RemediationTask]] = {}
-    for task in tasks:
-        by_finding.setdefault(task.finding_id, []).append(task)
 
+    Sections follow the input order, one per finding; tasks within a
+    section are sorted by task id.
+
+    Returns
+    -------
+    int
+        Number of tasks written.
+    """
     lines: List[str] = []
     lines.append("# Remediation Plan")
     lines.append("")
     lines.append(f"_Generated at: {datetime.utcnow().isoformat()}Z_")
     lines.append("")
+    out.write("\n".join(lines))
+
+    count = 0
+    for text, tasks in parts:
+        out.write(text)
+        count += tasks
+    return count
 
-    for finding_id, f_tasks in sorted(by_finding.items()):
-        lines.append(f"## Finding {finding_id}")
-        lines.append("")
-        for task in sorted(f_tasks, key=lambda t: t.id):
-            lines.append(f"### Task {task.id}")
-            lines.append("")
-            lines.append(f"- **Title:** {task.title}")
-            lines.append(f"- **Owner role:** {task.owner_role}")
-            lines.append(f"- **Target date:** {task.target_date}")
-            lines.append(f"- **Status:** {task.status}")
-            if task.template_id:
-                lines.append(f"- **Template:** `{task.template_id}`")
-            if task.notes:
-                lines.append(f"- **Notes:** {task.notes}")
-            lines.append("")
-            lines.append("**Description:**")
-            lines.append("")
-            lines.append(task.description)
-            lines.append("")
-        lines.append("---")
-        lines.append("")
 
+def write_plan(
+    output_path: Path,
+    output_format: str,
+    findings: Iterable[Dict[str, Any]],
+    templates: TemplateIndex,
+    default_sla_days: int,
+    workers: int,
+    log_level: str,
+) -> None:
+    """
+    Generate the plan into a temporary file, renamed into place once
+    complete so that a failed run never leaves a truncated plan behind.
+    """
+    calendar = TargetDateCalendar()
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
-        logging.info("Wrote remediation plan markdown to '%s'.", output_path)
+        with tmp_path.open("w", encoding="utf-8") as out:
+            if output_format == "md":
+                parts = iter_markdown_parts(
+                    findings, templates, default_sla_days, calendar, workers, log_level
+                )
+                count = write_markdown(parts, out)
+            else:
+                task_groups = iter_finding_tasks(findings, templates, default_sla_days, calendar)
+                count = write_json_tasks(task_groups, output_format, out)
+        os.replace(tmp_path, output_path)
+    except FindingsInputError as exc:
+        tmp_path.unlink(missing_ok=True)
+        logging.error("Unable to parse findings JSON: %s", exc)
+        raise SystemExit(1)
     except OSError as exc:
-        logging.error("Unable to write Markdown remediation plan: %s", exc)
+        tmp_path.unlink(missing_ok=True)
+        logging.error("Unable to write remediation plan: %s", exc)
         raise SystemExit(1)
 
+    if output_format == "md":
+        logging.info("Wrote remediation plan markdown (%d tasks) to '%s'.", count, output_path)
+    else:
+        logging.info(
+            "Wrote %d remediation tasks to %s '%s'.", count, output_format.upper(), output_path
+        )
+
 
 # -------------------------
 # Config and CLI
@@ -361,7 +813,14 @@ def build_parser() -> argparse.ArgumentParser:
         "--findings",
         required=True,
         type=Path,
-        help="Path to findings JSON file."
+        help="Path to findings JSON array or JSON lines file."
+    )
+
+    parser.add_argument(
+        "--input-format",
+        default="auto",
+        choices=INPUT_FORMATS,
+        help="Findings file format; auto detects a JSON array by its leading '['."
     )
 
     parser.add_argument(
@@ -375,15 +834,22 @@ def build_parser() -> argparse.ArgumentParser:
         "--output",
         required=True,
         type=Path,
-        help="Output path for remediation plan (JSON or Markdown)."
+        help="Output path for remediation plan (JSON, JSON lines or Markdown)."
     )
 
     parser.add_argument(
         "--format",
-        choices=["json", "md"],
+        choices=OUTPUT_FORMATS,
         help="Output format (overrides config default_output_format)."
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes rendering Markdown output; 1 renders in-process."
+    )
+
     parser.add_argument(
         "--default-sla-days",
         type=int,
@@ -412,28 +878,35 @@ def main(argv: Optional[List[str]] = None) -> None:
         format="%(asctime)s | %(levelname)s | %(message)s",
     )
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1.")
+
+    if not args.findings.exists():
+        logging.error("Findings file '%s' does not exist.", args.findings)
+        raise SystemExit(1)
+
     cfg = load_config(args.config)
-    findings = load_findings(args.findings)
     tmpl_data = load_templates(args.templates)
-    templates = tmpl_data["templates"]
+    templates = TemplateIndex(tmpl_data["templates"])
+    findings = iter_findings(args.findings, args.input_format)
 
     default_sla_days = args.default_sla_days or cfg.get("default_sla_days", 60)
     output_format = args.format or cfg.get("default_output_format", "json")
 
-    all_tasks: List[RemediationTask] = []
-    for finding in findings:
-        template = match_template_for_finding(finding, templates)
-        tasks = build_remediation_tasks_for_finding(finding, template, default_sla_days)
-        all_tasks.extend(tasks)
-
-    if output_format == "json":
-        output_json(all_tasks, args.output)
-    elif output_format == "md":
-        output_markdown(all_tasks, args.output)
-    else:
+    if output_format not in OUTPUT_FORMATS:
         logging.error("Unsupported output format: '%s'.", output_format)
         raise SystemExit(1)
 
+    write_plan(
+        args.output,
+        output_format,
+        findings,
+        templates,
+        default_sla_days,
+        args.workers,
+        args.log_level,
+    )
+
 
 if __name__ == "__main__":
     try:
@@ -9,15 +9,29 @@ Features:
 - Calculates risk score using configurable weights
 - Outputs updated findings with risk scores
 - Configurable via JSON config file and CLI arguments
+- Batch engine scoring all findings in one columnar pass (NumPy when
+  installed, the standard library `array` module otherwise)
+- Optional incremental mode: a score cache keyed by finding id and the
+  scoring configuration hash lets unchanged findings skip re-scoring, and
+  the re-scored findings are also written to a delta file
 """
 
 import argparse
+import hashlib
 import json
 import logging
+import os
 import sys
+from array import array
+from bisect import bisect_right
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None  # type: ignore
 
 
 # -------------------------
@@ -57,6 +71,31 @@ DEFAULT_SEVERITY_WEIGHTS: Dict[str, int] = {
     "CRITICAL": 4,
 }
 
+DEFAULT_RISK_LEVELS: Dict[str, float] = {
+    "LOW": 0.0,
+    "MEDIUM": 5.0,
+    "HIGH": 10.0,
+    "CRITICAL": 15.0,
+}
+
+# Level assigned to scores below every threshold.
+FALLBACK_RISK_LEVEL = "LOW"
+
+ENGINES = ("batch", "scalar")
+VECTOR_BACKENDS = ("auto", "numpy", "array")
+
+# Fields of the Finding model, with the defaults map_dict_to_finding applies.
+CORE_FIELD_DEFAULTS: Tuple[Tuple[str, Any], ...] = (
+    ("id", ""),
+    ("title", ""),
+    ("severity", "MEDIUM"),
+    ("impact", None),
+    ("likelihood", None),
+)
+
+# Bumped whenever the score cache layout or the scoring formula changes.
+SCORE_CACHE_VERSION = 1
+
 
 def normalize_severity(severity: str) -> str:
     """
@@ -133,9 +172,42 @@ def calculate_risk_score(
     return finding
 
 
+class RiskLevelTable:
+    """
+    Risk level thresholds, sorted once for bisection.
+
+    Levels are ordered by threshold; levels sharing a threshold keep their
+    configuration order, and the last of them wins (as the highest matching
+    level always has).
+    """
+
+    def __init__(self, level_thresholds: Dict[str, float]) -> None:
+        ordered = sorted(level_thresholds.items(), key=lambda kv: kv[1])
+        self.thresholds: List[float] = [threshold for _, threshold in ordered]
+        # Index 0 is used for scores below the lowest threshold.
+        self.levels: List[str] = [FALLBACK_RISK_LEVEL] + [level for level, _ in ordered]
+
+    def level_for(self, score: float) -> str:
+        """
+        Return the highest level whose threshold is less than or equal to score.
+        """
+        return self.levels[bisect_right(self.thresholds, score)]
+
+    def levels_for(self, scores: Sequence[float]) -> List[str]:
+        """
+        Return the level of every score (vectorized with NumPy when given an ndarray).
+        """
+        levels = self.levels
+        if np is not None and isinstance(scores, np.ndarray):
+            positions = np.searchsorted(np.asarray(self.thresholds, dtype=np.float64), scores, side="right")
+            return [levels[position] for position in positions.tolist()]
+        thresholds = self.thresholds
+        return [levels[bisect_right(thresholds, score)] for score in scores]
+
+
 def assign_risk_level(
     finding: Finding,
-    level_thresholds: Dict[str, float],
+    level_thresholds: Any,
 ) -> Finding:
     """
     Assign risk level based on score thresholds.
@@ -149,16 +221,14 @@ def assign_risk_level(
       }
 
     The highest matching level threshold less than or equal to the score is selected.
+    `level_thresholds` is a mapping like the one above or a RiskLevelTable
+    built from it; pass a table when scoring many findings.
     """
+    if not isinstance(level_thresholds, RiskLevelTable):
+        level_thresholds = RiskLevelTable(level_thresholds)
     score = finding.risk_score or 0.0
-    selected_level = "LOW"
-    # Sort thresholds by score ascending
-    sorted_levels = sorted(level_thresholds.items(), key=lambda kv: kv[1])
-    for level, threshold in sorted_levels:
-        if score >= threshold:
-            selected_level = level
-
-    finding.risk_level = selected_level
+
+    finding.risk_level = level_thresholds.level_for(score)
     logging.debug(
         "Finding '%s' assigned risk level '%s' for score %.2f",
         finding.id,
@@ -168,14 +238,335 @@ def assign_risk_level(
     return finding
 
 
+# -------------------------
+# Batch scoring
+# -------------------------
+
+
+@dataclass
+class ScoreColumns:
+    """
+    Scoring inputs of many findings as parallel float64 columns.
+    """
+    base: array
+    impact: array
+    likelihood: array
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+
+def severity_weight_lookup(
+    severities: Sequence[Any],
+    severity_weights: Dict[str, int],
+) -> Dict[Any, int]:
+    """
+    Map every distinct raw severity value to its weight.
+
+    Normalization runs once per distinct value instead of once per finding.
+    """
+    default = severity_weights.get("MEDIUM", 2)
+    lookup: Dict[Any, int] = {}
+    for severity in set(severities):
+        if not isinstance(severity, str):
+            logging.error("Invalid severity %r; expected a string.", severity)
+            raise SystemExit(1)
+        lookup[severity] = severity_weights.get(normalize_severity(severity), default)
+    return lookup
+
+
+def numeric_column(
+    records: Sequence[Dict[str, Any]],
+    key: str,
+    fallback: array,
+) -> array:
+    """
+    Extract a numeric field as a float64 column, using `fallback` where it is missing.
+    """
+    values = [item.get(key) for item in records]
+    try:
+        return array("d", [default if value is None else value for value, default in zip(values, fallback)])
+    except TypeError:
+        for item, value in zip(records, values):
+            if value is not None and not isinstance(value, (int, float)):
+                logging.error("Finding '%s' has a non-numeric %s: %r", item.get("id", ""), key, value)
+                break
+        raise SystemExit(1)
+
+
+def load_score_columns(
+    records: Sequence[Dict[str, Any]],
+    severity_weights: Dict[str, int],
+) -> ScoreColumns:
+    """
+    Load the scoring inputs of raw finding dictionaries into columns.
+
+    A missing impact or likelihood falls back to the severity weight, as in
+    calculate_risk_score.
+    """
+    severities = [item.get("severity", "MEDIUM") for item in records]
+    lookup = severity_weight_lookup(severities, severity_weights)
+    base = array("d", [lookup[severity] for severity in severities])
+    return ScoreColumns(
+        base=base,
+        impact=numeric_column(records, "impact", base),
+        likelihood=numeric_column(records, "likelihood", base),
+    )
+
+
+def resolve_vector_backend(preference: str) -> str:
+    """
+    Resolve the --vector-backend choice to "numpy" or "array".
+    """
+    if preference == "auto":
+        return "numpy" if np is not None else "array"
+    if preference == "numpy" and np is None:
+        logging.error("numpy is not installed. Install with `pip install numpy`.")
+        raise SystemExit(1)
+    return preference
+
+
+def batch_risk_scores(
+    columns: ScoreColumns,
+    impact_weight: float,
+    likelihood_weight: float,
+    backend: str,
+) -> Tuple[List[float], List[float]]:
+    """
+    Compute the unrounded scores of all findings in one pass.
+
+    Returns the rounded scores as Python floats (for output) and the same
+    scores as the backend's sequence type (for level assignment). Rounding
+    uses the built-in round() so results match calculate_risk_score exactly.
+    """
+    if backend == "numpy":
+        base = np.frombuffer(columns.base, dtype=np.float64)
+        impact = np.frombuffer(columns.impact, dtype=np.float64)
+        likelihood = np.frombuffer(columns.likelihood, dtype=np.float64)
+        raw = (base + impact * impact_weight + likelihood * likelihood_weight).tolist()
+        rounded = [round(score, 2) for score in raw]
+        return rounded, np.array(rounded, dtype=np.float64)
+
+    rounded = [
+        round(base + impact * impact_weight + likelihood * likelihood_weight, 2)
+        for base, impact, likelihood in zip(columns.base, columns.impact, columns.likelihood)
+    ]
+    return rounded, rounded
+
+
+def score_records(
+    records: List[Dict[str, Any]],
+    severity_weights: Dict[str, int],
+    impact_weight: float,
+    likelihood_weight: float,
+    level_table: RiskLevelTable,
+    backend: str,
+) -> None:
+    """
+    Score raw finding dictionaries in place with the batch engine.
+
+    Each record gets the defaults map_dict_to_finding would apply for the
+    core fields, plus `risk_score` and `risk_level`, so the saved output is
+    identical to the scalar engine's. No Finding objects are built.
+    """
+    columns = load_score_columns(records, severity_weights)
+    scores, score_vector = batch_risk_scores(columns, impact_weight, likelihood_weight, backend)
+    levels = level_table.levels_for(score_vector)
+
+    for item, score, level in zip(records, scores, levels):
+        apply_core_defaults(item)
+        item["risk_score"] = score
+        item["risk_level"] = level
+    logging.debug("Scored %d findings with the %s batch backend.", len(records), backend)
+
+
+def apply_core_defaults(item: Dict[str, Any]) -> None:
+    """
+    Add the core fields a Finding would carry when they are missing from a record.
+    """
+    for key, default in CORE_FIELD_DEFAULTS:
+        if key not in item:
+            item[key] = default
+
+
+# -------------------------
+# Incremental scoring
+# -------------------------
+
+
+def config_fingerprint(
+    severity_weights: Dict[str, int],
+    impact_weight: float,
+    likelihood_weight: float,
+    level_thresholds: Dict[str, float],
+) -> str:
+    """
+    Hash everything besides a finding's own fields that affects its score.
+
+    Risk level order is kept as configured, since it breaks threshold ties.
+    """
+    material = json.dumps(
+        {
+            "version": SCORE_CACHE_VERSION,
+            "severity_weights": severity_weights,
+            "impact_weight": impact_weight,
+            "likelihood_weight": likelihood_weight,
+            "risk_levels": list(level_thresholds.items()),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IncrementalStats:
+    """
+    Outcome of an incremental scoring run.
+    """
+    rescored: int = 0
+    cached: int = 0
+    dropped: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.rescored + self.cached
+        return self.cached / total * 100.0 if total else 0.0
+
+
+class ScoreCache:
+    """
+    Persisted scores of the previous run, keyed by finding id.
+
+    Each entry holds the scoring inputs the score was computed from
+    (severity, impact, likelihood) followed by the risk score and level. An
+    entry is reused only while those inputs compare equal and the whole
+    cache was written under the same configuration hash.
+    """
+
+    def __init__(self, path: Path, config_hash: str, entries: Dict[str, List[Any]]) -> None:
+        self.path = path
+        self.config_hash = config_hash
+        self.entries = entries
+
+    @classmethod
+    def load(cls, path: Path, config_hash: str) -> "ScoreCache":
+        """
+        Read the cache; a missing, unreadable or stale cache starts empty.
+        """
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.loads(f.read())
+        except FileNotFoundError:
+            logging.info("Score cache '%s' does not exist yet; scoring every finding.", path)
+            return cls(path, config_hash, {})
+        except (OSError, ValueError) as exc:
+            logging.warning("Ignoring unreadable score cache '%s': %s", path, exc)
+            return cls(path, config_hash, {})
+
+        if not isinstance(data, dict) or not isinstance(data.get("entries"), dict):
+            logging.warning("Ignoring malformed score cache '%s'.", path)
+            return cls(path, config_hash, {})
+        if data.get("version") != SCORE_CACHE_VERSION or data.get("config_hash") != config_hash:
+            logging.info(
+                "Scoring configuration changed since '%s' was written; discarding %d cached scores.",
+                path,
+                len(data["entries"]),
+            )
+            return cls(path, config_hash, {})
+        return cls(path, config_hash, data["entries"])
+
+    def save(self) -> None:
+        """
+        Atomically rewrite the cache (temp file, fsync, rename).
+        """
+        payload = json.dumps(
+            {"version": SCORE_CACHE_VERSION, "config_hash": self.config_hash, "entries": self.entries},
+            separators=(",", ":"),
+        )
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logging.error("Unable to write score cache '%s': %s", self.path, exc)
+            raise SystemExit(1)
+
+
+def score_records_incremental(
+    records: List[Dict[str, Any]],
+    cache: ScoreCache,
+    severity_weights: Dict[str, int],
+    impact_weight: float,
+    likelihood_weight: float,
+    level_table: RiskLevelTable,
+    backend: str,
+) -> Tuple[List[Dict[str, Any]], IncrementalStats]:
+    """
+    Score records in place, reusing cached scores of unchanged findings.
+
+    Findings that are new, changed, lack an id or share their id with
+    another finding are scored with the batch engine. The cache entries are
+    replaced by those of this run, so findings that disappeared are dropped.
+
+    Returns
+    -------
+    Tuple[List[Dict[str, Any]], IncrementalStats]
+        The re-scored records (the delta) and the hit/miss counts.
+    """
+    previous = cache.entries
+    entries: Dict[str, List[Any]] = {}
+    stale: List[Dict[str, Any]] = []
+    stats = IncrementalStats()
+
+    for item in records:
+        finding_id = item.get("id", "")
+        severity = item.get("severity", "MEDIUM")
+        impact = item.get("impact")
+        likelihood = item.get("likelihood")
+        entry = previous.get(finding_id) if isinstance(finding_id, str) else None
+        if (
+            entry is not None
+            and finding_id not in entries
+            and entry[0] == severity
+            and entry[1] == impact
+            and entry[2] == likelihood
+        ):
+            apply_core_defaults(item)
+            item["risk_score"] = entry[3]
+            item["risk_level"] = entry[4]
+            entries[finding_id] = entry
+            stats.cached += 1
+        else:
+            stale.append(item)
+
+    score_records(stale, severity_weights, impact_weight, likelihood_weight, level_table, backend)
+    for item in stale:
+        finding_id = item["id"]
+        if finding_id and isinstance(finding_id, str):
+            # Only one entry is kept per id, so findings sharing an id keep
+            # being re-scored; every served entry still matches its inputs.
+            entries.setdefault(
+                finding_id,
+                [item["severity"], item["impact"], item["likelihood"], item["risk_score"], item["risk_level"]],
+            )
+    stats.rescored = len(stale)
+    stats.dropped = sum(1 for finding_id in previous if finding_id not in entries)
+
+    cache.entries = entries
+    return stale, stats
+
+
 # -------------------------
 # I/O helpers
 # -------------------------
 
 
-def load_findings(path: Path) -> List[Finding]:
+def load_records(path: Path) -> List[Dict[str, Any]]:
     """
-    Load findings from JSON file.
+    Load raw finding dictionaries from JSON file.
     """
     if not path.exists():
         logging.error("Findings file '%s' does not exist.", path)
@@ -188,32 +579,51 @@ def load_findings(path: Path) -> List[Finding]:
         logging.error("Unable to parse findings JSON: %s", exc)
         raise SystemExit(1)
 
-    findings = [map_dict_to_finding(item) for item in raw_list]
+    if not isinstance(raw_list, list) or not all(isinstance(item, dict) for item in raw_list):
+        logging.error("Findings file '%s' must contain a JSON array of objects.", path)
+        raise SystemExit(1)
+    return raw_list
+
+
+def load_findings(path: Path) -> List[Finding]:
+    """
+    Load findings from JSON file.
+    """
+    findings = [map_dict_to_finding(item) for item in load_records(path)]
     logging.debug("Loaded %d findings from '%s'.", len(findings), path)
     return findings
 
 
-def save_findings(path: Path, findings: List[Finding]) -> None:
+def finding_to_record(finding: Finding) -> Dict[str, Any]:
     """
-    Persist findings with risk scores to JSON file.
+    Flatten a Finding back into a dictionary, merging metadata into the top level.
     """
-    serialized: List[Dict[str, Any]] = []
-    for finding in findings:
-        base = asdict(finding)
-        # Merge metadata back into top-level structure
-        metadata = base.pop("metadata", {}) or {}
-        merged = {**metadata, **base}
-        serialized.append(merged)
+    base = asdict(finding)
+    metadata = base.pop("metadata", {}) or {}
+    return {**metadata, **base}
+
 
+def save_records(path: Path, records: List[Dict[str, Any]]) -> None:
+    """
+    Persist scored finding dictionaries to JSON file.
+    """
     try:
+        payload = json.dumps(records, indent=2, sort_keys=True)
         with path.open("w", encoding="utf-8") as f:
-            json.dump(serialized, f, indent=2, sort_keys=True)
-        logging.info("Saved %d scored findings to '%s'.", len(findings), path)
+            f.write(payload)
+        logging.info("Saved %d scored findings to '%s'.", len(records), path)
     except OSError as exc:
         logging.error("Unable to write findings JSON: %s", exc)
         raise SystemExit(1)
 
 
+def save_findings(path: Path, findings: List[Finding]) -> None:
+    """
+    Persist findings with risk scores to JSON file.
+    """
+    save_records(path, [finding_to_record(finding) for finding in findings])
+
+
 def load_config(config_path: Optional[Path]) -> Dict[str, Any]:
     """
     Load optional config file for risk scoring logic.
@@ -295,6 +705,35 @@ def build_parser() -> argparse.ArgumentParser:
         help="Override likelihood weight (multiplier)."
     )
 
+    parser.add_argument(
+        "--engine",
+        default="batch",
+        choices=ENGINES,
+        help="batch scores all findings in one columnar pass; scalar builds a "
+        "Finding per record and logs every score at DEBUG level."
+    )
+
+    parser.add_argument(
+        "--vector-backend",
+        default="auto",
+        choices=VECTOR_BACKENDS,
+        help="Column arithmetic for the batch engine; auto uses NumPy when installed."
+    )
+
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        help="Score cache file enabling incremental mode: unchanged findings reuse "
+        "their cached score (batch engine only)."
+    )
+
+    parser.add_argument(
+        "--delta-output",
+        type=Path,
+        help="Path for the re-scored findings in incremental mode. Defaults to the "
+        "output path with a '.delta.json' suffix."
+    )
+
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -316,6 +755,10 @@ def main(argv: Optional[List[str]] = None) -> None:
     """
     parser = build_parser()
     args = parser.parse_args(argv)
+    if args.cache is not None and args.engine != "batch":
+        parser.error("--cache requires the batch engine.")
+    if args.delta_output is not None and args.cache is None:
+        parser.error("--delta-output requires --cache.")
 
     logging.basicConfig(
         level=getattr(logging, args.log_level),
@@ -338,15 +781,8 @@ def main(argv: Optional[List[str]] = None) -> None:
         else config.get("likelihood_weight", 1.0)
     )
 
-    level_thresholds: Dict[str, float] = config.get(
-        "risk_levels",
-        {
-            "LOW": 0.0,
-            "MEDIUM": 5.0,
-            "HIGH": 10.0,
-            "CRITICAL": 15.0,
-        },
-    )
+    level_thresholds: Dict[str, float] = config.get("risk_levels", DEFAULT_RISK_LEVELS)
+    level_table = RiskLevelTable(level_thresholds)
 
     logging.info(
         "Using impact_weight=%.2f, likelihood_weight=%.2f",
@@ -354,6 +790,37 @@ def main(argv: Optional[List[str]] = None) -> None:
         likelihood_weight,
     )
 
+    output_path = args.output or args.input
+
+    if args.engine == "batch":
+        backend = resolve_vector_backend(args.vector_backend)
+        records = load_records(args.input)
+        if args.cache is None:
+            score_records(
+                records, severity_weights, impact_weight, likelihood_weight, level_table, backend
+            )
+            save_records(output_path, records)
+            return
+
+        cache = ScoreCache.load(
+            args.cache,
+            config_fingerprint(severity_weights, impact_weight, likelihood_weight, level_thresholds),
+        )
+        delta, stats = score_records_incremental(
+            records, cache, severity_weights, impact_weight, likelihood_weight, level_table, backend
+        )
+        save_records(args.delta_output or output_path.with_suffix(".delta.json"), delta)
+        save_records(output_path, records)
+        cache.save()
+        logging.info(
+            "Re-scored %d findings, served %d from cache (%.1f%% hit rate); %d cache entries dropped.",
+            stats.rescored,
+            stats.cached,
+            stats.hit_rate,
+            stats.dropped,
+        )
+        return
+
     findings = load_findings(args.input)
     scored_findings: List[Finding] = []
 
@@ -361,10 +828,9 @@ def main(argv: Optional[List[str]] = None) -> None:
         finding = calculate_risk_score(
             finding, severity_weights, impact_weight, likelihood_weight
         )
-        finding = assign_risk_level(finding, level_thresholds)
+        finding = assign_risk_level(finding, level_table)
         scored_findings.append(finding)
 
-    output_path = args.output or args.input
     save_findings(output_path, scored_findings)
 
 
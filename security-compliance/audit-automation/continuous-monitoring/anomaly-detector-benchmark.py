@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+"""
+anomaly-detector-benchmark.py
+
+Micro-benchmarks for the continuous monitoring pipeline.
+
+Responsibilities:
+- Load anomaly-detector.py / real-time-compliance-monitor.py from this
+  directory (they are not importable names)
+- window: compare the incremental SlidingWindowStats against the original
+  full-window statistics.mean/statistics.pstdev baseline and report
+  throughput (events/sec) and the largest numeric deviation
+- decode: measure JSON lines ingestion throughput of the stream_io decoder
+  backends against the line-by-line strip + json.loads baseline
+- detectors: measure per-event scoring throughput of each detector type
+- checkpoint: measure --state-file snapshot size, save time and restart
+  (load) time for a large keyed state table
+- rate: measure real-time-compliance-monitor.py event-time rate limiter
+  throughput and memory growth on an out-of-order event stream
+
+Usage:
+    python3 anomaly-detector-benchmark.py window --events 5000 --window-sizes 20 500 5000
+    python3 anomaly-detector-benchmark.py decode --size-mb 1024
+    python3 anomaly-detector-benchmark.py detectors --events 200000 --window-size 500
+    python3 anomaly-detector-benchmark.py checkpoint --keys 1000000
+    python3 anomaly-detector-benchmark.py rate --events 1000000
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+DETECTOR_PATH = Path(__file__).resolve().with_name("anomaly-detector.py")
+MONITOR_PATH = Path(__file__).resolve().with_name("real-time-compliance-monitor.py")
+
+
+def load_detector_module(
+    path: Path = DETECTOR_PATH,
+    name: str = "anomaly_detector",
+) -> ModuleType:
+    """
+    Import a hyphenated script from this directory by file path.
+
+    Parameters
+    ----------
+    path : Path
+        Location of the script (anomaly-detector.py by default).
+    name : str
+        Module name to register it under.
+
+    Returns
+    -------
+    ModuleType
+        Loaded module object.
+    """
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"Unable to load detector module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# -----------------------------
+# Baseline implementation
+# -----------------------------
+
+
+class StatisticsSlidingWindow:
+    """
+    Reference window that recomputes mean/pstdev over the full deque.
+
+    This mirrors the original O(window) SlidingWindowStats and is kept here
+    only as a correctness and performance baseline.
+    """
+
+    def __init__(self, window_size: int) -> None:
+        self.values: Deque[float] = deque(maxlen=window_size)
+
+    def add(self, value: float) -> None:
+        self.values.append(value)
+
+    def mean_and_std(self) -> Tuple[Optional[float], Optional[float]]:
+        if not self.values:
+            return None, None
+        if len(self.values) == 1:
+            return float(self.values[0]), None
+        return (
+            float(statistics.mean(self.values)),
+            float(statistics.pstdev(self.values)),
+        )
+
+
+# -----------------------------
+# Benchmark helpers
+# -----------------------------
+
+
+def generate_values(count: int, seed: int) -> List[float]:
+    """
+    Produce a synthetic login-failure-like metric stream with rare spikes.
+    """
+    rng = random.Random(seed)
+    values: List[float] = []
+    for _ in range(count):
+        value = max(0.0, rng.gauss(40.0, 6.0))
+        if rng.random() < 0.001:
+            value *= 10.0
+        values.append(round(value, 3))
+    return values
+
+
+def time_window(
+    factory: Callable[[int], Any],
+    window_size: int,
+    values: Iterable[float],
+) -> Tuple[float, List[Tuple[Optional[float], Optional[float]]]]:
+    """
+    Feed values through a window implementation and time add + mean_and_std.
+
+    Returns
+    -------
+    Tuple[float, List[Tuple[Optional[float], Optional[float]]]]
+        (elapsed seconds, per-event (mean, std) results).
+    """
+    window = factory(window_size)
+    results: List[Tuple[Optional[float], Optional[float]]] = []
+    append = results.append
+    start = time.perf_counter()
+    for value in values:
+        window.add(value)
+        append(window.mean_and_std())
+    return time.perf_counter() - start, results
+
+
+def max_deviation(
+    left: List[Tuple[Optional[float], Optional[float]]],
+    right: List[Tuple[Optional[float], Optional[float]]],
+) -> float:
+    """
+    Largest absolute difference across paired (mean, std) results.
+    """
+    worst = 0.0
+    for (mean_a, std_a), (mean_b, std_b) in zip(left, right):
+        for a, b in ((mean_a, mean_b), (std_a, std_b)):
+            if a is None or b is None:
+                if a is not b:
+                    return float("inf")
+                continue
+            worst = max(worst, abs(a - b))
+    return worst
+
+
+def run_benchmark(events: int, window_sizes: List[int], seed: int) -> List[Dict[str, Any]]:
+    """
+    Benchmark both implementations for each window size.
+    """
+    detector = load_detector_module()
+    values = generate_values(events, seed)
+    rows: List[Dict[str, Any]] = []
+
+    for window_size in window_sizes:
+        base_elapsed, base_results = time_window(StatisticsSlidingWindow, window_size, values)
+        inc_elapsed, inc_results = time_window(detector.SlidingWindowStats, window_size, values)
+        rows.append(
+            {
+                "window_size": window_size,
+                "events": events,
+                "statistics_events_per_sec": round(events / base_elapsed, 1),
+                "incremental_events_per_sec": round(events / inc_elapsed, 1),
+                "speedup": round(base_elapsed / inc_elapsed, 2),
+                "max_abs_deviation": max_deviation(base_results, inc_results),
+            }
+        )
+    return rows
+
+
+def generate_events_file(path: Path, size_mb: int, seed: int) -> int:
+    """
+    Write a synthetic JSON lines events file of roughly ``size_mb`` MiB.
+
+    A pool of distinct events is generated once and repeated, so creating
+    a 1 GiB file is bound by disk speed rather than json.dumps.
+
+    Returns
+    -------
+    int
+        Number of events written.
+    """
+    rng = random.Random(seed)
+    pool: List[bytes] = []
+    for index in range(4096):
+        event = {
+            "timestamp": f"2025-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}Z",
+            "type": rng.choice(["auth", "config_change", "network", "privilege"]),
+            "severity": rng.choice(["low", "medium", "high", "critical"]),
+            "host": f"host-{rng.randrange(3000):04d}",
+            "user": f"user-{rng.randrange(50000)}",
+            "metric": rng.choice(["login_failures", "bytes_out", "sudo_calls"]),
+            "count": round(max(0.0, rng.gauss(40.0, 6.0)), 3),
+            "message": "synthetic benchmark event " + "x" * rng.randrange(16, 96),
+        }
+        pool.append(json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    target = size_mb * 1024 * 1024
+    written = 0
+    events = 0
+    with path.open("wb") as f:
+        while written < target:
+            block = b"".join(pool)
+            f.write(block)
+            written += len(block)
+            events += len(pool)
+    return events
+
+
+def count_stdlib_lines(path: Path) -> int:
+    """
+    Baseline ingestion: text iteration, line.strip() and json.loads per line.
+    """
+    count = 0
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            json.loads(line)
+            count += 1
+    return count
+
+
+def count_chunked(path: Path, decoder: Any, logger: logging.Logger) -> int:
+    """
+    Chunked binary ingestion through stream_io with the given decoder.
+    """
+    import stream_io
+
+    count = 0
+    with path.open("rb") as f:
+        for _ in stream_io.iter_decoded_events(stream_io.iter_raw_lines(f), decoder, logger):
+            count += 1
+    return count
+
+
+def run_decode_benchmark(
+    size_mb: int,
+    seed: int,
+    input_path: Optional[Path],
+    keep: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Benchmark the line-by-line baseline and each installed decoder backend.
+    """
+    import stream_io
+
+    logger = logging.getLogger("anomaly_detector_benchmark")
+    if input_path is None:
+        handle, name = tempfile.mkstemp(prefix="events-bench-", suffix=".jsonl")
+        os.close(handle)
+        path = Path(name)
+        generate_events_file(path, size_mb, seed)
+    else:
+        path = input_path
+    size_bytes = path.stat().st_size
+
+    candidates: List[Tuple[str, Callable[[], int]]] = [
+        ("readline+json.loads", lambda: count_stdlib_lines(path)),
+    ]
+    for backend in ("json", "msgspec", "orjson"):
+        try:
+            decoder = stream_io.select_decoder(backend)
+        except ValueError:
+            continue
+        candidates.append(
+            (f"chunked+{backend}", lambda decoder=decoder: count_chunked(path, decoder, logger))
+        )
+
+    rows: List[Dict[str, Any]] = []
+    try:
+        for label, runner in candidates:
+            start = time.perf_counter()
+            events = runner()
+            elapsed = time.perf_counter() - start
+            rows.append(
+                {
+                    "reader": label,
+                    "events": events,
+                    "size_mb": round(size_bytes / (1024 * 1024), 1),
+                    "seconds": round(elapsed, 3),
+                    "mb_per_sec": round(size_bytes / (1024 * 1024) / elapsed, 1),
+                    "events_per_sec": round(events / elapsed, 1),
+                }
+            )
+    finally:
+        if input_path is None and not keep:
+            path.unlink()
+    return rows
+
+
+def run_detector_benchmark(events: int, window_size: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Benchmark score() throughput for every detector type on one stream.
+
+    Seasonal scoring is fed one event per minute of synthetic event time.
+    """
+    detector = load_detector_module()
+    values = generate_values(events, seed)
+    times = [1735689600.0 + 60.0 * index for index in range(events)]
+    rows: List[Dict[str, Any]] = []
+
+    for name in detector.DETECTOR_CHOICES:
+        settings = detector.MetricSettings(
+            window_size=window_size, zscore_threshold=3.0, detector=name
+        )
+        instance = detector.build_detector(settings)
+        score = instance.score
+        flagged = 0
+        start = time.perf_counter()
+        for value, event_time in zip(values, times):
+            result = score(value, event_time)
+            if result is not None and result >= 3.0:
+                flagged += 1
+        elapsed = time.perf_counter() - start
+        rows.append(
+            {
+                "detector": name,
+                "window_size": window_size,
+                "events": events,
+                "events_per_sec": round(events / elapsed, 1),
+                "flagged": flagged,
+            }
+        )
+    return rows
+
+
+def run_checkpoint_benchmark(
+    keys: int,
+    values_per_key: int,
+    window_size: int,
+    lookups: int,
+    seed: int,
+) -> List[Dict[str, Any]]:
+    """
+    Snapshot a keyed z-score state table, then time loading it back.
+
+    "load" is the restart cost (read, checksum and key index); "restore"
+    is the cost of rebuilding detectors for the first ``lookups`` keys
+    that reappear after the restart.
+    """
+    detector = load_detector_module()
+    logger = logging.getLogger("anomaly_detector_benchmark")
+    settings = detector.MetricSettings(window_size=window_size, zscore_threshold=3.0)
+    rng = random.Random(seed)
+
+    table = detector.DetectorStateTable(max_keys=keys)
+    for index in range(keys):
+        window = table.get(("login_failures", f"host-{index}"), settings)
+        for _ in range(values_per_key):
+            window.add(rng.gauss(40.0, 6.0))
+
+    handle, name = tempfile.mkstemp(prefix="detector-state-", suffix=".bin")
+    os.close(handle)
+    path = Path(name)
+    try:
+        start = time.perf_counter()
+        size = detector.write_state_file(path, [table.export_section()])
+        save_elapsed = time.perf_counter() - start
+        del table
+
+        start = time.perf_counter()
+        snapshot = detector.StateSnapshot.load(path, logger)
+        restored_table = detector.DetectorStateTable(max_keys=keys)
+        restored_table.attach_snapshot(snapshot)
+        load_elapsed = time.perf_counter() - start
+
+        sample = rng.sample(range(keys), min(lookups, keys))
+        start = time.perf_counter()
+        for index in sample:
+            restored_table.get(("login_failures", f"host-{index}"), settings)
+        restore_elapsed = time.perf_counter() - start
+    finally:
+        path.unlink()
+
+    return [
+        {
+            "keys": keys,
+            "window_size": window_size,
+            "snapshot_mb": round(size / (1024 * 1024), 1),
+            "save_seconds": round(save_elapsed, 3),
+            "load_seconds": round(load_elapsed, 3),
+            "restored_keys": restored_table.restored,
+            "restore_keys_per_sec": round(len(sample) / restore_elapsed, 1),
+        }
+    ]
+
+
+def run_rate_benchmark(events: int, lateness: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Feed a synthetic, partly out-of-order stream through EventRateLimiter.
+
+    Events arrive at roughly ``events / 600`` per second of event time
+    across 16 event types; 10% lag by up to twice the allowed lateness.
+    Memory is sampled with tracemalloc after the first and last 10% of
+    the stream to show that limiter state does not grow with input.
+    """
+    monitor = load_detector_module(MONITOR_PATH, "real_time_compliance_monitor")
+    logger = logging.getLogger("anomaly_detector_benchmark")
+    thresholds = {
+        "severity_thresholds": {
+            "low": {"max_per_minute": 500},
+            "medium": {"max_per_minute": 200},
+            "high": {"max_per_minute": 50},
+            "critical": {"max_per_minute": 10},
+        }
+    }
+    rng = random.Random(seed)
+    severities = ["low", "medium", "high", "critical"]
+    types = [f"type-{index}" for index in range(16)]
+    per_second = max(1, events // 600)
+    stream: List[Dict[str, Any]] = []
+    for index in range(events):
+        second = 1735689600 + index // per_second
+        if rng.random() < 0.1:
+            second -= rng.randrange(0, 2 * lateness + 1)
+        stream.append(
+            {
+                "type": rng.choice(types),
+                "severity": rng.choice(severities),
+                "timestamp": second,
+            }
+        )
+
+    limiter = monitor.EventRateLimiter(thresholds, lateness, "timestamp", logger)
+    observe = limiter.observe
+    findings = 0
+    start = time.perf_counter()
+    for event in stream:
+        findings += len(observe(event))
+    elapsed = time.perf_counter() - start
+
+    # Separate pass under tracemalloc, which would distort the timing.
+    memory_limiter = monitor.EventRateLimiter(thresholds, lateness, "timestamp", logger)
+    checkpoint = max(1, events // 10)
+    memory: List[int] = []
+    tracemalloc.start()
+    for index, event in enumerate(stream, start=1):
+        memory_limiter.observe(event)
+        if index == checkpoint or index == events:
+            memory.append(tracemalloc.get_traced_memory()[0])
+    tracemalloc.stop()
+
+    return [
+        {
+            "events": events,
+            "allowed_lateness": lateness,
+            "events_per_sec": round(events / elapsed, 1),
+            "saturation_findings": findings,
+            "late_events": limiter.late_events,
+            "memory_kb_at_10pct": round(memory[0] / 1024, 1),
+            "memory_kb_at_end": round(memory[-1] / 1024, 1),
+        }
+    ]
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    """
+    Parse CLI arguments.
+    """
+    parser = argparse.ArgumentParser(description="Continuous monitoring micro-benchmarks.")
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=1337,
+        help="Random seed for synthetic data.",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Emit results as JSON instead of a table.",
+    )
+    subparsers = parser.add_subparsers(dest="suite", required=True)
+
+    window_p = subparsers.add_parser(
+        "window", help="Incremental vs. statistics-based sliding window."
+    )
+    window_p.add_argument(
+        "--events",
+        type=int,
+        default=5000,
+        help="Number of synthetic metric values per window size "
+        "(the statistics baseline is slow at large windows).",
+    )
+    window_p.add_argument(
+        "--window-sizes",
+        type=int,
+        nargs="+",
+        default=[20, 500, 5000],
+        help="Window sizes to benchmark.",
+    )
+
+    decode_p = subparsers.add_parser("decode", help="JSON lines ingestion throughput.")
+    decode_p.add_argument(
+        "--size-mb",
+        type=int,
+        default=1024,
+        help="Size of the generated events file in MiB.",
+    )
+    decode_p.add_argument(
+        "--input-file",
+        type=Path,
+        help="Benchmark an existing JSON lines file instead of generating one.",
+    )
+    decode_p.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the generated events file.",
+    )
+
+    detectors_p = subparsers.add_parser("detectors", help="Per-detector scoring throughput.")
+    detectors_p.add_argument(
+        "--events",
+        type=int,
+        default=200000,
+        help="Number of synthetic metric values per detector.",
+    )
+    detectors_p.add_argument(
+        "--window-size",
+        type=int,
+        default=500,
+        help="Window size for the zscore and mad detectors.",
+    )
+
+    checkpoint_p = subparsers.add_parser(
+        "checkpoint", help="State snapshot size, save and restart time."
+    )
+    checkpoint_p.add_argument(
+        "--keys",
+        type=int,
+        default=1000000,
+        help="Number of keyed detectors in the state table.",
+    )
+    checkpoint_p.add_argument(
+        "--values-per-key",
+        type=int,
+        default=20,
+        help="Values fed to each key before the snapshot.",
+    )
+    checkpoint_p.add_argument(
+        "--window-size",
+        type=int,
+        default=20,
+        help="z-score window size.",
+    )
+    checkpoint_p.add_argument(
+        "--lookups",
+        type=int,
+        default=100000,
+        help="Keys looked up (and restored) after loading the snapshot.",
+    )
+
+    rate_p = subparsers.add_parser("rate", help="Event-time rate limiter throughput.")
+    rate_p.add_argument(
+        "--events",
+        type=int,
+        default=1000000,
+        help="Number of synthetic events.",
+    )
+    rate_p.add_argument(
+        "--allowed-lateness",
+        type=int,
+        default=5,
+        help="Allowed lateness in seconds.",
+    )
+    return parser.parse_args(list(argv) if argv is not None else None)
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    """
+    Print result rows as an aligned table.
+    """
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = {
+        column: max(len(column), *(len(f"{row[column]}") for row in rows))
+        for column in columns
+    }
+    print("  ".join(f"{column:>{widths[column]}}" for column in columns))
+    for row in rows:
+        print("  ".join(f"{row[column]!s:>{widths[column]}}" for column in columns))
+
+
+def main() -> None:
+    """
+    Entry point for the benchmark.
+    """
+    args = parse_args()
+    if args.suite == "window":
+        rows = run_benchmark(args.events, args.window_sizes, args.seed)
+    elif args.suite == "detectors":
+        rows = run_detector_benchmark(args.events, args.window_size, args.seed)
+    elif args.suite == "rate":
+        rows = run_rate_benchmark(args.events, args.allowed_lateness, args.seed)
+    elif args.suite == "checkpoint":
+        rows = run_checkpoint_benchmark(
+            args.keys, args.values_per_key, args.window_size, args.lookups, args.seed
+        )
+    else:
+        rows = run_decode_benchmark(args.size_mb, args.seed, args.input_file, args.keep)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
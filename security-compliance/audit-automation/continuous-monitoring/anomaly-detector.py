@@ -2,11 +2,15 @@
 """
 anomaly-detector.py
 
-Stateless anomaly detection utility for compliance/security metrics and events.
+Stateful, keyed anomaly detection utility for compliance/security metrics and events.
 
 Responsibilities:
 - Ingest events or metrics (JSON lines) from a file or stdin
 - Load alert thresholds and anomaly policies from a YAML file
+- Keep bounded per-metric, per-entity baselines (e.g., per host/user)
+- Optionally checkpoint baselines to a state file and restore them on restart
+- Hot-reload the anomaly_detection settings on change or SIGHUP
+  (config_reload.py), keeping baselines whose detector did not change
 - Flag anomalies when thresholds are breached or patterns are unusual
 - Emit structured anomaly records for downstream systems
 
@@ -15,20 +19,42 @@ as a baseline; you can plug in more advanced ML-based models where indicated.
 """
 
 import argparse
+import bisect
+import heapq
 import json
 import logging
-import statistics
+import math
+import multiprocessing
+import pickle
+import queue
+import os
+import signal
+import struct
 import sys
-from collections import defaultdict, deque
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
-
-try:
-    import yaml  # type: ignore
-except ImportError as exc:
-    raise SystemExit(
-        "Missing dependency: pyyaml. Install with `pip install pyyaml`."
-    ) from exc
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config_reload import ConfigError, ReloadMetrics, ReloadTrigger, read_yaml_mapping
+from stream_io import (
+    COMPRESSION_CHOICES,
+    DECODER_CHOICES,
+    FSYNC_POLICIES,
+    JsonDecoder,
+    JsonlSink,
+    install_termination_handler,
+    iter_decoded_events,
+    iter_raw_line_chunks,
+    iter_raw_lines,
+    parse_event_time,
+    select_decoder,
+    serialize_record,
+)
 
 
 # -----------------------------
@@ -78,6 +104,14 @@ def setup_logger(verbosity: int) -> logging.Logger:
 # -----------------------------
 
 
+# Seconds the single-process loop waits for input before running its
+# housekeeping (reload checks, periodic checkpoints) anyway.
+HOUSEKEEPING_INTERVAL_SECONDS = 1.0
+
+# Input reads buffered ahead of detection in single-process mode.
+READ_AHEAD_CHUNKS = 8
+
+
 def load_thresholds(path: Path, logger: logging.Logger) -> Dict[str, Any]:
     """
     Load thresholds and anomaly policies from YAML.
@@ -99,13 +133,60 @@ def load_thresholds(path: Path, logger: logging.Logger) -> Dict[str, Any]:
         raise SystemExit(1)
 
     try:
-        with path.open("r", encoding="utf-8") as f:
-            config = yaml.safe_load(f) or {}
-        logger.debug("Loaded thresholds config from %s", path)
-        return config
-    except Exception as exc:
+        config = read_yaml_mapping(path)
+    except ConfigError as exc:
         logger.error("Failed to parse thresholds YAML: %s", exc)
         raise SystemExit(1)
+    logger.debug("Loaded thresholds config from %s", path)
+    return config
+
+
+def poll_thresholds_reload(
+    trigger: ReloadTrigger,
+    metrics: ReloadMetrics,
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    apply: Callable[[Dict[str, Any]], Any],
+) -> None:
+    """
+    Reload the thresholds YAML if ``trigger`` reports a change or SIGHUP.
+
+    The new ``anomaly_detection`` section is validated before ``apply``
+    receives it; an unreadable or invalid file is rejected with an error
+    log and the active settings stay in effect.
+
+    Parameters
+    ----------
+    trigger : ReloadTrigger
+        Watches ``--thresholds`` and SIGHUP.
+    metrics : ReloadMetrics
+        Reload metrics to update.
+    args : argparse.Namespace
+        Parsed CLI arguments.
+    logger : logging.Logger
+        Logger instance.
+    apply : Callable[[Dict[str, Any]], Any]
+        Activates a validated section (may raise ConfigError).
+    """
+    requested_at = trigger.poll()
+    if requested_at is None:
+        return
+    logger.info("Reloading thresholds (%s).", trigger.reason)
+    try:
+        anomaly_config = read_yaml_mapping(args.thresholds).get("anomaly_detection") or {}
+        compile_metric_settings(anomaly_config, (), args)
+        apply(anomaly_config)
+    except ConfigError as exc:
+        metrics.record(False, time.monotonic() - requested_at)
+        logger.error(
+            "Rejected thresholds reload; generation %d stays active: %s",
+            metrics.generation,
+            exc,
+        )
+        return
+    latency = time.monotonic() - requested_at
+    metrics.record(True, latency)
+    logger.info("Reloaded thresholds generation %d in %.3fs.", metrics.generation, latency)
 
 
 # -----------------------------
@@ -113,81 +194,85 @@ def load_thresholds(path: Path, logger: logging.Logger) -> Dict[str, Any]:
 # -----------------------------
 
 
-def iter_events_from_file(path: Path, logger: logging.Logger) -> Iterable[Dict[str, Any]]:
+def open_input_stream(
+    source: str,
+    input_file: Optional[Path],
+    logger: logging.Logger,
+) -> BinaryIO:
     """
-    Yield JSON events from a newline-delimited JSON file.
+    Open the event input as an unbuffered binary stream.
+
+    Input is read on a daemon thread; unbuffered, each chunk is a single
+    read() call, and a reader blocked on idle stdin holds no buffer lock
+    at exit.
 
     Parameters
     ----------
-    path : Path
-        Path to input file.
+    source : str
+        Either "file" or "stdin".
+    input_file : Optional[Path]
+        Required when source="file".
     logger : logging.Logger
         Logger instance.
 
-    Yields
-    ------
-    Dict[str, Any]
-        Parsed JSON objects.
+    Returns
+    -------
+    BinaryIO
+        The opened stream.
     """
-    if not path.is_file():
-        logger.error("Input file does not exist: %s", path)
-        raise SystemExit(1)
+    if source == "file":
+        if not input_file or not input_file.is_file():
+            logger.error("Input file does not exist: %s", input_file)
+            raise SystemExit(1)
+        return input_file.open("rb", buffering=0)
+    if source == "stdin":
+        logger.info("Reading JSON events from stdin.")
+        return open(sys.stdin.fileno(), "rb", buffering=0, closefd=False)
 
-    try:
-        with path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                    logger.debug("Read event: %s", event)
-                    yield event
-                except json.JSONDecodeError as exc:
-                    logger.warning("Skipping invalid JSON line: %s | error=%s", line, exc)
-    except Exception as exc:
-        logger.error("Error while reading events from file: %s", exc)
-        raise SystemExit(1)
+    logger.error("Unsupported source: %s", source)
+    raise SystemExit(1)
 
 
-def iter_events_from_stdin(logger: logging.Logger) -> Iterable[Dict[str, Any]]:
+def iter_line_chunks(
+    source: str,
+    input_file: Optional[Path],
+    logger: logging.Logger,
+) -> Iterable[List[bytes]]:
     """
-    Yield JSON events from stdin.
+    Yield the raw input lines of each read, as they arrive (single-process mode).
 
     Parameters
     ----------
+    source : str
+        Either "file" or "stdin".
+    input_file : Optional[Path]
+        Required when source="file".
     logger : logging.Logger
         Logger instance.
 
     Yields
     ------
-    Dict[str, Any]
-        Parsed JSON objects.
+    List[bytes]
+        Non-blank raw lines, without line terminators.
     """
-    logger.info("Reading JSON events from stdin.")
+    stream = open_input_stream(source, input_file, logger)
     try:
-        for line in sys.stdin:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-                logger.debug("Read event from stdin: %s", event)
-                yield event
-            except json.JSONDecodeError as exc:
-                logger.warning("Skipping invalid JSON line: %s | error=%s", line, exc)
-    except Exception as exc:
-        logger.error("Error while reading events from stdin: %s", exc)
+        yield from iter_raw_line_chunks(stream)
+    except OSError as exc:
+        logger.error("Error while reading events: %s", exc)
         raise SystemExit(1)
+    finally:
+        stream.close()
 
 
-def get_event_iterator(
+def iter_line_batches(
     source: str,
     input_file: Optional[Path],
+    batch_size: int,
     logger: logging.Logger,
-) -> Iterable[Dict[str, Any]]:
+) -> Iterable[List[bytes]]:
     """
-    Resolve the correct iterator for event ingestion.
+    Yield batches of raw (undecoded) input lines for --workers mode.
 
     Parameters
     ----------
@@ -195,24 +280,31 @@ def get_event_iterator(
         Either "file" or "stdin".
     input_file : Optional[Path]
         Required when source="file".
+    batch_size : int
+        Maximum number of lines per batch.
     logger : logging.Logger
         Logger instance.
 
-    Returns
-    -------
-    Iterable[Dict[str, Any]]
-        Event iterator.
+    Yields
+    ------
+    List[bytes]
+        Non-blank raw lines, without line terminators.
     """
-    if source == "file":
-        if not input_file:
-            logger.error("input_file is required when source='file'.")
-            raise SystemExit(1)
-        return iter_events_from_file(input_file, logger)
-    if source == "stdin":
-        return iter_events_from_stdin(logger)
-
-    logger.error("Unsupported source: %s", source)
-    raise SystemExit(1)
+    stream = open_input_stream(source, input_file, logger)
+    try:
+        batch: List[bytes] = []
+        for line in iter_raw_lines(stream):
+            batch.append(line)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    except OSError as exc:
+        logger.error("Error while reading events: %s", exc)
+        raise SystemExit(1)
+    finally:
+        stream.close()
 
 
 # -----------------------------
@@ -220,31 +312,190 @@ def get_event_iterator(
 # -----------------------------
 
 
-class SlidingWindowStats:
+class BaseDetector:
+    """
+    Interface for streaming per-key anomaly detectors.
+
+    ``score`` folds one observation into the detector state and returns an
+    anomaly score comparable against the metric's threshold (a z-score or
+    robust z-score), or None while the detector is still warming up.
+    Implementations must be O(1) or O(log n) per observation.
+    """
+
+    # Name used in alert-thresholds.yaml ("detector: <name>").
+    name: str = ""
+
+    # Whether ``score`` uses the event timestamp.
+    needs_time: bool = False
+
+    # Last access time, maintained by DetectorStateTable for TTL eviction.
+    __slots__ = ("last_seen",)
+
+    def __init__(self) -> None:
+        self.last_seen: float = 0.0
+
+    def score(self, value: float, event_time: Optional[float] = None) -> Optional[float]:
+        """
+        Update the detector with ``value`` and return its anomaly score.
+
+        Parameters
+        ----------
+        value : float
+            Observed metric value.
+        event_time : Optional[float]
+            Event time as epoch seconds, for detectors with ``needs_time``.
+
+        Returns
+        -------
+        Optional[float]
+            Anomaly score, or None during warm-up / zero variance.
+        """
+        raise NotImplementedError
+
+    def dump_state(self) -> bytes:
+        """
+        Serialize the detector's statistical state for a state snapshot.
+
+        Returns
+        -------
+        bytes
+            Compact binary payload (fixed header plus raw ``array`` data).
+        """
+        raise NotImplementedError
+
+    def load_state(self, payload: memoryview) -> bool:
+        """
+        Restore state produced by ``dump_state`` into a fresh detector.
+
+        Parameters
+        ----------
+        payload : memoryview
+            Payload from a state snapshot.
+
+        Returns
+        -------
+        bool
+            False when the payload was produced with different parameters
+            (e.g., another window size) or is malformed; the detector is
+            left untouched in that case.
+        """
+        raise NotImplementedError
+
+
+class SlidingWindowStats(BaseDetector):
     """
     Maintain a sliding window of numeric values, with summary statistics.
 
-    This class is intentionally simple and can be replaced with more
-    performant or feature-rich implementations if needed.
+    Mean and variance are tracked incrementally (Welford's algorithm with
+    add/evict updates), so each ``add`` and ``mean_and_std`` call is O(1)
+    regardless of window size. Results match the population mean and
+    standard deviation of the values currently held in the window.
+
+    Values are held in a compact ``array('d')`` ring buffer that only grows
+    as values arrive, so per-key windows for sparse keys stay small.
     """
 
+    # Number of evictions (as a multiple of window_size) after which the
+    # accumulator is rebuilt from the window contents to cap floating-point
+    # drift. The rebuild is O(window), so this keeps the cost amortized O(1).
+    RESYNC_FACTOR: int = 8
+
+    # Evicting a value whose squared deviation exceeds the remaining variance
+    # by this ratio loses too many significant digits to cancellation; the
+    # accumulator is rebuilt immediately in that case.
+    RESYNC_MAGNITUDE: float = 1e6
+
+    name = "zscore"
+
+    # Snapshot header: window_size, head.
+    _STATE = struct.Struct("<qq")
+
+    __slots__ = ("window_size", "_buffer", "_head", "_mean", "_m2", "_evictions")
+
     def __init__(self, window_size: int) -> None:
         if window_size <= 0:
             raise ValueError("window_size must be positive.")
 
+        super().__init__()
         self.window_size: int = window_size
-        self.values: Deque[float] = deque(maxlen=window_size)
+        self._buffer: array = array("d")
+        self._head: int = 0
+        self._mean: float = 0.0
+        self._m2: float = 0.0
+        self._evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def values(self) -> List[float]:
+        """
+        Window contents, oldest first.
+        """
+        return list(self._buffer[self._head:]) + list(self._buffer[: self._head])
 
     def add(self, value: float) -> None:
         """
-        Add a new value to the window.
+        Add a new value to the window, evicting the oldest if full.
 
         Parameters
         ----------
         value : float
             Numeric value to add.
+
+        Raises
+        ------
+        ValueError
+            If ``value`` is NaN or infinite; it would poison the running
+            mean and M2 for good.
+        """
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError(f"window values must be finite, got {value!r}.")
+        count = len(self._buffer)
+
+        if count < self.window_size:
+            self._buffer.append(value)
+            count += 1
+            delta = value - self._mean
+            self._mean += delta / count
+            self._m2 += delta * (value - self._mean)
+            return
+
+        head = self._head
+        evicted = self._buffer[head]
+        self._buffer[head] = value
+        self._head = head + 1 if head + 1 < count else 0
+        if value == evicted:
+            return
+
+        old_mean = self._mean
+        self._mean = old_mean + (value - evicted) / count
+        self._m2 += (value - evicted) * (value - self._mean + evicted - old_mean)
+        if self._m2 < 0.0:
+            self._m2 = 0.0
+
+        self._evictions += 1
+        deviation = evicted - old_mean
+        if (
+            self._evictions >= self.window_size * self.RESYNC_FACTOR
+            or deviation * deviation * count > self.RESYNC_MAGNITUDE * self._m2
+        ):
+            self._resync()
+
+    def _resync(self) -> None:
+        """
+        Recompute the accumulator from the raw window values.
         """
-        self.values.append(value)
+        mean_val = 0.0
+        m2 = 0.0
+        for index, value in enumerate(self.values, start=1):
+            delta = value - mean_val
+            mean_val += delta / index
+            m2 += delta * (value - mean_val)
+        self._mean = mean_val
+        self._m2 = m2
+        self._evictions = 0
 
     def mean_and_std(self) -> Tuple[Optional[float], Optional[float]]:
         """
@@ -255,139 +506,1903 @@ class SlidingWindowStats:
         Tuple[Optional[float], Optional[float]]
             (mean, std) where std may be None if fewer than 2 values exist.
         """
-        if not self.values:
+        count = len(self._buffer)
+        if not count:
             return None, None
 
-        if len(self.values) == 1:
-            return float(self.values[0]), None
+        if count == 1:
+            return self._buffer[0], None
 
-        mean_val = statistics.mean(self.values)
-        std_val = statistics.pstdev(self.values)
-        return float(mean_val), float(std_val)
+        return self._mean, math.sqrt(self._m2 / count)
 
+    def score(self, value: float, event_time: Optional[float] = None) -> Optional[float]:
+        """
+        Add ``value`` and return its population z-score against the window.
 
-def detect_anomaly(
-    metric_name: str,
-    metric_value: float,
-    window_stats: SlidingWindowStats,
-    zscore_threshold: float,
-    logger: logging.Logger,
-) -> bool:
+        The value is part of the window it is scored against, matching the
+        original add-then-compare behaviour.
+        """
+        self.add(value)
+        mean_val, std_val = self.mean_and_std()
+        if mean_val is None or std_val is None or std_val == 0:
+            return None
+        return abs(value - mean_val) / std_val
+
+    def dump_state(self) -> bytes:
+        return self._STATE.pack(self.window_size, self._head) + self._buffer.tobytes()
+
+    def load_state(self, payload: memoryview) -> bool:
+        """
+        Restore the window contents; the accumulator is rebuilt from them.
+        """
+        if len(payload) < self._STATE.size:
+            return False
+        window_size, head = self._STATE.unpack_from(payload)
+        buffer = array("d")
+        buffer.frombytes(payload[self._STATE.size:])
+        if window_size != self.window_size or len(buffer) > window_size:
+            return False
+        if head and head >= len(buffer):
+            return False
+        self._buffer = buffer
+        self._head = head
+        self._resync()
+        return True
+
+
+class EwmaDetector(BaseDetector):
     """
-    Detect whether a given metric value is anomalous using a z-score heuristic.
+    Exponentially weighted moving mean and variance (EWMA/EWMV).
 
-    Parameters
-    ----------
-    metric_name : str
-        Name of the metric being evaluated.
-    metric_value : float
-        Latest metric value.
-    window_stats : SlidingWindowStats
-        Sliding window that tracks historic values.
-    zscore_threshold : float
-        Anomaly threshold in terms of absolute z-score.
-    logger : logging.Logger
-        Logger instance.
+    Constant memory and O(1) per observation. Each value is scored against
+    the state *before* it is folded in; scores are withheld until
+    ``warmup`` observations have been seen.
+    """
 
-    Returns
-    -------
-    bool
-        True if the value is classified as anomalous; False otherwise.
+    name = "ewma"
+
+    # Snapshot layout: alpha, count, mean, variance.
+    _STATE = struct.Struct("<dqdd")
+
+    __slots__ = ("alpha", "warmup", "_count", "_mean", "_var")
+
+    def __init__(self, alpha: float, warmup: int) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1].")
+        if warmup < 1:
+            raise ValueError("warmup must be at least 1.")
+
+        super().__init__()
+        self.alpha: float = alpha
+        self.warmup: int = warmup
+        self._count: int = 0
+        self._mean: float = 0.0
+        self._var: float = 0.0
+
+    def score(self, value: float, event_time: Optional[float] = None) -> Optional[float]:
+        result: Optional[float] = None
+        if self._count >= self.warmup and self._var > 0:
+            result = abs(value - self._mean) / math.sqrt(self._var)
+
+        if self._count == 0:
+            self._mean = value
+        else:
+            diff = value - self._mean
+            increment = self.alpha * diff
+            self._mean += increment
+            self._var = (1.0 - self.alpha) * (self._var + diff * increment)
+        self._count += 1
+        return result
+
+    def dump_state(self) -> bytes:
+        return self._STATE.pack(self.alpha, self._count, self._mean, self._var)
+
+    def load_state(self, payload: memoryview) -> bool:
+        if len(payload) != self._STATE.size:
+            return False
+        alpha, count, mean_val, var_val = self._STATE.unpack_from(payload)
+        if alpha != self.alpha:
+            return False
+        self._count, self._mean, self._var = count, mean_val, var_val
+        return True
+
+
+class SlidingMedian:
     """
-    mean_val, std_val = window_stats.mean_and_std()
+    Median of a sliding multiset using two heaps with lazy deletion.
 
-    # If we have insufficient data to compute a standard deviation,
-    # we treat early values as non-anomalous and simply warm up the window.
-    if mean_val is None or std_val is None or std_val == 0:
-        logger.debug(
-            "Insufficient variance for anomaly detection on %s; warm-up phase. value=%s",
-            metric_name,
-            metric_value,
+    Insertions and removals are O(log n) amortized; removed values are
+    discarded when they surface at the top of a heap, and the heaps are
+    compacted once stale entries outnumber live ones so memory stays
+    proportional to the window.
+    """
+
+    __slots__ = ("_low", "_high", "_low_size", "_high_size", "_delayed")
+
+    def __init__(self) -> None:
+        self._low: List[float] = []  # max-heap via negated values
+        self._high: List[float] = []
+        self._low_size: int = 0
+        self._high_size: int = 0
+        self._delayed: Dict[float, int] = {}
+
+    def __len__(self) -> int:
+        return self._low_size + self._high_size
+
+    def _prune(self, heap: List[float], negated: bool) -> None:
+        delayed = self._delayed
+        while heap:
+            top = -heap[0] if negated else heap[0]
+            pending = delayed.get(top)
+            if not pending:
+                return
+            if pending == 1:
+                del delayed[top]
+            else:
+                delayed[top] = pending - 1
+            heapq.heappop(heap)
+
+    def _rebalance(self) -> None:
+        while self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, True)
+        while self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high, False)
+
+    def _compact(self) -> None:
+        """
+        Drop all lazily deleted entries and rebuild both heaps (O(n)).
+
+        Equal values are interchangeable, so it does not matter which heap
+        a deleted occurrence is taken from; sizes are recounted afterwards.
+        """
+        delayed = self._delayed
+        for negated, heap in ((True, self._low), (False, self._high)):
+            kept: List[float] = []
+            for item in heap:
+                value = -item if negated else item
+                pending = delayed.get(value)
+                if pending:
+                    if pending == 1:
+                        del delayed[value]
+                    else:
+                        delayed[value] = pending - 1
+                    continue
+                kept.append(item)
+            heapq.heapify(kept)
+            heap[:] = kept
+        self._low_size = len(self._low)
+        self._high_size = len(self._high)
+        self._rebalance()
+
+    def add(self, value: float) -> None:
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._rebalance()
+
+    def remove(self, value: float) -> None:
+        """
+        Remove one occurrence of ``value``, which must be present.
+        """
+        self._delayed[value] = self._delayed.get(value, 0) + 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, True)
+        else:
+            self._high_size -= 1
+            if self._high and value == self._high[0]:
+                self._prune(self._high, False)
+        self._rebalance()
+        if len(self._low) + len(self._high) > 2 * (self._low_size + self._high_size) + 16:
+            self._compact()
+
+    def median(self) -> Optional[float]:
+        if not self._low_size:
+            return None
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2.0
+
+
+class MadDetector(BaseDetector):
+    """
+    Rolling median / median absolute deviation (robust z-score).
+
+    The window median is exact (two-heap sliding median). The MAD is the
+    sliding median of each value's absolute deviation from the median at
+    the time it arrived, a standard streaming approximation that keeps
+    every update O(log window). Values are scored against the window
+    before they are added: ``|x - median| / (1.4826 * MAD)``.
+    """
+
+    name = "mad"
+
+    # Scales MAD to a standard-deviation estimate under normality.
+    MAD_SCALE: float = 1.4826
+
+    # Snapshot header: window_size, head; followed by values and deviations.
+    _STATE = struct.Struct("<qq")
+
+    __slots__ = ("window_size", "warmup", "_values", "_deviations", "_head", "_median", "_mad")
+
+    def __init__(self, window_size: int, warmup: int) -> None:
+        if window_size <= 0:
+            raise ValueError("window_size must be positive.")
+        if warmup < 1:
+            raise ValueError("warmup must be at least 1.")
+
+        super().__init__()
+        self.window_size: int = window_size
+        self.warmup: int = min(warmup, window_size)
+        self._values: array = array("d")
+        self._deviations: array = array("d")
+        self._head: int = 0
+        self._median = SlidingMedian()
+        self._mad = SlidingMedian()
+
+    def score(self, value: float, event_time: Optional[float] = None) -> Optional[float]:
+        result: Optional[float] = None
+        median_val = self._median.median()
+        if len(self._values) >= self.warmup and median_val is not None:
+            mad_val = self._mad.median()
+            if mad_val:
+                result = abs(value - median_val) / (self.MAD_SCALE * mad_val)
+
+        deviation = abs(value - median_val) if median_val is not None else 0.0
+        if len(self._values) < self.window_size:
+            self._values.append(value)
+            self._deviations.append(deviation)
+        else:
+            head = self._head
+            self._median.remove(self._values[head])
+            self._mad.remove(self._deviations[head])
+            self._values[head] = value
+            self._deviations[head] = deviation
+            self._head = head + 1 if head + 1 < self.window_size else 0
+        self._median.add(value)
+        self._mad.add(deviation)
+        return result
+
+    def dump_state(self) -> bytes:
+        return (
+            self._STATE.pack(self.window_size, self._head)
+            + self._values.tobytes()
+            + self._deviations.tobytes()
         )
-        return False
 
-    zscore = abs(metric_value - mean_val) / std_val
-    logger.debug(
-        "Metric %s | value=%s mean=%s std=%s zscore=%s threshold=%s",
-        metric_name,
-        metric_value,
-        mean_val,
-        std_val,
-        zscore,
-        zscore_threshold,
-    )
+    def load_state(self, payload: memoryview) -> bool:
+        """
+        Restore the window arrays; both sliding medians are rebuilt from them.
+        """
+        if len(payload) < self._STATE.size:
+            return False
+        window_size, head = self._STATE.unpack_from(payload)
+        data = array("d")
+        data.frombytes(payload[self._STATE.size:])
+        count = len(data) // 2
+        if window_size != self.window_size or len(data) % 2 or count > window_size:
+            return False
+        if head and head >= count:
+            return False
+        self._values = data[:count]
+        self._deviations = data[count:]
+        self._head = head
+        for value, deviation in zip(self._values, self._deviations):
+            self._median.add(value)
+            self._mad.add(deviation)
+        return True
+
+
+class SeasonalDetector(BaseDetector):
+    """
+    Hour-of-week seasonal baseline.
+
+    Keeps an EWMA mean/variance per hour-of-week bucket (168 buckets, UTC)
+    in a flat ``array('d')``, so Monday 09:00 is compared with previous
+    Monday mornings rather than with the overnight lull. O(1) per event.
+    Events without a usable timestamp fall back to the current time.
+    """
 
-    return zscore >= zscore_threshold
+    name = "seasonal"
+    needs_time = True
 
+    BUCKETS: int = 7 * 24
 
-def build_anomaly_record(
-    event: Dict[str, Any],
+    # Snapshot header: alpha; followed by the per-bucket state array.
+    _STATE = struct.Struct("<d")
+
+    __slots__ = ("alpha", "warmup", "_state")
+
+    def __init__(self, alpha: float, warmup: int) -> None:
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1].")
+        if warmup < 1:
+            raise ValueError("warmup must be at least 1.")
+
+        super().__init__()
+        self.alpha: float = alpha
+        self.warmup: int = warmup
+        # Per bucket: count, mean, variance.
+        self._state: array = array("d", bytes(8 * 3 * self.BUCKETS))
+
+    @classmethod
+    def bucket_for(cls, event_time: float) -> int:
+        """
+        Hour-of-week bucket (Monday 00:00 UTC = 0) for an epoch timestamp.
+        """
+        # 1970-01-01 was a Thursday; shift so that Monday starts the week.
+        return int((event_time // 3600 + 72) % cls.BUCKETS)
+
+    def score(self, value: float, event_time: Optional[float] = None) -> Optional[float]:
+        if event_time is None:
+            event_time = time.time()
+        base = 3 * self.bucket_for(event_time)
+        state = self._state
+        count, mean_val, var_val = state[base], state[base + 1], state[base + 2]
+
+        result: Optional[float] = None
+        if count >= self.warmup and var_val > 0:
+            result = abs(value - mean_val) / math.sqrt(var_val)
+
+        if count == 0:
+            state[base + 1] = value
+        else:
+            diff = value - mean_val
+            increment = self.alpha * diff
+            state[base + 1] = mean_val + increment
+            state[base + 2] = (1.0 - self.alpha) * (var_val + diff * increment)
+        state[base] = count + 1
+        return result
+
+    def dump_state(self) -> bytes:
+        return self._STATE.pack(self.alpha) + self._state.tobytes()
+
+    def load_state(self, payload: memoryview) -> bool:
+        if len(payload) != self._STATE.size + 8 * 3 * self.BUCKETS:
+            return False
+        (alpha,) = self._STATE.unpack_from(payload)
+        if alpha != self.alpha:
+            return False
+        state = array("d")
+        state.frombytes(payload[self._STATE.size:])
+        self._state = state
+        return True
+
+
+@dataclass(frozen=True)
+class MetricSettings:
+    """
+    Effective detection parameters for a single metric.
+
+    ``zscore_threshold`` is the score threshold for whichever detector is
+    selected (z-score, EWMA z-score, robust z-score or seasonal z-score).
+    """
+
+    window_size: int
+    zscore_threshold: float
+    detector: str = "zscore"
+    alpha: float = 0.1
+    warmup: int = 10
+
+
+DETECTOR_CHOICES = ("zscore", "ewma", "mad", "seasonal")
+
+# Detector type codes stored in state snapshots; never renumber.
+DETECTOR_CODES = {"zscore": 1, "ewma": 2, "mad": 3, "seasonal": 4}
+
+
+def build_detector(settings: MetricSettings) -> BaseDetector:
+    """
+    Instantiate the detector selected by a metric's settings.
+
+    Parameters
+    ----------
+    settings : MetricSettings
+        Effective metric settings.
+
+    Returns
+    -------
+    BaseDetector
+        Fresh detector state for one key.
+    """
+    if settings.detector == "zscore":
+        return SlidingWindowStats(window_size=settings.window_size)
+    if settings.detector == "ewma":
+        return EwmaDetector(alpha=settings.alpha, warmup=settings.warmup)
+    if settings.detector == "mad":
+        return MadDetector(window_size=settings.window_size, warmup=settings.warmup)
+    if settings.detector == "seasonal":
+        return SeasonalDetector(alpha=settings.alpha, warmup=settings.warmup)
+    raise ValueError(f"Unsupported detector: {settings.detector}")
+
+
+def resolve_metric_settings(
+    anomaly_config: Dict[str, Any],
     metric_name: str,
-    metric_value: float,
-    reason: str,
-) -> Dict[str, Any]:
+    default_window_size: int,
+    default_zscore_threshold: float,
+    default_detector: str = "zscore",
+) -> MetricSettings:
     """
-    Build a structured anomaly record.
+    Resolve detector, window size and thresholds for a metric.
+
+    Precedence is ``anomaly_detection.metrics.<metric_name>`` overrides, then
+    the global ``anomaly_detection`` values, then the CLI defaults.
 
     Parameters
     ----------
-    event : Dict[str, Any]
-        Original event/metric.
+    anomaly_config : Dict[str, Any]
+        The ``anomaly_detection`` section of the thresholds YAML.
     metric_name : str
-        Name of the metric used for anomaly detection.
-    metric_value : float
-        Observed value that triggered anomaly logic.
-    reason : str
-        Human-readable explanation.
+        Metric being evaluated.
+    default_window_size : int
+        CLI window size.
+    default_zscore_threshold : float
+        CLI z-score threshold.
+    default_detector : str
+        CLI detector name.
 
     Returns
     -------
-    Dict[str, Any]
-        Anomaly record suitable for JSON serialization.
+    MetricSettings
+        Effective settings for the metric.
+
+    Raises
+    ------
+    ValueError
+        If the configured detector is unknown.
     """
-    return {
-        "type": "anomaly",
-        "metric": metric_name,
-        "metric_value": metric_value,
-        "reason": reason,
-        "source_event": event,
-    }
+    overrides = (anomaly_config.get("metrics") or {}).get(metric_name) or {}
 
+    def pick(name: str, default: Any) -> Any:
+        return overrides.get(name, anomaly_config.get(name, default))
 
-# -----------------------------
-# Main orchestration
-# -----------------------------
+    detector = str(pick("detector", default_detector))
+    if detector not in DETECTOR_CHOICES:
+        raise ValueError(f"Unsupported detector '{detector}' for metric {metric_name}")
 
+    return MetricSettings(
+        window_size=int(pick("window_size", default_window_size)),
+        zscore_threshold=float(pick("zscore_threshold", default_zscore_threshold)),
+        detector=detector,
+        alpha=float(pick("alpha", MetricSettings.alpha)),
+        warmup=int(pick("warmup", MetricSettings.warmup)),
+    )
 
-def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+
+def compile_metric_settings(
+    anomaly_config: Any,
+    metric_names: Iterable[str],
+    args: argparse.Namespace,
+) -> Dict[str, MetricSettings]:
     """
-    Parse CLI arguments.
+    Resolve and validate the settings of every named or configured metric.
+
+    Used to check a (re)loaded ``anomaly_detection`` section as a whole
+    before any of it takes effect.
 
     Parameters
     ----------
-    argv : Optional[Iterable[str]]
-        Optional list for testing.
+    anomaly_config : Any
+        Candidate ``anomaly_detection`` section.
+    metric_names : Iterable[str]
+        Metrics that must resolve (e.g., those already seen).
+    args : argparse.Namespace
+        Parsed CLI arguments (defaults).
 
     Returns
     -------
-    argparse.Namespace
-        Parsed arguments.
-    """
-    parser = argparse.ArgumentParser(description="Compliance anomaly detector.")
+    Dict[str, MetricSettings]
+        Settings by metric name, covering ``metric_names``, ``--metric-name``
+        and the metrics listed under ``anomaly_detection.metrics``.
 
-    parser.add_argument(
-        "--thresholds",
-        required=True,
-        type=Path,
-        help="Path to alert thresholds YAML.",
-    )
+    Raises
+    ------
+    ConfigError
+        If the section is malformed or a metric's settings are invalid.
+    """
+    if not isinstance(anomaly_config, dict):
+        raise ConfigError("anomaly_detection must be a mapping.")
+    overrides = anomaly_config.get("metrics") or {}
+    if not isinstance(overrides, dict) or not all(
+        isinstance(value, dict) or value is None for value in overrides.values()
+    ):
+        raise ConfigError("anomaly_detection.metrics must map metric names to mappings.")
 
-    parser.add_argument(
-        "--source",
-        choices=["file", "stdin"],
-        default="stdin",
-        help="Event source: file or stdin.",
-    )
+    try:
+        # Metrics without overrides fall back to the global values.
+        build_detector(
+            resolve_metric_settings(
+                dict(anomaly_config, metrics=None),
+                "*",
+                args.window_size,
+                args.zscore_threshold,
+                args.detector,
+            )
+        )
+    except (TypeError, ValueError) as exc:
+        raise ConfigError(f"default settings: {exc}") from exc
+
+    compiled: Dict[str, MetricSettings] = {}
+    for metric_name in [*metric_names, args.metric_name, *map(str, overrides)]:
+        if metric_name in compiled:
+            continue
+        try:
+            settings = resolve_metric_settings(
+                anomaly_config,
+                metric_name,
+                args.window_size,
+                args.zscore_threshold,
+                args.detector,
+            )
+            build_detector(settings)
+        except (TypeError, ValueError) as exc:
+            raise ConfigError(f"metric {metric_name}: {exc}") from exc
+        compiled[metric_name] = settings
+    return compiled
+
+
+class DetectorStateTable:
+    """
+    Keyed table of per-metric, per-entity detector state.
+
+    Entries are kept in least-recently-used order. The table is bounded by
+    ``max_keys`` (LRU eviction) and, when ``ttl_seconds`` is positive, idle
+    entries older than the TTL are expired as new events arrive. Both
+    evictions are amortized O(1) per lookup, so memory stays bounded for
+    arbitrarily many distinct principals.
+
+    A StateSnapshot can be attached after a restart; a key missing from the
+    table is then looked up in the snapshot and its detector restored before
+    a fresh one would be created.
+    """
+
+    def __init__(
+        self,
+        max_keys: int,
+        ttl_seconds: float = 0.0,
+        clock: Any = time.monotonic,
+    ) -> None:
+        if max_keys <= 0:
+            raise ValueError("max_keys must be positive.")
+
+        self.max_keys: int = max_keys
+        self.ttl_seconds: float = ttl_seconds
+        self._clock = clock
+        self._windows: "OrderedDict[Tuple[Any, ...], BaseDetector]" = OrderedDict()
+        self.evicted_lru: int = 0
+        self.evicted_ttl: int = 0
+        self.restored: int = 0
+        self._snapshot: Optional["StateSnapshot"] = None
+        self._snapshot_idle_offset: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def drop_metrics(self, metric_names: Iterable[str]) -> int:
+        """
+        Remove the detectors of the given metrics (keys start with the name).
+
+        Parameters
+        ----------
+        metric_names : Iterable[str]
+            Metrics whose baselines must be rebuilt.
+
+        Returns
+        -------
+        int
+            Number of detectors removed.
+        """
+        names = set(metric_names)
+        if not names:
+            return 0
+        stale = [key for key in self._windows if key[0] in names]
+        for key in stale:
+            del self._windows[key]
+        return len(stale)
+
+    def attach_snapshot(self, snapshot: "StateSnapshot") -> None:
+        """
+        Restore detectors from ``snapshot`` lazily, as their keys reappear.
+
+        Parameters
+        ----------
+        snapshot : StateSnapshot
+            Snapshot loaded from a previous run.
+        """
+        # Idle time of a snapshot record at clock value t is
+        # saved_idle + downtime + (t - now), i.e. saved_idle + offset + t.
+        downtime = max(0.0, time.time() - snapshot.saved_at)
+        self._snapshot_idle_offset = downtime - self._clock()
+        self._snapshot = snapshot if len(snapshot) else None
+
+    def _restore(self, key: Tuple[Any, ...], settings: MetricSettings, now: float) -> Optional[BaseDetector]:
+        """
+        Rebuild the detector for ``key`` from the attached snapshot, if any.
+        """
+        snapshot = self._snapshot
+        record = snapshot.pop(repr(key).encode("utf-8"))
+        if not snapshot:
+            self._snapshot = None
+        if record is None:
+            return None
+
+        code, idle = STATE_RECORD.unpack_from(record)
+        if self.ttl_seconds > 0 and idle + self._snapshot_idle_offset + now > self.ttl_seconds:
+            self.evicted_ttl += 1
+            return None
+        if code != DETECTOR_CODES[settings.detector]:
+            return None
+        window = build_detector(settings)
+        if not window.load_state(record[STATE_RECORD.size:]):
+            return None
+        self.restored += 1
+        return window
+
+    def export_section(self) -> bytes:
+        """
+        Encode the table, plus snapshot records not restored yet, as a
+        state snapshot section.
+
+        Carried-over snapshot records are subject to the same TTL, and only
+        the most recently seen ones are kept when the table and snapshot
+        together exceed ``max_keys``.
+
+        Returns
+        -------
+        bytes
+            Section for write_state_file.
+        """
+        now = self._clock()
+        entries: List[Tuple[bytes, bytes]] = []
+        for key, window in self._windows.items():
+            record = STATE_RECORD.pack(DETECTOR_CODES[window.name], now - window.last_seen)
+            entries.append((repr(key).encode("utf-8"), record + window.dump_state()))
+
+        snapshot = self._snapshot
+        budget = self.max_keys - len(entries)
+        if snapshot is not None and budget > 0:
+            offset = self._snapshot_idle_offset + now
+            carried: List[Tuple[float, bytes, memoryview]] = []
+            for key_bytes, record in snapshot.remaining():
+                code, idle = STATE_RECORD.unpack_from(record)
+                idle += offset
+                if self.ttl_seconds > 0 and idle > self.ttl_seconds:
+                    continue
+                carried.append((idle, key_bytes, record))
+            if len(carried) > budget:
+                carried = heapq.nsmallest(budget, carried, key=lambda item: item[0])
+            for idle, key_bytes, record in carried:
+                code = record[0]
+                entries.append(
+                    (
+                        key_bytes,
+                        STATE_RECORD.pack(code, idle) + record[STATE_RECORD.size:],
+                    )
+                )
+        return encode_state_section(entries)
+
+    def get(self, key: Tuple[Any, ...], settings: MetricSettings) -> BaseDetector:
+        """
+        Return the detector for ``key``, creating it if necessary.
+
+        Parameters
+        ----------
+        key : Tuple[Any, ...]
+            State key, typically (metric_name, *group_values).
+        settings : MetricSettings
+            Settings used when a new detector has to be created.
+
+        Returns
+        -------
+        BaseDetector
+            The detector associated with the key.
+        """
+        now = self._clock()
+        windows = self._windows
+
+        if self.ttl_seconds > 0:
+            cutoff = now - self.ttl_seconds
+            while windows:
+                oldest_key = next(iter(windows))
+                if windows[oldest_key].last_seen >= cutoff:
+                    break
+                del windows[oldest_key]
+                self.evicted_ttl += 1
+
+        window = windows.get(key)
+        if window is None:
+            if len(windows) >= self.max_keys:
+                windows.popitem(last=False)
+                self.evicted_lru += 1
+            if self._snapshot is not None:
+                window = self._restore(key, settings, now)
+            if window is None:
+                window = build_detector(settings)
+            windows[key] = window
+        else:
+            windows.move_to_end(key)
+
+        window.last_seen = now
+        return window
+
+
+def build_state_key(
+    event: Dict[str, Any],
+    metric_name: str,
+    group_by: List[str],
+) -> Tuple[Any, ...]:
+    """
+    Build the state table key for an event.
+
+    Parameters
+    ----------
+    event : Dict[str, Any]
+        Event being evaluated.
+    metric_name : str
+        Metric the value belongs to.
+    group_by : List[str]
+        Event fields that identify the entity (e.g., host, user).
+
+    Returns
+    -------
+    Tuple[Any, ...]
+        Hashable key of the metric name followed by the group field values.
+    """
+    key: List[Any] = [metric_name]
+    for field_name in group_by:
+        value = event.get(field_name)
+        if value is not None and not isinstance(value, (str, int, float, bool)):
+            value = json.dumps(value, sort_keys=True)
+        key.append(value)
+    return tuple(key)
+
+
+def detect_anomaly(
+    metric_name: str,
+    metric_value: float,
+    detector: BaseDetector,
+    zscore_threshold: float,
+    logger: logging.Logger,
+    event_time: Optional[float] = None,
+) -> Optional[float]:
+    """
+    Feed a metric value to its detector and decide whether it is anomalous.
+
+    Parameters
+    ----------
+    metric_name : str
+        Name of the metric being evaluated.
+    metric_value : float
+        Latest metric value.
+    detector : BaseDetector
+        Per-key detector state (z-score window, EWMA, MAD or seasonal).
+    zscore_threshold : float
+        Anomaly threshold in terms of the detector's absolute score.
+    logger : logging.Logger
+        Logger instance.
+    event_time : Optional[float]
+        Event time as epoch seconds, used by seasonal detectors.
+
+    Returns
+    -------
+    Optional[float]
+        The anomaly score if it meets the threshold; None otherwise.
+    """
+    score = detector.score(metric_value, event_time)
+
+    # Detectors return None until they have enough data (or variance) to
+    # score; early values are treated as non-anomalous warm-up.
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if score is None:
+        if debug:
+            logger.debug(
+                "Insufficient variance for anomaly detection on %s; warm-up phase. value=%s",
+                metric_name,
+                metric_value,
+            )
+        return None
+
+    if debug:
+        logger.debug(
+            "Metric %s | detector=%s value=%s score=%s threshold=%s",
+            metric_name,
+            detector.name,
+            metric_value,
+            score,
+            zscore_threshold,
+        )
+
+    return score if score >= zscore_threshold else None
+
+
+def build_anomaly_record(
+    event: Dict[str, Any],
+    metric_name: str,
+    metric_value: float,
+    reason: str,
+    group: Optional[Dict[str, Any]] = None,
+    detector: Optional[str] = None,
+    score: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Build a structured anomaly record.
+
+    Parameters
+    ----------
+    event : Dict[str, Any]
+        Original event/metric.
+    metric_name : str
+        Name of the metric used for anomaly detection.
+    metric_value : float
+        Observed value that triggered anomaly logic.
+    reason : str
+        Human-readable explanation.
+    group : Optional[Dict[str, Any]]
+        Entity fields the baseline was keyed on, when grouping is enabled.
+    detector : Optional[str]
+        Name of the detector that flagged the value.
+    score : Optional[float]
+        Detector score that met the threshold.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Anomaly record suitable for JSON serialization.
+    """
+    record = {
+        "type": "anomaly",
+        "metric": metric_name,
+        "metric_value": metric_value,
+        "reason": reason,
+        "source_event": event,
+    }
+    if group is not None:
+        record["group"] = group
+    if detector is not None:
+        record["detector"] = detector
+    if score is not None:
+        record["score"] = score
+    return record
+
+
+# -----------------------------
+# Main orchestration
+# -----------------------------
+
+
+def extract_metric(
+    event: Dict[str, Any],
+    args: argparse.Namespace,
+    logger: logging.Logger,
+) -> Optional[Tuple[str, float]]:
+    """
+    Return (metric_name, metric_value) for an event, or None to skip it.
+
+    Parameters
+    ----------
+    event : Dict[str, Any]
+        Decoded event.
+    args : argparse.Namespace
+        Parsed CLI arguments (metric field and naming options).
+    logger : logging.Logger
+        Logger instance.
+
+    Returns
+    -------
+    Optional[Tuple[str, float]]
+        Metric name and numeric value, or None for non-numeric events
+        (including NaN and infinity, which would poison the baselines).
+    """
+    raw_value = event.get(args.metric_field)
+    # Only process numeric metric values.
+    try:
+        metric_value = float(raw_value)
+        if not math.isfinite(metric_value):
+            raise ValueError("non-finite metric value")
+    except (TypeError, ValueError):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Skipping event with non-numeric metric field '%s': %s",
+                args.metric_field,
+                event,
+            )
+        return None
+
+    metric_name = args.metric_name
+    if args.metric_name_field:
+        metric_name = str(event.get(args.metric_name_field) or args.metric_name)
+    return metric_name, metric_value
+
+
+class DetectionPipeline:
+    """
+    Per-process detection engine: metric settings cache plus keyed windows.
+
+    The same pipeline runs in single-process mode and inside each shard
+    worker of ``--workers`` mode, which keeps results identical for a key.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed CLI arguments (metric, grouping and window options).
+    anomaly_config : Dict[str, Any]
+        The ``anomaly_detection`` section of the thresholds YAML.
+    logger : logging.Logger
+        Logger instance.
+    max_keys : Optional[int]
+        Key budget for this pipeline; defaults to ``args.max_keys``.
+    """
+
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        anomaly_config: Dict[str, Any],
+        logger: logging.Logger,
+        max_keys: Optional[int] = None,
+    ) -> None:
+        self.args = args
+        self.anomaly_config = anomaly_config
+        self.logger = logger
+        self.metric_settings: Dict[str, MetricSettings] = {}
+        self.state_table = DetectorStateTable(
+            max_keys=max_keys if max_keys is not None else args.max_keys,
+            ttl_seconds=args.key_ttl,
+        )
+
+    def settings_for(self, metric_name: str) -> MetricSettings:
+        """
+        Resolve (and cache) the effective settings for a metric.
+        """
+        settings = self.metric_settings.get(metric_name)
+        if settings is None:
+            try:
+                settings = resolve_metric_settings(
+                    self.anomaly_config,
+                    metric_name,
+                    self.args.window_size,
+                    self.args.zscore_threshold,
+                    self.args.detector,
+                )
+                # Validate parameters once rather than on first key creation.
+                build_detector(settings)
+            except ValueError as exc:
+                self.logger.error("Invalid detector settings for metric %s: %s", metric_name, exc)
+                raise SystemExit(1)
+            self.metric_settings[metric_name] = settings
+            self.logger.info(
+                "Metric %s: detector=%s window_size=%s zscore_threshold=%s alpha=%s warmup=%s",
+                metric_name,
+                settings.detector,
+                settings.window_size,
+                settings.zscore_threshold,
+                settings.alpha,
+                settings.warmup,
+            )
+        return settings
+
+    def reconfigure(self, anomaly_config: Dict[str, Any]) -> int:
+        """
+        Switch to a new ``anomaly_detection`` section between two events.
+
+        The section is validated as a whole first, so an invalid one leaves
+        the current settings in effect. Detectors of metrics whose detector,
+        window size, alpha or warmup changed are dropped and rebuilt on
+        their next event; a threshold change alone keeps the baselines.
+
+        Parameters
+        ----------
+        anomaly_config : Dict[str, Any]
+            New ``anomaly_detection`` section.
+
+        Returns
+        -------
+        int
+            Number of keyed detectors dropped.
+
+        Raises
+        ------
+        ConfigError
+            If the section is invalid.
+        """
+        compiled = compile_metric_settings(anomaly_config, self.metric_settings, self.args)
+        changed = []
+        for metric_name, old in self.metric_settings.items():
+            new = compiled[metric_name]
+            if new == old:
+                continue
+            if replace(old, zscore_threshold=new.zscore_threshold) != new:
+                changed.append(metric_name)
+            self.logger.info(
+                "Metric %s: detector=%s window_size=%s zscore_threshold=%s alpha=%s warmup=%s (reloaded)",
+                metric_name,
+                new.detector,
+                new.window_size,
+                new.zscore_threshold,
+                new.alpha,
+                new.warmup,
+            )
+
+        self.anomaly_config = anomaly_config
+        self.metric_settings = {name: compiled[name] for name in self.metric_settings}
+        dropped = self.state_table.drop_metrics(changed)
+        if dropped:
+            self.logger.info("Reset %d keyed detectors of reconfigured metrics %s.", dropped, ", ".join(changed))
+        return dropped
+
+    def evaluate(
+        self,
+        event: Dict[str, Any],
+        metric_name: str,
+        metric_value: float,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Update the event's window and return an anomaly record if flagged.
+        """
+        settings = self.settings_for(metric_name)
+        detector = self.state_table.get(
+            build_state_key(event, metric_name, self.args.group_by),
+            settings,
+        )
+        event_time = None
+        if detector.needs_time:
+            event_time = parse_event_time(event.get(self.args.timestamp_field))
+
+        score = detect_anomaly(
+            metric_name=metric_name,
+            metric_value=metric_value,
+            detector=detector,
+            zscore_threshold=settings.zscore_threshold,
+            logger=self.logger,
+            event_time=event_time,
+        )
+        if score is None:
+            return None
+
+        if detector.name == "zscore":
+            reason = (
+                f"Metric '{metric_name}' value {metric_value} "
+                f"exceeds z-score threshold {settings.zscore_threshold}."
+            )
+        else:
+            reason = (
+                f"Metric '{metric_name}' value {metric_value} "
+                f"exceeds {detector.name} score threshold {settings.zscore_threshold}."
+            )
+        group = None
+        if self.args.group_by:
+            group = {field_name: event.get(field_name) for field_name in self.args.group_by}
+        return build_anomaly_record(
+            event=event,
+            metric_name=metric_name,
+            metric_value=metric_value,
+            reason=reason,
+            group=group,
+            detector=detector.name,
+            score=score,
+        )
+
+    def restore_state(self, path: Path, shard: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Attach the detector state saved in ``path`` for lazy restoration.
+
+        Parameters
+        ----------
+        path : Path
+            Snapshot written by a previous run.
+        shard : Optional[Tuple[int, int]]
+            (shard_index, workers) in --workers mode.
+        """
+        start = time.perf_counter()
+        snapshot = StateSnapshot.load(path, self.logger, shard)
+        if snapshot is None:
+            return
+        self.state_table.attach_snapshot(snapshot)
+        self.logger.info(
+            "Loaded state snapshot with %d keyed detector states from %s in %.3fs.",
+            len(snapshot),
+            path,
+            time.perf_counter() - start,
+        )
+
+    def process(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Extract the metric from an event and evaluate it.
+        """
+        extracted = extract_metric(event, self.args, self.logger)
+        if extracted is None:
+            return None
+        return self.evaluate(event, *extracted)
+
+
+# -----------------------------
+# State snapshots (--state-file)
+# -----------------------------
+
+
+# File layout (version 1, little-endian integers):
+#   header:  magic, version, byte order of the float payloads, section count,
+#            save time (epoch seconds), CRC-32 of everything after the header
+#   section: key count, keys blob length, records blob length,
+#            keys blob     - repr() of each state key, UTF-8, "\n"-separated,
+#                            sorted so lookups can bisect without an index
+#            offsets       - array('Q') of count + 1 record offsets
+#            records blob  - per key: STATE_RECORD + detector dump_state()
+# Single-process runs write one section; --workers runs write one per shard.
+STATE_MAGIC = b"ADSTATE\x00"
+STATE_VERSION = 1
+STATE_HEADER = struct.Struct("<8sHBxIdI")
+STATE_SECTION = struct.Struct("<QQQ")
+# Per record: detector type code, seconds idle at save time.
+STATE_RECORD = struct.Struct("<Bd")
+
+_BYTE_ORDERS = ("little", "big")
+
+
+def encode_state_section(entries: List[Tuple[bytes, bytes]]) -> bytes:
+    """
+    Encode (key bytes, record bytes) pairs as one snapshot section.
+
+    Parameters
+    ----------
+    entries : List[Tuple[bytes, bytes]]
+        Encoded state keys and their records; sorted in place by key.
+
+    Returns
+    -------
+    bytes
+        Section header followed by the keys, offsets and records blobs.
+    """
+    entries.sort(key=lambda entry: entry[0])
+    keys: List[bytes] = []
+    records: List[bytes] = []
+    offsets = array("Q", [0])
+    position = 0
+    for key_bytes, record in entries:
+        keys.append(key_bytes)
+        records.append(record)
+        position += len(record)
+        offsets.append(position)
+
+    keys_blob = b"\n".join(keys)
+    records_blob = b"".join(records)
+    return (
+        STATE_SECTION.pack(len(keys), len(keys_blob), len(records_blob))
+        + keys_blob
+        + offsets.tobytes()
+        + records_blob
+    )
+
+
+def write_state_file(path: Path, sections: List[bytes]) -> int:
+    """
+    Atomically write a state snapshot (temp file, fsync, rename).
+
+    Parameters
+    ----------
+    path : Path
+        Snapshot path.
+    sections : List[bytes]
+        Sections from DetectorStateTable.export_section.
+
+    Returns
+    -------
+    int
+        Size of the snapshot in bytes.
+    """
+    checksum = 0
+    for section in sections:
+        checksum = zlib.crc32(section, checksum)
+    header = STATE_HEADER.pack(
+        STATE_MAGIC,
+        STATE_VERSION,
+        _BYTE_ORDERS.index(sys.byteorder),
+        len(sections),
+        time.time(),
+        checksum,
+    )
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(header) + sum(len(section) for section in sections)
+
+
+class StateSnapshot:
+    """
+    Detector state loaded from a ``--state-file`` snapshot.
+
+    Loading reads the file once and splits the sorted key blobs; no index
+    is built and no detector is created up front. DetectorStateTable looks
+    keys up by bisection and restores a detector the first time its key is
+    seen again, so startup time is dominated by reading the file even with
+    millions of keys. Records that are never claimed are carried over into
+    the next snapshot.
+
+    Parameters
+    ----------
+    saved_at : float
+        Epoch seconds at which the snapshot was written.
+    sections : List[Tuple[List[bytes], array, memoryview]]
+        Per section: sorted encoded keys, record offsets and records blob.
+    shard : Optional[Tuple[int, int]]
+        (shard_index, workers) when only one shard's keys are of interest.
+    """
+
+    def __init__(
+        self,
+        saved_at: float,
+        sections: List[Tuple[List[bytes], array, memoryview]],
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        self.saved_at = saved_at
+        self.shard = shard
+        self._sections = sections
+        self._claimed = [bytearray(len(keys)) for keys, _, _ in sections]
+        self._unclaimed = sum(len(keys) for keys, _, _ in sections)
+
+    def __len__(self) -> int:
+        return self._unclaimed
+
+    def pop(self, key_bytes: bytes) -> Optional[memoryview]:
+        """
+        Claim and return the record for an encoded key, if present.
+        """
+        for (keys, offsets, records), claimed in zip(self._sections, self._claimed):
+            position = bisect.bisect_left(keys, key_bytes)
+            if position < len(keys) and keys[position] == key_bytes:
+                if claimed[position]:
+                    return None
+                claimed[position] = 1
+                self._unclaimed -= 1
+                return records[offsets[position]:offsets[position + 1]]
+        return None
+
+    def remaining(self) -> Iterator[Tuple[bytes, memoryview]]:
+        """
+        Yield (key bytes, record) for unclaimed records owned by this shard.
+        """
+        crc32 = zlib.crc32
+        for (keys, offsets, records), claimed in zip(self._sections, self._claimed):
+            for position, key_bytes in enumerate(keys):
+                if claimed[position]:
+                    continue
+                if self.shard is not None and crc32(key_bytes) % self.shard[1] != self.shard[0]:
+                    continue
+                yield key_bytes, records[offsets[position]:offsets[position + 1]]
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        logger: logging.Logger,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> Optional["StateSnapshot"]:
+        """
+        Read and validate a snapshot file.
+
+        A missing, corrupt or incompatible file is logged and ignored, so
+        detection starts with empty state rather than failing.
+
+        Parameters
+        ----------
+        path : Path
+            Snapshot path.
+        logger : logging.Logger
+            Logger instance.
+        shard : Optional[Tuple[int, int]]
+            (shard_index, workers) in --workers mode, so that only keys
+            owned by the shard (see shard_for_key) are carried over.
+
+        Returns
+        -------
+        Optional[StateSnapshot]
+            The snapshot, or None if nothing could be loaded.
+        """
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            logger.info("No state file at %s; starting with empty detector state.", path)
+            return None
+        except OSError as exc:
+            logger.warning("Failed to read state file %s: %s", path, exc)
+            return None
+
+        try:
+            magic, version, byte_order, section_count, saved_at, checksum = (
+                STATE_HEADER.unpack_from(data)
+            )
+        except struct.error:
+            logger.warning("Ignoring truncated state file %s.", path)
+            return None
+        if magic != STATE_MAGIC:
+            logger.warning("Ignoring %s: not an anomaly detector state file.", path)
+            return None
+        if version != STATE_VERSION:
+            logger.warning(
+                "Ignoring state file %s: format version %s (supported: %s).",
+                path,
+                version,
+                STATE_VERSION,
+            )
+            return None
+        if byte_order >= len(_BYTE_ORDERS) or _BYTE_ORDERS[byte_order] != sys.byteorder:
+            logger.warning("Ignoring state file %s: written on a different byte order.", path)
+            return None
+
+        body = memoryview(data)[STATE_HEADER.size:]
+        if zlib.crc32(body) != checksum:
+            logger.warning("Ignoring state file %s: checksum mismatch.", path)
+            return None
+
+        sections: List[Tuple[List[bytes], array, memoryview]] = []
+        position = 0
+        try:
+            for _ in range(section_count):
+                count, keys_len, records_len = STATE_SECTION.unpack_from(body, position)
+                position += STATE_SECTION.size
+                keys = bytes(body[position:position + keys_len]).split(b"\n") if count else []
+                position += keys_len
+                offsets = array("Q")
+                offsets.frombytes(body[position:position + offsets.itemsize * (count + 1)])
+                position += offsets.itemsize * (count + 1)
+                records = body[position:position + records_len]
+                position += records_len
+                if len(keys) != count or offsets[-1] != records_len or len(records) != records_len:
+                    raise ValueError("section sizes do not match")
+                sections.append((keys, offsets, records))
+        except (struct.error, ValueError, IndexError) as exc:
+            logger.warning("Ignoring malformed state file %s: %s", path, exc)
+            return None
+
+        return cls(saved_at, sections, shard)
+
+
+class StateCheckpoint:
+    """
+    Periodic and shutdown snapshots of detector state to ``--state-file``.
+
+    Parameters
+    ----------
+    path : Path
+        Snapshot path.
+    interval : float
+        Seconds between periodic snapshots (0 disables them; a snapshot is
+        still written at shutdown).
+    logger : logging.Logger
+        Logger instance.
+    """
+
+    def __init__(self, path: Path, interval: float, logger: logging.Logger) -> None:
+        self.path = path
+        self.interval = interval
+        self.logger = logger
+        self._next_due = time.monotonic() + interval
+
+    def due(self) -> bool:
+        """
+        Return True (and schedule the next one) when a periodic snapshot is due.
+        """
+        if self.interval <= 0:
+            return False
+        now = time.monotonic()
+        if now < self._next_due:
+            return False
+        self._next_due = now + self.interval
+        return True
+
+    def save(self, sections: List[bytes]) -> None:
+        """
+        Write a snapshot; failures are logged without stopping detection.
+        """
+        start = time.perf_counter()
+        try:
+            size = write_state_file(self.path, sections)
+        except OSError as exc:
+            self.logger.error("Failed to write state file %s: %s", self.path, exc)
+            return
+        self.logger.info(
+            "Saved detector state to %s (%d bytes, %d sections) in %.3fs.",
+            self.path,
+            size,
+            len(sections),
+            time.perf_counter() - start,
+        )
+
+
+# -----------------------------
+# Sharded (multi-process) execution
+# -----------------------------
+
+
+# Raw input lines per partition batch in --workers mode.
+SHARD_BATCH_LINES = 2048
+
+# Inbox/outbox batch id of state snapshot requests and replies.
+CHECKPOINT_BATCH = -1
+
+# Inbox batch id of a reloaded anomaly_detection section.
+RELOAD_BATCH = -2
+
+# State for partition pool processes, set by _init_partition_worker.
+_PARTITION_STATE: Dict[str, Any] = {}
+
+
+def shard_for_key(key: Tuple[Any, ...], workers: int) -> int:
+    """
+    Map a state key to a shard index, stable across processes and runs.
+
+    Parameters
+    ----------
+    key : Tuple[Any, ...]
+        State key from build_state_key.
+    workers : int
+        Number of shards.
+
+    Returns
+    -------
+    int
+        Shard index in ``range(workers)``.
+    """
+    return zlib.crc32(repr(key).encode("utf-8")) % workers
+
+
+def _init_partition_worker(args: argparse.Namespace, workers: int) -> None:
+    """
+    Pool initializer: keep options, decoder and logger for _partition_batch.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    logger = setup_logger(args.verbose)
+    _PARTITION_STATE["args"] = args
+    _PARTITION_STATE["decoder"] = select_decoder(args.json_decoder)
+    _PARTITION_STATE["workers"] = workers
+    _PARTITION_STATE["logger"] = logger
+
+
+def _partition_batch(lines: List[bytes]) -> List[bytes]:
+    """
+    Decode a batch of raw lines and bucket the events by shard.
+
+    Runs in the partition pool, so JSON decoding is spread across cores.
+
+    Returns
+    -------
+    List[bytes]
+        One pickled list of (line_index, metric_name, metric_value, event)
+        per shard; empty bytes when a shard receives nothing.
+    """
+    args = _PARTITION_STATE["args"]
+    workers = _PARTITION_STATE["workers"]
+    logger = _PARTITION_STATE["logger"]
+    decoder = _PARTITION_STATE["decoder"]
+
+    buckets: List[List[Tuple[int, str, float, Dict[str, Any]]]] = [[] for _ in range(workers)]
+    for index, line in enumerate(lines):
+        try:
+            event = decoder.loads(line)
+        except decoder.errors as exc:
+            logger.warning("Skipping invalid JSON line: %r | error=%s", line[:512], exc)
+            continue
+        extracted = extract_metric(event, args, logger)
+        if extracted is None:
+            continue
+        metric_name, metric_value = extracted
+        shard = shard_for_key(build_state_key(event, metric_name, args.group_by), workers)
+        buckets[shard].append((index, metric_name, metric_value, event))
+
+    return [
+        pickle.dumps(bucket, protocol=pickle.HIGHEST_PROTOCOL) if bucket else b""
+        for bucket in buckets
+    ]
+
+
+def _run_shard_worker(
+    shard_index: int,
+    args: argparse.Namespace,
+    anomaly_config: Dict[str, Any],
+    max_keys: int,
+    inbox: Any,
+    outbox: Any,
+) -> None:
+    """
+    Shard worker loop: own the windows for one hash partition of the keys.
+
+    Receives (batch_id, pickled events) from ``inbox`` and answers on
+    ``outbox`` with (batch_id, shard_index, [(line_index, serialized)]).
+    A CHECKPOINT_BATCH message is answered with the shard's state snapshot
+    section, and a RELOAD_BATCH message carries a new anomaly_detection
+    section that applies from the next batch on. A ``None`` message ends
+    the loop with a final message carrying stats and, with --state-file,
+    the final state section.
+
+    Shutdown and reloads are coordinated by the parent, so SIGINT, SIGTERM
+    and SIGHUP are ignored.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    logger = setup_logger(args.verbose)
+    pipeline = DetectionPipeline(args, anomaly_config, logger, max_keys=max_keys)
+    if args.state_file is not None:
+        pipeline.restore_state(args.state_file, shard=(shard_index, args.workers))
+
+    while True:
+        message = inbox.get()
+        if message is None:
+            table = pipeline.state_table
+            stats = (len(table), table.evicted_lru, table.evicted_ttl, table.restored)
+            section = table.export_section() if args.state_file is not None else b""
+            outbox.put((None, shard_index, (stats, section)))
+            return
+
+        batch_id, blob = message
+        if batch_id == CHECKPOINT_BATCH:
+            outbox.put((CHECKPOINT_BATCH, shard_index, pipeline.state_table.export_section()))
+            continue
+        if batch_id == RELOAD_BATCH:
+            try:
+                pipeline.reconfigure(blob)
+            except ConfigError as exc:
+                logger.error("Shard %d rejected reloaded thresholds: %s", shard_index, exc)
+            continue
+        results: List[Tuple[int, str]] = []
+        if blob:
+            for index, metric_name, metric_value, event in pickle.loads(blob):
+                record = pipeline.evaluate(event, metric_name, metric_value)
+                if record is not None:
+                    results.append((index, serialize_record(record)))
+        outbox.put((batch_id, shard_index, results))
+
+
+def run_sharded(
+    args: argparse.Namespace,
+    anomaly_config: Dict[str, Any],
+    sink: JsonlSink,
+    logger: logging.Logger,
+    checkpoint: Optional[StateCheckpoint] = None,
+    reload_trigger: Optional[ReloadTrigger] = None,
+    reload_metrics: Optional[ReloadMetrics] = None,
+) -> Tuple[int, int, int, int]:
+    """
+    Run detection across ``args.workers`` processes, hash-partitioned by key.
+
+    A partition pool decodes batches of raw lines and buckets events by
+    ``shard_for_key``; each shard worker owns the windows for its keys and
+    sees its events in input order. Results are merged back in input order,
+    so output matches single-process mode as long as neither mode evicts
+    keys (the key budget is split evenly across shards).
+
+    With a checkpoint, every shard contributes one section to each state
+    snapshot. SIGTERM stops reading input and drains the batches already
+    dispatched, so the final snapshot matches the emitted records.
+
+    A reloaded anomaly_detection section is sent to every shard between
+    two dispatched batches, so all shards switch at the same input line.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed CLI arguments.
+    anomaly_config : Dict[str, Any]
+        The ``anomaly_detection`` section of the thresholds YAML.
+    sink : JsonlSink
+        Output sink for anomaly records.
+    logger : logging.Logger
+        Logger instance.
+    checkpoint : Optional[StateCheckpoint]
+        State snapshot writer for --state-file.
+    reload_trigger : Optional[ReloadTrigger]
+        Reports when the thresholds YAML should be reloaded.
+    reload_metrics : Optional[ReloadMetrics]
+        Reload metrics, required with ``reload_trigger``.
+
+    Returns
+    -------
+    Tuple[int, int, int, int]
+        Aggregate (keys, evicted_lru, evicted_ttl, restored) across shards.
+    """
+    workers = args.workers
+    max_keys = max(1, -(-args.max_keys // workers))
+    max_in_flight = workers * 4
+    context = multiprocessing.get_context()
+
+    outbox = context.Queue()
+    inboxes = [context.Queue() for _ in range(workers)]
+    shard_procs = [
+        context.Process(
+            target=_run_shard_worker,
+            args=(index, args, anomaly_config, max_keys, inboxes[index], outbox),
+            name=f"anomaly-shard-{index}",
+            daemon=True,
+        )
+        for index in range(workers)
+    ]
+    for proc in shard_procs:
+        proc.start()
+
+    # Bounds the number of batches read ahead of the merge point; the pool's
+    # task feeder thread blocks here instead of buffering the whole input.
+    slots = threading.BoundedSemaphore(max_in_flight)
+    stop = threading.Event()
+
+    # Input is read on a daemon thread so that a blocking read (e.g. idle
+    # stdin) never keeps the pool's feeder thread from shutting down.
+    batches: "queue.Queue[Optional[List[bytes]]]" = queue.Queue(maxsize=max_in_flight)
+    reader_errors: List[BaseException] = []
+
+    def read_batches() -> None:
+        try:
+            for batch in iter_line_batches(
+                args.source, args.input_file, SHARD_BATCH_LINES, logger
+            ):
+                if stop.is_set():
+                    break
+                batches.put(batch)
+        except BaseException as exc:
+            reader_errors.append(exc)
+        finally:
+            batches.put(None)
+
+    def bounded_batches() -> Iterable[List[bytes]]:
+        while True:
+            try:
+                batch = batches.get(timeout=0.5)
+            except queue.Empty:
+                if stop.is_set():
+                    return
+                continue
+            if batch is None:
+                return
+            while not slots.acquire(timeout=0.5):
+                if stop.is_set():
+                    return
+            yield batch
+
+    received_signal: List[int] = []
+
+    def request_stop(signum: int, _frame: Any) -> None:
+        logger.info("Received signal %s, draining shard workers.", signum)
+        received_signal.append(signum)
+        stop.set()
+
+    def broadcast_reload(config: Dict[str, Any]) -> None:
+        for inbox in inboxes:
+            inbox.put((RELOAD_BATCH, config))
+
+    pending: Dict[int, List[List[Tuple[int, str]]]] = {}
+    next_batch = 0
+    totals = [0, 0, 0, 0]
+    finished = 0
+    sections: Dict[int, bytes] = {}
+    final_sections: Dict[int, bytes] = {}
+
+    def receive() -> None:
+        nonlocal next_batch, finished
+        while True:
+            try:
+                batch_id, shard_index, payload = outbox.get(timeout=1.0)
+                break
+            except queue.Empty:
+                dead = [proc.name for proc in shard_procs if not proc.is_alive()]
+                if dead and finished < workers:
+                    logger.error("Shard worker(s) exited unexpectedly: %s", ", ".join(dead))
+                    raise SystemExit(1)
+
+        if batch_id is None:
+            finished += 1
+            stats, final_sections[shard_index] = payload
+            for position, value in enumerate(stats):
+                totals[position] += value
+            return
+
+        if batch_id == CHECKPOINT_BATCH:
+            sections[shard_index] = payload
+            if len(sections) == workers and checkpoint is not None:
+                checkpoint.save([sections.pop(index) for index in range(workers)])
+            return
+
+        pending[batch_id].append(payload)
+        while next_batch in pending and len(pending[next_batch]) == workers:
+            for _, serialized in heapq.merge(*pending.pop(next_batch)):
+                sink.write_serialized(serialized)
+            next_batch += 1
+            slots.release()
+
+    pool = context.Pool(
+        processes=workers,
+        initializer=_init_partition_worker,
+        initargs=(args, workers),
+    )
+    previous_handler = signal.signal(signal.SIGTERM, request_stop)
+    reader = threading.Thread(target=read_batches, name="anomaly-input-reader", daemon=True)
+    reader.start()
+    try:
+        batch_count = 0
+        results = pool.imap(_partition_batch, bounded_batches())
+        while not stop.is_set():
+            if reload_trigger is not None:
+                poll_thresholds_reload(reload_trigger, reload_metrics, args, logger, broadcast_reload)
+            try:
+                blobs = results.next(timeout=1.0)
+            except multiprocessing.TimeoutError:
+                continue
+            except StopIteration:
+                break
+            pending[batch_count] = []
+            for shard_index, blob in enumerate(blobs):
+                inboxes[shard_index].put((batch_count, blob))
+            batch_count += 1
+            if checkpoint is not None and checkpoint.due():
+                for inbox in inboxes:
+                    inbox.put((CHECKPOINT_BATCH, b""))
+            while batch_count - next_batch >= max_in_flight:
+                receive()
+        if reader_errors:
+            raise reader_errors[0]
+
+        for inbox in inboxes:
+            inbox.put(None)
+        while next_batch < batch_count or finished < workers:
+            receive()
+        if checkpoint is not None:
+            checkpoint.save([final_sections[index] for index in range(workers)])
+        if not received_signal:
+            pool.close()
+            pool.join()
+        for proc in shard_procs:
+            proc.join()
+    finally:
+        signal.signal(signal.SIGTERM, previous_handler)
+        stop.set()
+        pool.terminate()
+        for proc in shard_procs:
+            if proc.is_alive():
+                proc.kill()
+
+    if received_signal:
+        logger.info("Stopped after draining %d dispatched batches.", batch_count)
+        raise SystemExit(128 + received_signal[0])
+    return totals[0], totals[1], totals[2], totals[3]
+
+
+# -----------------------------
+# Single-process execution
+# -----------------------------
+
+
+def run_single(
+    args: argparse.Namespace,
+    anomaly_config: Dict[str, Any],
+    sink: JsonlSink,
+    logger: logging.Logger,
+    decoder: JsonDecoder,
+    checkpoint: Optional[StateCheckpoint],
+    reload_trigger: ReloadTrigger,
+    reload_metrics: ReloadMetrics,
+) -> Tuple[int, int, int, int]:
+    """
+    Run detection in this process.
+
+    Input is read on a daemon thread and handed over one read at a time;
+    detection, reloads and checkpoints all run on the calling thread.
+    Housekeeping runs after every read and at least every
+    HOUSEKEEPING_INTERVAL_SECONDS while input is idle, so SIGHUP, changes
+    to --thresholds and periodic checkpoints do not wait for more events.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed CLI arguments.
+    anomaly_config : Dict[str, Any]
+        The ``anomaly_detection`` section of the thresholds YAML.
+    sink : JsonlSink
+        Output sink for anomaly records.
+    logger : logging.Logger
+        Logger instance.
+    decoder : JsonDecoder
+        JSON backend.
+    checkpoint : Optional[StateCheckpoint]
+        State snapshot writer for --state-file.
+    reload_trigger : ReloadTrigger
+        Reports when the thresholds YAML should be reloaded.
+    reload_metrics : ReloadMetrics
+        Reload metrics.
+
+    Returns
+    -------
+    Tuple[int, int, int, int]
+        (keys, evicted_lru, evicted_ttl, restored).
+    """
+    pipeline = DetectionPipeline(args, anomaly_config, logger)
+    table = pipeline.state_table
+    if checkpoint is not None:
+        pipeline.restore_state(args.state_file)
+
+    chunks: "queue.Queue[Optional[List[bytes]]]" = queue.Queue(maxsize=READ_AHEAD_CHUNKS)
+    reader_errors: List[BaseException] = []
+
+    def read_chunks() -> None:
+        try:
+            for lines in iter_line_chunks(args.source, args.input_file, logger):
+                chunks.put(lines)
+        except BaseException as exc:
+            reader_errors.append(exc)
+        finally:
+            chunks.put(None)
+
+    reader = threading.Thread(target=read_chunks, name="anomaly-input-reader", daemon=True)
+    reader.start()
+    try:
+        while True:
+            try:
+                lines = chunks.get(timeout=HOUSEKEEPING_INTERVAL_SECONDS)
+            except queue.Empty:
+                lines = []
+            if lines is None:
+                break
+            for event in iter_decoded_events(lines, decoder, logger):
+                record = pipeline.process(event)
+                if record is not None:
+                    sink.write(record)
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save([table.export_section()])
+            poll_thresholds_reload(reload_trigger, reload_metrics, args, logger, pipeline.reconfigure)
+        if reader_errors:
+            raise reader_errors[0]
+    finally:
+        if checkpoint is not None:
+            checkpoint.save([table.export_section()])
+    return len(table), table.evicted_lru, table.evicted_ttl, table.restored
+
+
+def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
+    """
+    Parse CLI arguments.
+
+    Parameters
+    ----------
+    argv : Optional[Iterable[str]]
+        Optional list for testing.
+
+    Returns
+    -------
+    argparse.Namespace
+        Parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Compliance anomaly detector.")
+
+    parser.add_argument(
+        "--thresholds",
+        required=True,
+        type=Path,
+        help="Path to alert thresholds YAML.",
+    )
+
+    parser.add_argument(
+        "--source",
+        choices=["file", "stdin"],
+        default="stdin",
+        help="Event source: file or stdin.",
+    )
 
     parser.add_argument(
         "--input-file",
@@ -395,6 +2410,13 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         help="Input file path when --source=file.",
     )
 
+    parser.add_argument(
+        "--json-decoder",
+        choices=DECODER_CHOICES,
+        default="auto",
+        help="JSON decoder backend; auto prefers orjson, then msgspec, then stdlib json.",
+    )
+
     parser.add_argument(
         "--metric-field",
         default="count",
@@ -407,6 +2429,99 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         help="Name to assign to the metric for reporting.",
     )
 
+    parser.add_argument(
+        "--metric-name-field",
+        default=None,
+        help=(
+            "Optional event field carrying the metric name, for streams that "
+            "mix several metrics. Falls back to --metric-name when absent."
+        ),
+    )
+
+    parser.add_argument(
+        "--group-by",
+        type=lambda value: [f.strip() for f in value.split(",") if f.strip()],
+        default=[],
+        help=(
+            "Comma-separated event fields to key baselines on (e.g., host,user). "
+            "Each distinct combination gets its own window per metric."
+        ),
+    )
+
+    parser.add_argument(
+        "--max-keys",
+        type=int,
+        default=100000,
+        help="Maximum number of keyed windows held in memory (LRU eviction).",
+    )
+
+    parser.add_argument(
+        "--key-ttl",
+        type=float,
+        default=3600.0,
+        help="Seconds after which an idle keyed window is dropped (0 disables).",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of worker processes. Above 1, events are hash-partitioned "
+            "by metric and --group-by key across shard workers."
+        ),
+    )
+
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=None,
+        help=(
+            "Binary detector state snapshot. Restored on startup and rewritten "
+            "periodically and at shutdown, so restarts resume without warm-up."
+        ),
+    )
+
+    parser.add_argument(
+        "--state-interval",
+        type=float,
+        default=300.0,
+        help="Seconds between periodic state snapshots (0: only at shutdown).",
+    )
+
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=1.0,
+        help=(
+            "Seconds between checks of --thresholds for changes to hot-reload "
+            "(0 disables file watching; SIGHUP always reloads)."
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=None,
+        help="Write configuration reload metrics here (Prometheus textfile format).",
+    )
+
+    parser.add_argument(
+        "--detector",
+        choices=DETECTOR_CHOICES,
+        default="zscore",
+        help=(
+            "Default detector: zscore (sliding window), ewma, mad (rolling "
+            "median/MAD) or seasonal (hour-of-week). Overridable per metric in YAML."
+        ),
+    )
+
+    parser.add_argument(
+        "--timestamp-field",
+        default="timestamp",
+        help="Event field holding the event time (epoch or ISO 8601), used by seasonal.",
+    )
+
     parser.add_argument(
         "--window-size",
         type=int,
@@ -427,6 +2542,34 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         help="Output destination: 'stdout' or path to a JSON lines file.",
     )
 
+    parser.add_argument(
+        "--flush-records",
+        type=int,
+        default=1000,
+        help="Flush buffered anomaly records after this many records.",
+    )
+
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=1.0,
+        help="Flush buffered anomaly records at least this often, in seconds (0 disables).",
+    )
+
+    parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default="never",
+        help="fsync policy for file output: never, after every batch, or on close.",
+    )
+
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSION_CHOICES,
+        default="none",
+        help="Compression for file output (zstd requires the zstandard package).",
+    )
+
     parser.add_argument(
         "-v",
         "--verbose",
@@ -450,77 +2593,99 @@ def main() -> None:
 
     thresholds_config = load_thresholds(args.thresholds, logger)
 
-    # Override CLI zscore_threshold/window-size from config if present.
-    metric_cfg = thresholds_config.get("anomaly_detection", {})
-    window_size = int(metric_cfg.get("window_size", args.window_size))
-    zscore_threshold = float(metric_cfg.get("zscore_threshold", args.zscore_threshold))
+    # Config values override CLI window-size/zscore_threshold; per-metric
+    # overrides under anomaly_detection.metrics take precedence over both.
+    anomaly_config = thresholds_config.get("anomaly_detection") or {}
 
-    logger.info(
-        "Using window_size=%s and zscore_threshold=%s",
-        window_size,
-        zscore_threshold,
-    )
+    if args.workers < 1:
+        logger.error("--workers must be at least 1.")
+        raise SystemExit(1)
+    if args.max_keys < 1:
+        logger.error("--max-keys must be at least 1.")
+        raise SystemExit(1)
+    if args.state_interval < 0:
+        logger.error("--state-interval must not be negative.")
+        raise SystemExit(1)
+    if args.reload_interval < 0:
+        logger.error("--reload-interval must not be negative.")
+        raise SystemExit(1)
+    try:
+        compile_metric_settings(anomaly_config, (), args)
+    except ConfigError as exc:
+        logger.error("Invalid anomaly_detection settings in %s: %s", args.thresholds, exc)
+        raise SystemExit(1)
 
-    stats = SlidingWindowStats(window_size=window_size)
-    event_iter = get_event_iterator(args.source, args.input_file, logger)
+    try:
+        decoder = select_decoder(args.json_decoder)
+    except ValueError as exc:
+        logger.error("%s", exc)
+        raise SystemExit(1)
+    logger.info("Using JSON decoder: %s", decoder.name)
 
-    output_path: Optional[Path] = None
-    if args.output != "stdout":
-        output_path = Path(args.output)
-        try:
-            # Truncate file at start to avoid unbounded growth.
-            output_path.write_text("", encoding="utf-8")
-        except Exception as exc:
-            logger.error("Failed to initialize output file: %s", exc)
-            raise SystemExit(1)
+    logger.info(
+        "Keyed state: group_by=%s max_keys=%s key_ttl=%s workers=%s",
+        args.group_by or "-",
+        args.max_keys,
+        args.key_ttl,
+        args.workers,
+    )
 
-    def emit(record: Dict[str, Any]) -> None:
-        serialized = json.dumps(record, separators=(",", ":"), sort_keys=True)
-        if output_path is None:
-            print(serialized)
-        else:
-            try:
-                with output_path.open("a", encoding="utf-8") as f:
-                    f.write(serialized + "\n")
-            except Exception as exc_inner:
-                logger.error("Failed to write anomaly record: %s", exc_inner)
-                raise SystemExit(1)
+    try:
+        # File output is truncated at start to avoid unbounded growth.
+        sink = JsonlSink(
+            args.output,
+            logger,
+            append=False,
+            flush_records=args.flush_records,
+            flush_interval=args.flush_interval,
+            fsync=args.fsync,
+            compression=args.compression,
+        )
+    except (OSError, ValueError) as exc:
+        logger.error("Failed to initialize output sink: %s", exc)
+        raise SystemExit(1)
 
-    for event in event_iter:
-        raw_value = event.get(args.metric_field)
-        # Only process numeric metric values.
-        try:
-            metric_value = float(raw_value)
-        except (TypeError, ValueError):
-            logger.debug(
-                "Skipping event with non-numeric metric field '%s': %s",
-                args.metric_field,
-                event,
-            )
-            continue
+    checkpoint = None
+    if args.state_file is not None:
+        checkpoint = StateCheckpoint(args.state_file, args.state_interval, logger)
 
-        stats.add(metric_value)
+    reload_metrics = ReloadMetrics("anomaly_detector", args.metrics_file, logger)
+    reload_metrics.write()
+    reload_trigger = ReloadTrigger([args.thresholds], logger, args.reload_interval)
 
-        if detect_anomaly(
-            metric_name=args.metric_name,
-            metric_value=metric_value,
-            window_stats=stats,
-            zscore_threshold=zscore_threshold,
-            logger=logger,
-        ):
-            reason = (
-                f"Metric '{args.metric_name}' value {metric_value} "
-                f"exceeds z-score threshold {zscore_threshold}."
+    install_termination_handler(logger)
+    try:
+        if args.workers > 1:
+            keys, evicted_lru, evicted_ttl, restored = run_sharded(
+                args, anomaly_config, sink, logger, checkpoint, reload_trigger, reload_metrics
             )
-            anomaly_record = build_anomaly_record(
-                event=event,
-                metric_name=args.metric_name,
-                metric_value=metric_value,
-                reason=reason,
+        else:
+            keys, evicted_lru, evicted_ttl, restored = run_single(
+                args,
+                anomaly_config,
+                sink,
+                logger,
+                decoder,
+                checkpoint,
+                reload_trigger,
+                reload_metrics,
             )
-            emit(anomaly_record)
+    finally:
+        try:
+            sink.close()
+        except OSError as exc:
+            logger.error("Failed to flush anomaly records: %s", exc)
+            raise SystemExit(1)
 
-    logger.info("Anomaly detection completed.")
+    logger.info(
+        "Anomaly detection completed. records=%s keys=%s restored=%s "
+        "evicted_lru=%s evicted_ttl=%s",
+        sink.records_written,
+        keys,
+        restored,
+        evicted_lru,
+        evicted_ttl,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,240 @@
+"""
+config_reload.py
+
+Hot-reload support for the continuous monitoring tools
+(real-time-compliance-monitor.py, anomaly-detector.py).
+
+Responsibilities:
+- Read YAML configuration, reporting problems as exceptions so that a
+  running tool can reject a bad edit and keep its current configuration
+- Detect reload requests: SIGHUP, or a change of a watched file's
+  modification time, size or inode (checked at most once per interval)
+- Record reload outcomes and latency (trigger to new configuration
+  active), optionally as a Prometheus textfile-collector metrics file
+
+The tools poll ReloadTrigger between events, so a new configuration
+snapshot is always swapped in between two events, never during one.
+
+The scripts in this directory import this module by name; it is resolved
+from the script directory, so no installation step is required.
+"""
+
+import logging
+import os
+import signal
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import yaml  # type: ignore
+except ImportError as exc:
+    raise SystemExit(
+        "Missing dependency: pyyaml. Install with `pip install pyyaml`."
+    ) from exc
+
+
+class ConfigError(ValueError):
+    """
+    Raised when a configuration file cannot be read or is invalid.
+    """
+
+
+def read_yaml_mapping(path: Path) -> Dict[str, Any]:
+    """
+    Read a YAML file whose top level must be a mapping (or empty).
+
+    Parameters
+    ----------
+    path : Path
+        YAML file.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Parsed content.
+
+    Raises
+    ------
+    ConfigError
+        If the file cannot be read or parsed, or is not a mapping.
+    """
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            config = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as exc:
+        raise ConfigError(f"{path}: {exc}") from exc
+    if config is None:
+        return {}
+    if not isinstance(config, dict):
+        raise ConfigError(f"{path}: top level must be a mapping, not {type(config).__name__}.")
+    return config
+
+
+# -----------------------------
+# Reload triggers
+# -----------------------------
+
+
+FileSignature = Optional[Tuple[int, int, int]]
+
+
+def _signature(path: Path) -> FileSignature:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class ReloadTrigger:
+    """
+    Report when configuration files should be reloaded.
+
+    A SIGHUP handler is installed on construction (where SIGHUP exists).
+    Watched files are compared with their last known signature at most
+    every ``interval`` seconds; an interval of 0 disables file watching.
+
+    Parameters
+    ----------
+    paths : Sequence[Path]
+        Configuration files to watch.
+    logger : logging.Logger
+        Logger instance.
+    interval : float
+        Seconds between file checks (0 disables them).
+    """
+
+    def __init__(self, paths: Sequence[Path], logger: logging.Logger, interval: float = 1.0) -> None:
+        if interval < 0:
+            raise ValueError("interval must not be negative.")
+        self.paths = list(paths)
+        self.logger = logger
+        self.interval = interval
+        self.reason = ""
+        self._signatures = [_signature(path) for path in self.paths]
+        self._requested_at: Optional[float] = None
+        self._next_check = time.monotonic() + interval
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._on_sighup)
+
+    def _on_sighup(self, _signum: int, _frame: Any) -> None:
+        if self._requested_at is None:
+            self._requested_at = time.monotonic()
+            self.reason = "SIGHUP"
+
+    def poll(self) -> Optional[float]:
+        """
+        Return the trigger time (time.monotonic) if a reload is due.
+
+        The watched files' signatures are refreshed before returning, so a
+        change made while the reload is reading the files triggers again.
+
+        Returns
+        -------
+        Optional[float]
+            Monotonic time of the SIGHUP or of noticing the change, or None.
+        """
+        if self._requested_at is None and self.interval > 0:
+            now = time.monotonic()
+            if now < self._next_check:
+                return None
+            self._next_check = now + self.interval
+            signatures = [_signature(path) for path in self.paths]
+            if signatures == self._signatures:
+                return None
+            changed = [str(path) for path, old, new in zip(self.paths, self._signatures, signatures) if old != new]
+            self._requested_at = now
+            self.reason = f"change of {', '.join(changed)}"
+        if self._requested_at is None:
+            return None
+
+        requested_at, self._requested_at = self._requested_at, None
+        self._signatures = [_signature(path) for path in self.paths]
+        return requested_at
+
+
+# -----------------------------
+# Reload metrics
+# -----------------------------
+
+
+class ReloadMetrics:
+    """
+    Counters and gauges describing configuration reloads.
+
+    Parameters
+    ----------
+    prefix : str
+        Metric name prefix, e.g. "compliance_monitor".
+    path : Optional[Path]
+        Prometheus textfile to (atomically) rewrite after every reload.
+    logger : logging.Logger
+        Logger instance.
+    """
+
+    def __init__(self, prefix: str, path: Optional[Path], logger: logging.Logger) -> None:
+        self.prefix = prefix
+        self.path = path
+        self.logger = logger
+        self.generation = 1
+        self.successes = 0
+        self.failures = 0
+        self.last_latency = 0.0
+        self.last_success_at = time.time()
+
+    def record(self, success: bool, latency: float) -> None:
+        """
+        Record one reload attempt and rewrite the metrics file.
+
+        Parameters
+        ----------
+        success : bool
+            Whether the new configuration became active.
+        latency : float
+            Seconds from the trigger until the snapshot was swapped in (or
+            rejected).
+        """
+        self.last_latency = latency
+        if success:
+            self.successes += 1
+            self.generation += 1
+            self.last_success_at = time.time()
+        else:
+            self.failures += 1
+        self.write()
+
+    def render(self) -> str:
+        """
+        Return the metrics in the Prometheus text exposition format.
+        """
+        p = self.prefix
+        lines: List[str] = [
+            f"# HELP {p}_config_reloads_total Configuration reload attempts by result.",
+            f"# TYPE {p}_config_reloads_total counter",
+            f'{p}_config_reloads_total{{result="success"}} {self.successes}',
+            f'{p}_config_reloads_total{{result="failure"}} {self.failures}',
+            f"# HELP {p}_config_reload_latency_seconds Seconds from the last reload trigger to its outcome.",
+            f"# TYPE {p}_config_reload_latency_seconds gauge",
+            f"{p}_config_reload_latency_seconds {self.last_latency:.6f}",
+            f"# HELP {p}_config_generation Generation of the active configuration snapshot.",
+            f"# TYPE {p}_config_generation gauge",
+            f"{p}_config_generation {self.generation}",
+            f"# HELP {p}_config_last_success_timestamp_seconds Time the active configuration was loaded.",
+            f"# TYPE {p}_config_last_success_timestamp_seconds gauge",
+            f"{p}_config_last_success_timestamp_seconds {self.last_success_at:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """
+        Atomically rewrite the metrics file, if one is configured.
+        """
+        if self.path is None:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            tmp_path.write_text(self.render(), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            self.logger.error("Failed to write reload metrics to %s: %s", self.path, exc)
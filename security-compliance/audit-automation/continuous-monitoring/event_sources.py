@@ -0,0 +1,680 @@
+"""
+event_sources.py
+
+Asyncio ingestion layer for the continuous monitoring tools
+(real-time-compliance-monitor.py).
+
+Responsibilities:
+- Parse event source specifications (files, stdin, Unix/TCP sockets and
+  HTTP long-poll endpoints) given on the command line
+- Read all sources concurrently in one event loop, decoding JSON lines
+  into batches of events
+- Funnel the batches into one bounded queue feeding a single consumer;
+  producers wait while the queue is full, so slow evaluation pushes back
+  on file reads, socket clients (TCP flow control) and HTTP polling
+- Acknowledge file batches once processed, so per-file offset
+  checkpoints (file_tailer.py) never get ahead of the evaluated events
+
+Source specifications:
+- ``file:PATH`` (glob patterns are expanded once at startup)
+- ``stdin`` (or ``-``)
+- ``unix:PATH`` listens on a Unix socket; ``tcp:[HOST:]PORT`` listens on
+  TCP (HOST defaults to 127.0.0.1); clients write JSON lines
+- ``http://...`` / ``https://...`` is polled with GET requests; the body
+  is a JSON array of events, an object ``{"events": [...], "cursor": ...}``
+  (the cursor is sent back as the ``cursor`` query parameter), a single
+  event object, or JSON lines
+
+The scripts in this directory import this module by name; it is resolved
+from the script directory, so no installation step is required.
+"""
+
+import asyncio
+import glob
+import hashlib
+import logging
+import os
+import signal
+import stat
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import Counter
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from file_tailer import FileTailer, TailCheckpoint
+from stream_io import READ_CHUNK_BYTES, JsonDecoder
+
+SOURCE_TYPES = ("file", "stdin", "unix", "tcp", "http")
+
+# Maximum number of lines decoded into one queued batch.
+INGEST_BATCH_EVENTS = 1024
+
+# Longest line accepted from a stream source (stdin, sockets); longer
+# lines are discarded, so a peer that never sends a newline cannot grow
+# the read buffer without bound.
+MAX_LINE_BYTES = READ_CHUNK_BYTES
+
+# Default queue capacity, in batches.
+DEFAULT_QUEUE_BATCHES = 64
+
+DEFAULT_TCP_HOST = "127.0.0.1"
+
+# Backoff bounds between failed HTTP polls, in seconds.
+HTTP_RETRY_MIN_SECONDS = 1.0
+HTTP_RETRY_MAX_SECONDS = 30.0
+
+
+class SourceSpec(NamedTuple):
+    """
+    One event source: its type and target (path, address or URL).
+    """
+
+    kind: str
+    target: str
+
+    def __str__(self) -> str:
+        return self.target if self.kind in ("http", "stdin") else f"{self.kind}:{self.target}"
+
+
+class EventBatch:
+    """
+    Decoded events from one source, queued for evaluation.
+
+    Parameters
+    ----------
+    source : str
+        Source label, used for statistics.
+    events : List[Any]
+        Decoded events (may be empty for file batches of blank lines).
+    ack : Optional[Callable[[], None]]
+        Called after the events have been processed.
+    """
+
+    __slots__ = ("source", "events", "ack")
+
+    def __init__(self, source: str, events: List[Any], ack: Optional[Callable[[], None]] = None) -> None:
+        self.source = source
+        self.events = events
+        self.ack = ack
+
+
+# -----------------------------
+# Source specifications
+# -----------------------------
+
+
+def parse_source_spec(value: str) -> SourceSpec:
+    """
+    Parse a ``--source`` value (see the module docstring).
+
+    Raises
+    ------
+    ValueError
+        If the specification is malformed.
+    """
+    if value in ("stdin", "-"):
+        return SourceSpec("stdin", "stdin")
+    if value.startswith(("http://", "https://")):
+        return SourceSpec("http", value)
+    kind, sep, target = value.partition(":")
+    if not sep or kind not in SOURCE_TYPES or not target:
+        raise ValueError(
+            f"Invalid source {value!r}; expected file:PATH, stdin, unix:PATH, "
+            "tcp:[HOST:]PORT or an http(s):// URL."
+        )
+    if kind == "tcp":
+        host, _, port = target.rpartition(":")
+        if not port.isdigit() or not 0 < int(port) < 65536:
+            raise ValueError(f"Invalid TCP port in source {value!r}.")
+        target = f"{host or DEFAULT_TCP_HOST}:{port}"
+    return SourceSpec(kind, target)
+
+
+def expand_sources(specs: Sequence[SourceSpec], logger: logging.Logger) -> List[SourceSpec]:
+    """
+    Expand file globs and drop duplicate sources, preserving order.
+
+    Raises
+    ------
+    SystemExit
+        If a file source matches nothing or stdin is given twice.
+    """
+    expanded: List[SourceSpec] = []
+    seen = set()
+    for spec in specs:
+        if spec.kind == "file":
+            if glob.has_magic(spec.target):
+                matches = sorted(glob.glob(spec.target))
+                if not matches:
+                    logger.error("No files match source pattern: %s", spec.target)
+                    raise SystemExit(1)
+            else:
+                matches = [spec.target]
+            candidates = [SourceSpec("file", str(Path(match).resolve())) for match in matches]
+        else:
+            candidates = [spec]
+        for candidate in candidates:
+            if candidate in seen:
+                if candidate.kind == "stdin":
+                    logger.error("stdin can only be given once as a source.")
+                    raise SystemExit(1)
+                continue
+            seen.add(candidate)
+            expanded.append(candidate)
+    return expanded
+
+
+def offset_path_for(offset_dir: Path, path: str) -> Path:
+    """
+    Return the offset checkpoint path for one tailed file in ``offset_dir``.
+    """
+    digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+    return offset_dir / f"{Path(path).name}.{digest}.offset.json"
+
+
+def _run_in_daemon_thread(func: Callable[..., Any], *args: Any) -> "asyncio.Future[Any]":
+    """
+    Run a blocking call in a daemon thread and return a future for it.
+
+    Unlike the default executor, a call that is still blocked (a read on
+    stdin, a long-poll request) does not delay interpreter shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def _deliver(setter: Callable[[Any], None], value: Any) -> None:
+        if not future.done():
+            setter(value)
+
+    def _worker() -> None:
+        try:
+            result = func(*args)
+        except BaseException as exc:  # delivered to the awaiting coroutine
+            setter, value = future.set_exception, exc
+        else:
+            setter, value = future.set_result, result
+        try:
+            loop.call_soon_threadsafe(_deliver, setter, value)
+        except RuntimeError:
+            pass  # the loop has already been closed
+
+    threading.Thread(target=_worker, name=f"ingest-{func.__name__}", daemon=True).start()
+    return future
+
+
+# -----------------------------
+# Ingestion
+# -----------------------------
+
+
+class EventIngestor:
+    """
+    Read several event sources concurrently into one bounded queue.
+
+    Parameters
+    ----------
+    sources : Sequence[SourceSpec]
+        Sources to read, as returned by expand_sources.
+    decoder : JsonDecoder
+        JSON backend.
+    logger : logging.Logger
+        Logger instance.
+    queue_size : int
+        Queue capacity in batches of up to INGEST_BATCH_EVENTS events.
+    poll_interval : float
+        Poll interval for file sources without inotify, and the minimum
+        spacing of HTTP polls that return no events.
+    start_at : str
+        Start position for file sources without a checkpoint.
+    backend : str
+        File change notification backend ("auto", "inotify" or "poll").
+    offset_file : Optional[Path]
+        Offset checkpoint for a single file source.
+    offset_dir : Optional[Path]
+        Directory of per-file offset checkpoints.
+    http_timeout : float
+        Timeout in seconds for one HTTP long-poll request.
+    before_checkpoint : Optional[Callable[[], None]]
+        Called before offset checkpoints are written (flushes findings).
+
+    Raises
+    ------
+    SystemExit
+        If a file source cannot be opened or offset options conflict.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[SourceSpec],
+        decoder: JsonDecoder,
+        logger: logging.Logger,
+        queue_size: int = DEFAULT_QUEUE_BATCHES,
+        poll_interval: float = 1.0,
+        start_at: str = "end",
+        backend: str = "auto",
+        offset_file: Optional[Path] = None,
+        offset_dir: Optional[Path] = None,
+        http_timeout: float = 60.0,
+        before_checkpoint: Optional[Callable[[], None]] = None,
+    ) -> None:
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1.")
+        self.sources = list(sources)
+        self.decoder = decoder
+        self.logger = logger
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.http_timeout = http_timeout
+        self.before_checkpoint = before_checkpoint
+        self.counts: Counter = Counter()
+        self.malformed: Counter = Counter()
+
+        file_sources = [spec for spec in self.sources if spec.kind == "file"]
+        if offset_file is not None and len(file_sources) != 1:
+            logger.error("--offset-file needs exactly one file source; use --offset-dir for several.")
+            raise SystemExit(1)
+        if offset_dir is not None:
+            offset_dir.mkdir(parents=True, exist_ok=True)
+
+        self._tailers: Dict[SourceSpec, FileTailer] = {}
+        try:
+            for spec in file_sources:
+                path = Path(spec.target)
+                if not path.is_file():
+                    logger.error("Events file does not exist: %s", path)
+                    raise SystemExit(1)
+                if offset_file is not None:
+                    checkpoint: Optional[TailCheckpoint] = TailCheckpoint(offset_file)
+                elif offset_dir is not None:
+                    checkpoint = TailCheckpoint(offset_path_for(offset_dir, spec.target))
+                else:
+                    checkpoint = None
+                tailer = FileTailer(
+                    path,
+                    logger,
+                    poll_interval=poll_interval,
+                    checkpoint=checkpoint,
+                    start_at=start_at,
+                    backend=backend,
+                )
+                self._tailers[spec] = tailer
+                logger.info("Tailing %s from offset %d (%s).", path, tailer.offset, tailer.backend)
+        except (OSError, ValueError) as exc:
+            self.close()
+            logger.error("Failed to open events file for tailing: %s", exc)
+            raise SystemExit(1)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._servers: List[Tuple[SourceSpec, asyncio.AbstractServer]] = []
+
+    # Decoding and queueing
+
+    def _decode(self, label: str, lines: Sequence[bytes]) -> List[Any]:
+        """
+        Decode raw lines, skipping blank and (with a warning) malformed
+        ones; JSON values that are not objects count as malformed.
+        """
+        loads = self.decoder.loads
+        errors = self.decoder.errors
+        events = []
+        for line in lines:
+            if not line or line.isspace():
+                continue
+            try:
+                event = loads(line)
+            except errors as exc:
+                self.malformed[label] += 1
+                self.logger.warning("Skipping invalid JSON line: %r | error=%s", line[:512], exc)
+                continue
+            if not isinstance(event, dict):
+                self.malformed[label] += 1
+                self.logger.warning("Skipping JSON line that is not an object: %r", line[:512])
+                continue
+            events.append(event)
+        if events and self.logger.isEnabledFor(logging.DEBUG):
+            for event in events:
+                self.logger.debug("Read event: %s", event)
+        return events
+
+    async def _put_lines(self, label: str, lines: List[bytes]) -> None:
+        """
+        Decode lines and queue them in batches (waits while the queue is full).
+        """
+        for start in range(0, len(lines), INGEST_BATCH_EVENTS):
+            events = self._decode(label, lines[start : start + INGEST_BATCH_EVENTS])
+            if events:
+                await self._queue.put(EventBatch(label, events))
+
+    async def _put_events(self, label: str, events: List[Any]) -> None:
+        """
+        Queue already decoded events in batches.
+        """
+        for start in range(0, len(events), INGEST_BATCH_EVENTS):
+            await self._queue.put(EventBatch(label, events[start : start + INGEST_BATCH_EVENTS]))
+
+    async def _read_stream(self, label: str, read_chunk: Callable[[], Any]) -> None:
+        """
+        Split chunks from ``read_chunk`` (a coroutine factory) into lines
+        and queue them; an empty chunk ends the stream. Lines longer than
+        MAX_LINE_BYTES are discarded (and counted as malformed).
+        """
+        carry = b""
+        discarding = False
+        while True:
+            chunk = await read_chunk()
+            if not chunk:
+                break
+            lines = (carry + chunk if carry else chunk).split(b"\n")
+            carry = lines.pop()
+            if discarding and lines:
+                lines.pop(0)  # the end of the discarded line
+                discarding = False
+            if len(carry) > MAX_LINE_BYTES:
+                if not discarding:
+                    self.malformed[label] += 1
+                    self.logger.warning(
+                        "Discarding a line longer than %d bytes from %s: %r...",
+                        MAX_LINE_BYTES,
+                        label,
+                        carry[:128],
+                    )
+                carry = b""
+                discarding = True
+            await self._put_lines(label, lines)
+        if carry and not discarding:
+            await self._put_lines(label, [carry])
+
+    # Sources
+
+    def _ack_file(self, tailer: FileTailer, generation: int, offset: int) -> None:
+        """
+        Commit a processed file batch and checkpoint (rate-limited).
+        """
+        # Batches read before a rotation carry offsets of the old file.
+        if tailer.rotations == generation:
+            tailer.commit(offset)
+            tailer.checkpoint(self.before_checkpoint)
+
+    async def _tail_file(self, spec: SourceSpec, tailer: FileTailer) -> None:
+        loop = asyncio.get_running_loop()
+        label = str(spec)
+        changed = asyncio.Event()
+        fd = tailer.watch_fileno()
+        if fd is not None:
+
+            def _on_change() -> None:
+                tailer.drain_notifications()
+                changed.set()
+
+            loop.add_reader(fd, _on_change)
+        try:
+            while True:
+                lines = tailer.read_lines()
+                if not lines:
+                    tailer.checkpoint(self.before_checkpoint)
+                    changed.clear()
+                    # A timer instead of wait_for(): cancellation must not
+                    # depend on an inner task finishing first.
+                    timer = loop.call_later(tailer.poll_interval, changed.set)
+                    try:
+                        await changed.wait()
+                    finally:
+                        timer.cancel()
+                    continue
+                generation = tailer.rotations
+                offset = tailer.batch_offset
+                for start in range(0, len(lines), INGEST_BATCH_EVENTS):
+                    group = lines[start : start + INGEST_BATCH_EVENTS]
+                    offset += sum(map(len, group)) + len(group)
+                    # Queued even when empty so that the offset advances in order.
+                    await self._queue.put(
+                        EventBatch(label, self._decode(label, group), partial(self._ack_file, tailer, generation, offset))
+                    )
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+
+    async def _read_stdin(self) -> None:
+        # Unbuffered reads on the descriptor: a daemon thread blocked here
+        # holds no interpreter-level lock at shutdown.
+        fd = sys.stdin.fileno()
+        await self._read_stream("stdin", lambda: _run_in_daemon_thread(os.read, fd, READ_CHUNK_BYTES))
+        self.logger.info("stdin reached end of input.")
+
+    async def _handle_client(self, label: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername") or "local client"
+        self.logger.info("Accepted connection on %s from %s.", label, peer)
+        try:
+            await self._read_stream(label, partial(reader.read, READ_CHUNK_BYTES))
+        except (ConnectionError, OSError) as exc:
+            self.logger.warning("Connection on %s from %s failed: %s", label, peer, exc)
+        finally:
+            writer.close()
+        self.logger.info("Connection on %s from %s closed.", label, peer)
+
+    async def _start_server(self, spec: SourceSpec) -> asyncio.AbstractServer:
+        handler = partial(self._handle_client, str(spec))
+        if spec.kind == "unix":
+            try:
+                if stat.S_ISSOCK(os.stat(spec.target).st_mode):
+                    os.unlink(spec.target)  # stale socket from a previous run
+            except FileNotFoundError:
+                pass
+            server = await asyncio.start_unix_server(handler, path=spec.target, limit=READ_CHUNK_BYTES)
+        else:
+            host, _, port = spec.target.rpartition(":")
+            server = await asyncio.start_server(handler, host, int(port), limit=READ_CHUNK_BYTES)
+        self.logger.info("Listening for events on %s.", spec)
+        return server
+
+    def _fetch(self, url: str) -> bytes:
+        request = urllib.request.Request(url, headers={"Accept": "application/json, application/x-ndjson"})
+        with urllib.request.urlopen(request, timeout=self.http_timeout) as response:
+            return response.read()
+
+    def _parse_http_body(self, label: str, body: bytes) -> Tuple[List[Any], Optional[str]]:
+        """
+        Decode a long-poll response into events and an optional next cursor.
+        """
+        if not body.strip():
+            return [], None
+        try:
+            document = self.decoder.loads(body)
+        except self.decoder.errors:
+            return self._decode(label, body.split(b"\n")), None
+        cursor: Optional[str] = None
+        if isinstance(document, list):
+            values = document
+        elif isinstance(document, dict) and isinstance(document.get("events"), list):
+            values = document["events"]
+            cursor = None if document.get("cursor") is None else str(document["cursor"])
+        else:
+            values = [document]
+        events = [value for value in values if isinstance(value, dict)]
+        if len(events) < len(values):
+            self.malformed[label] += len(values) - len(events)
+            self.logger.warning(
+                "Skipping %d events from %s that are not JSON objects.",
+                len(values) - len(events),
+                label,
+            )
+        return events, cursor
+
+    async def _long_poll(self, spec: SourceSpec) -> None:
+        label = str(spec)
+        cursor: Optional[str] = None
+        delay = HTTP_RETRY_MIN_SECONDS
+        while True:
+            url = spec.target
+            if cursor is not None:
+                parts = urllib.parse.urlsplit(url)
+                query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+                query = [(key, value) for key, value in query if key != "cursor"] + [("cursor", cursor)]
+                url = urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+            started = time.monotonic()
+            try:
+                body = await _run_in_daemon_thread(self._fetch, url)
+            except (OSError, ValueError, urllib.error.HTTPError) as exc:
+                self.logger.warning("Polling %s failed: %s; retrying in %.0fs.", label, exc, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, HTTP_RETRY_MAX_SECONDS)
+                continue
+            delay = HTTP_RETRY_MIN_SECONDS
+            events, next_cursor = self._parse_http_body(label, body)
+            if next_cursor is not None:
+                cursor = next_cursor
+            if events:
+                await self._put_events(label, events)
+            else:
+                # The server answered without holding the request; do not spin.
+                await asyncio.sleep(max(0.0, self.poll_interval - (time.monotonic() - started)))
+
+    async def _guard(self, spec: SourceSpec, coro: Any) -> None:
+        """
+        Run one source, logging instead of propagating its failure.
+        """
+        try:
+            await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.logger.error("Event source %s failed: %s", spec, exc)
+
+    # Consumer
+
+    async def _consume(self, handle_batch: Callable[[List[Any]], None]) -> None:
+        queue = self._queue
+        counts = self.counts
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return
+            handle_batch(batch.events)
+            counts[batch.source] += len(batch.events)
+            if batch.ack is not None:
+                batch.ack()
+
+    async def run(
+        self,
+        handle_batch: Callable[[List[Any]], None],
+        housekeeping: Optional[Callable[[], None]] = None,
+        housekeeping_interval: float = 1.0,
+    ) -> Optional[int]:
+        """
+        Ingest until every source has ended or SIGTERM/SIGINT arrives.
+
+        ``handle_batch`` runs on the event loop for each batch in arrival
+        order. A signal stops ingestion between batches; queued batches
+        are dropped without being acknowledged, so checkpointed file
+        offsets only ever cover processed events.
+
+        Parameters
+        ----------
+        handle_batch : Callable[[List[Any]], None]
+            Evaluates one list of events.
+        housekeeping : Optional[Callable[[], None]]
+            Called every ``housekeeping_interval`` seconds on the event
+            loop (so never during a batch), e.g. to apply reloads while
+            the sources are idle.
+        housekeeping_interval : float
+            Seconds between housekeeping calls.
+
+        Returns
+        -------
+        Optional[int]
+            The signal that stopped ingestion, or None.
+
+        Raises
+        ------
+        SystemExit
+            If a socket source cannot listen on its address.
+        """
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+
+        for spec in self.sources:
+            if spec.kind in ("unix", "tcp"):
+                try:
+                    self._servers.append((spec, await self._start_server(spec)))
+                except OSError as exc:
+                    self.logger.error("Cannot listen on %s: %s", spec, exc)
+                    self._close_servers()
+                    raise SystemExit(1)
+
+        producers = []
+        for spec in self.sources:
+            if spec.kind == "file":
+                coro = self._tail_file(spec, self._tailers[spec])
+            elif spec.kind == "stdin":
+                coro = self._read_stdin()
+            elif spec.kind == "http":
+                coro = self._long_poll(spec)
+            else:
+                continue  # socket servers accept connections on their own
+            producers.append(asyncio.create_task(self._guard(spec, coro)))
+
+        consumer = asyncio.create_task(self._consume(handle_batch))
+        stopped_by: List[int] = []
+
+        def _on_signal(signum: int) -> None:
+            self.logger.info("Received signal %s, flushing output and shutting down.", signum)
+            stopped_by.append(signum)
+            consumer.cancel()
+
+        async def _finish_when_sources_end() -> None:
+            await asyncio.gather(*producers)
+            await self._queue.put(None)
+
+        async def _housekeep() -> None:
+            while True:
+                await asyncio.sleep(housekeeping_interval)
+                housekeeping()
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, _on_signal, signum)
+        finisher = None if self._servers else asyncio.create_task(_finish_when_sources_end())
+        housekeeper = asyncio.create_task(_housekeep()) if housekeeping is not None else None
+        try:
+            await consumer
+        except asyncio.CancelledError:
+            if not stopped_by:
+                raise
+        finally:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(signum)
+            pending = producers + [task for task in (finisher, housekeeper) if task is not None]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            self._close_servers()
+        return stopped_by[0] if stopped_by else None
+
+    def _close_servers(self) -> None:
+        # Not waiting for wait_closed(): open client connections would block it.
+        for spec, server in self._servers:
+            server.close()
+            if spec.kind == "unix":
+                try:
+                    os.unlink(spec.target)
+                except OSError:
+                    pass
+        self._servers = []
+
+    def close(self) -> None:
+        """
+        Write final offset checkpoints and release the file tailers.
+        """
+        for tailer in self._tailers.values():
+            try:
+                tailer.checkpoint(self.before_checkpoint, force=True)
+            finally:
+                if tailer.rotations:
+                    self.logger.info("Followed %d rotations of %s.", tailer.rotations, tailer.path)
+                tailer.close()
+        self._tailers = {}
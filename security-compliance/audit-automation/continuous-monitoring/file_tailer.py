@@ -0,0 +1,426 @@
+"""
+file_tailer.py
+
+Rotation-aware file tailing for the continuous monitoring tools
+(real-time-compliance-monitor.py).
+
+Responsibilities:
+- Follow a growing log file in large batched reads, waking up on inotify
+  events on Linux and falling back to polling elsewhere
+- Detect rename/create and copytruncate rotation without losing lines
+- Persist the consumed byte offset together with the file's device and
+  inode, so that a restart resumes exactly where processing stopped
+
+The scripts in this directory import this module by name; it is resolved
+from the script directory, so no installation step is required.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+from stream_io import READ_CHUNK_BYTES
+
+TAIL_BACKENDS = ("auto", "inotify", "poll")
+START_POSITIONS = ("end", "beginning")
+
+# Minimum seconds between checkpoint writes while data keeps arriving.
+CHECKPOINT_INTERVAL = 1.0
+
+
+# -----------------------------
+# Offset checkpoint
+# -----------------------------
+
+
+class TailCheckpoint:
+    """
+    Small JSON file recording how far a tailed file has been processed.
+
+    Parameters
+    ----------
+    path : Path
+        Checkpoint file location.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def load(self, logger: logging.Logger) -> Optional[Dict[str, Any]]:
+        """
+        Read the checkpoint; a missing or unreadable file yields None.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            Mapping with "device", "inode" and "offset", or None.
+        """
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable tail checkpoint %s: %s", self.path, exc)
+            return None
+        if not isinstance(data, dict) or not all(
+            isinstance(data.get(field), int) for field in ("device", "inode", "offset")
+        ):
+            logger.warning("Ignoring malformed tail checkpoint %s.", self.path)
+            return None
+        return data
+
+    def save(self, source: Path, device: int, inode: int, offset: int) -> None:
+        """
+        Atomically write the checkpoint (temp file, fsync, rename).
+        """
+        payload = {
+            "source": str(source),
+            "device": device,
+            "inode": inode,
+            "offset": offset,
+            "updated_at": time.time(),
+        }
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(payload, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+# -----------------------------
+# Change notification
+# -----------------------------
+
+
+class _InotifyWatch:
+    """
+    Minimal inotify watch on a directory through libc (Linux only).
+
+    The directory is watched instead of the file itself so that the events
+    of a rotation (rename, create, delete) are seen as well as writes.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, directory: Path) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        watch = libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), self.MASK)
+        if watch < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def drain(self) -> None:
+        """
+        Discard pending events without blocking.
+        """
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def wait(self, timeout: float) -> None:
+        """
+        Block until the directory changes or ``timeout`` seconds pass.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if readable:
+            self.drain()
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+# -----------------------------
+# Tailer
+# -----------------------------
+
+
+class FileTailer:
+    """
+    Follow a file across rotations, returning complete lines in batches.
+
+    ``read_lines`` returns every complete line available (at most one
+    chunk per call, blank lines included) and ``wait`` blocks until more
+    data may be available. The consumer reports progress through
+    ``commit(offset)`` using ``batch_offset`` plus the line lengths, and
+    ``checkpoint`` persists the committed offset with the file identity.
+
+    Start position: a checkpoint for the same device/inode resumes at its
+    offset (from 0 if the file was truncated meanwhile); a checkpoint for
+    another inode means the file was rotated while stopped, so the new
+    file is read from the beginning; without a checkpoint ``start_at``
+    applies.
+
+    Rotation: when the path points to a new inode, the old file is read
+    to EOF before switching; when the file shrinks below the read
+    position (copytruncate), reading restarts at offset 0.
+
+    Parameters
+    ----------
+    path : Path
+        File to follow.
+    logger : logging.Logger
+        Logger instance.
+    poll_interval : float
+        Seconds between checks when polling, and the longest inotify wait.
+    checkpoint : Optional[TailCheckpoint]
+        Offset checkpoint used to resume after a restart.
+    start_at : str
+        "end" or "beginning", used without a usable checkpoint.
+    backend : str
+        "auto" (inotify when available), "inotify" or "poll".
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        logger: logging.Logger,
+        poll_interval: float = 1.0,
+        checkpoint: Optional[TailCheckpoint] = None,
+        start_at: str = "end",
+        backend: str = "auto",
+    ) -> None:
+        if poll_interval <= 0:
+            raise ValueError("poll_interval must be positive.")
+        if start_at not in START_POSITIONS:
+            raise ValueError(f"Unsupported start position: {start_at}")
+        if backend not in TAIL_BACKENDS:
+            raise ValueError(f"Unsupported tail backend: {backend}")
+
+        self.path = path
+        self.logger = logger
+        self.poll_interval = poll_interval
+        self.checkpoint_store = checkpoint
+        self.rotations = 0
+        self.batch_offset = 0
+
+        self._file: Optional[BinaryIO] = None
+        self._device = 0
+        self._inode = 0
+        self._read_offset = 0
+        self._carry = b""
+        self._committed = 0
+        self._saved: Optional[int] = None
+        self._last_checkpoint = 0.0
+
+        self._watch: Optional[_InotifyWatch] = None
+        if backend != "poll":
+            try:
+                self._watch = _InotifyWatch(path.parent)
+            except (OSError, AttributeError) as exc:
+                if backend == "inotify":
+                    raise
+                logger.info("inotify unavailable (%s); polling every %ss.", exc, poll_interval)
+        self.backend = "inotify" if self._watch is not None else "poll"
+
+        self._open_initial(start_at)
+
+    @property
+    def offset(self) -> int:
+        """
+        Committed offset (end of the last line reported as processed).
+        """
+        return self._committed
+
+    def _open(self) -> None:
+        """
+        Open the current file at the path and record its identity.
+        """
+        self._file = self.path.open("rb")
+        stat = os.fstat(self._file.fileno())
+        self._device, self._inode = stat.st_dev, stat.st_ino
+
+    def _open_initial(self, start_at: str) -> None:
+        """
+        Open the file and position it according to the checkpoint/start_at.
+        """
+        self._open()
+        size = os.fstat(self._file.fileno()).st_size
+        state = self.checkpoint_store.load(self.logger) if self.checkpoint_store else None
+
+        if state is not None and (state["device"], state["inode"]) == (self._device, self._inode):
+            offset = state["offset"]
+            if offset > size:
+                self.logger.warning(
+                    "%s is shorter than its checkpoint (%d < %d); it was truncated, reading from the start.",
+                    self.path,
+                    size,
+                    offset,
+                )
+                offset = 0
+            else:
+                self.logger.info("Resuming %s at checkpointed offset %d.", self.path, offset)
+        elif state is not None:
+            self.logger.warning(
+                "%s was rotated since the last checkpoint; reading the new file from the start.",
+                self.path,
+            )
+            offset = 0
+        else:
+            offset = size if start_at == "end" else 0
+
+        self._file.seek(offset)
+        self._read_offset = self._committed = self.batch_offset = offset
+
+    def _reopen_from_start(self) -> None:
+        """
+        Switch to the file now at the path (after a rename rotation).
+        """
+        if self._file is not None:
+            self._file.close()
+        self._open()
+        self._read_offset = self._committed = self.batch_offset = 0
+        self._carry = b""
+        self.rotations += 1
+
+    def _rotated(self) -> bool:
+        """
+        Return True if the path now refers to a different file.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != (self._device, self._inode)
+
+    def read_lines(self) -> List[bytes]:
+        """
+        Return the complete lines currently available (possibly none).
+
+        ``batch_offset`` is set to the file offset of the first returned
+        line. A trailing partial line is held back until its newline is
+        written.
+
+        Returns
+        -------
+        List[bytes]
+            Lines without their newline terminator.
+        """
+        chunk = self._file.read(READ_CHUNK_BYTES)
+        if not chunk:
+            size = os.fstat(self._file.fileno()).st_size
+            if size < self._read_offset:
+                self.logger.warning("%s was truncated; reading from the start.", self.path)
+                self._file.seek(0)
+                self._read_offset = self._committed = self.batch_offset = 0
+                self._carry = b""
+                self.rotations += 1
+                return self.read_lines()
+            if self._rotated():
+                if self._carry:
+                    self.logger.warning(
+                        "Discarding %d bytes of unterminated data at the end of the rotated %s.",
+                        len(self._carry),
+                        self.path,
+                    )
+                self.logger.info("%s was rotated; following the new file.", self.path)
+                self._reopen_from_start()
+                return self.read_lines()
+            return []
+
+        self._read_offset += len(chunk)
+        data = self._carry + chunk if self._carry else chunk
+        self.batch_offset = self._read_offset - len(data)
+        lines = data.split(b"\n")
+        self._carry = lines.pop()
+        return lines
+
+    def commit(self, offset: int) -> None:
+        """
+        Record that everything before ``offset`` has been processed.
+        """
+        self._committed = offset
+
+    def watch_fileno(self) -> Optional[int]:
+        """
+        Return the inotify descriptor (readable on changes), or None when polling.
+
+        Event loops can watch this descriptor instead of calling ``wait``;
+        ``drain_notifications`` must then be called when it is readable.
+        """
+        return self._watch.fileno() if self._watch is not None else None
+
+    def drain_notifications(self) -> None:
+        """
+        Discard pending inotify events without blocking.
+        """
+        if self._watch is not None:
+            self._watch.drain()
+
+    def wait(self) -> None:
+        """
+        Block until the file may have new data, at most ``poll_interval``.
+        """
+        if self._watch is not None:
+            self._watch.wait(self.poll_interval)
+        else:
+            time.sleep(self.poll_interval)
+
+    def checkpoint(
+        self,
+        before_save: Optional[Callable[[], None]] = None,
+        force: bool = False,
+    ) -> None:
+        """
+        Persist the committed offset, rate-limited unless ``force``.
+
+        Parameters
+        ----------
+        before_save : Optional[Callable[[], None]]
+            Called before writing, e.g. to flush output for the processed
+            lines so the checkpoint never gets ahead of emitted results.
+        force : bool
+            Write even if the last write was less than CHECKPOINT_INTERVAL ago.
+        """
+        if self.checkpoint_store is None or self._committed == self._saved:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_checkpoint < CHECKPOINT_INTERVAL:
+            return
+        if before_save is not None:
+            before_save()
+        try:
+            self.checkpoint_store.save(self.path, self._device, self._inode, self._committed)
+        except OSError as exc:
+            self.logger.error("Failed to write tail checkpoint %s: %s", self.checkpoint_store.path, exc)
+            return
+        self._saved = self._committed
+        self._last_checkpoint = now
+
+    def close(self) -> None:
+        """
+        Release the file and the inotify watch.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
@@ -3,29 +3,63 @@
 real-time-compliance-monitor.py
 
 Real-time compliance monitoring engine that:
-- Subscribes (polls) to an events source (e.g., log file, message queue, API)
+- Subscribes to an events source (e.g., log file, message queue, API), following
+  log rotation and resuming from a checkpointed offset
 - Evaluates events against compliance rules and alert thresholds
+- Enforces per-severity and per-event-type max_per_minute rates in event time
+- Correlates events per key over time windows (thresholds, sequences and
+  missing follow-up events)
 - Emits structured findings for downstream systems (SIEM, ticketing, dashboards)
 
 This script is intentionally backend-agnostic:
-- Input source can be a file, stdin, or HTTP endpoint (simulated here)
-- Rules and thresholds are loaded from a YAML configuration
+- Input sources can be files, stdin, Unix/TCP sockets or HTTP long-poll
+  endpoints, read concurrently into one bounded queue (event_sources.py)
+- Rules and thresholds are loaded from a YAML configuration and hot-reloaded
+  on change or SIGHUP (config_reload.py)
 """
 
 import argparse
-import json
+import asyncio
+import heapq
 import logging
+import math
 import sys
 import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
-
-try:
-    import yaml  # type: ignore
-except ImportError as exc:
-    raise SystemExit(
-        "Missing dependency: pyyaml. Install with `pip install pyyaml`."
-    ) from exc
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from config_reload import ConfigError, ReloadMetrics, ReloadTrigger, read_yaml_mapping
+from event_sources import (
+    DEFAULT_QUEUE_BATCHES,
+    EventIngestor,
+    SourceSpec,
+    expand_sources,
+    parse_source_spec,
+)
+from file_tailer import START_POSITIONS, TAIL_BACKENDS
+from stream_io import (
+    COMPRESSION_CHOICES,
+    DECODER_CHOICES,
+    FSYNC_POLICIES,
+    JsonlSink,
+    parse_event_time,
+    select_decoder,
+)
 
 
 # -----------------------------
@@ -101,13 +135,12 @@ def load_yaml_config(path: Path, logger: logging.Logger) -> Dict[str, Any]:
         raise SystemExit(1)
 
     try:
-        with path.open("r", encoding="utf-8") as f:
-            config = yaml.safe_load(f) or {}
-        logger.debug("Loaded configuration from %s", path)
-        return config
-    except Exception as exc:
+        config = read_yaml_mapping(path)
+    except ConfigError as exc:
         logger.error("Failed to parse YAML configuration: %s", exc)
         raise SystemExit(1)
+    logger.debug("Loaded configuration from %s", path)
+    return config
 
 
 # -----------------------------
@@ -115,108 +148,191 @@ def load_yaml_config(path: Path, logger: logging.Logger) -> Dict[str, Any]:
 # -----------------------------
 
 
-def read_events_from_file(path: Path, logger: logging.Logger) -> Iterable[Dict[str, Any]]:
+def resolve_sources(args: argparse.Namespace, logger: logging.Logger) -> List[SourceSpec]:
     """
-    Tail-like reader for an event log file.
-
-    This function yields JSON-decoded lines from the file as they appear,
-    emulating a streaming event source.
+    Collect the event sources from --source and the legacy --source-path.
 
     Parameters
     ----------
-    path : Path
-        Path to the log file being monitored.
+    args : argparse.Namespace
+        Parsed arguments.
     logger : logging.Logger
-        Logger for debug and error messages.
+        Logger instance.
+
+    Returns
+    -------
+    List[SourceSpec]
+        Sources with file globs expanded and duplicates removed.
 
-    Yields
+    Raises
     ------
-    Dict[str, Any]
-        Parsed JSON event objects.
+    SystemExit
+        If no source is given or a file source matches nothing.
     """
-    logger.info("Monitoring file for events: %s", path)
-
-    # Ensure file exists before starting to tail.
-    if not path.exists():
-        logger.error("Events file does not exist: %s", path)
+    specs = list(args.source or [])
+    if args.source_path is not None:
+        specs.insert(0, SourceSpec(args.source_type, str(args.source_path)))
+    if not specs:
+        logger.error("At least one event source is required (--source or --source-path).")
         raise SystemExit(1)
+    return expand_sources(specs, logger)
 
-    try:
-        with path.open("r", encoding="utf-8") as f:
-            # Move to the end of file for "real-time" behavior
-            f.seek(0, 2)
-            while True:
-                line = f.readline()
-                if not line:
-                    time.sleep(1.0)
-                    continue
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    event = json.loads(line)
-                    logger.debug("Received event: %s", event)
-                    yield event
-                except json.JSONDecodeError as exc:
-                    logger.warning("Skipping invalid JSON line: %s | error=%s", line, exc)
-    except KeyboardInterrupt:
-        logger.info("Interrupted by user, stopping event file monitoring.")
-    except Exception as exc:
-        logger.error("Error while reading events from file: %s", exc)
-        raise SystemExit(1)
 
+# -----------------------------
+# Compliance evaluation engine
+# -----------------------------
 
-# Placeholder for future event source types (HTTP, stdin, etc.)
-def get_event_stream(
-    source_type: str,
-    source_path: Optional[Path],
-    logger: logging.Logger,
-) -> Iterable[Dict[str, Any]]:
+
+# Severity names from least to most severe; ranks are list positions.
+SEVERITY_ORDER = ("low", "medium", "high", "critical")
+SEVERITY_RANKS: Mapping[str, int] = MappingProxyType(
+    {name: rank for rank, name in enumerate(SEVERITY_ORDER)}
+)
+
+COMPLIANT_DETAILS = "Event is compliant with configured rules."
+
+# Upper bound on cached verdicts for event types without a dedicated rule.
+MAX_FALLBACK_VERDICTS = 4096
+
+
+class RuleVerdict(NamedTuple):
+    """
+    Precomputed evaluation outcome for one (event type, severity) pair.
     """
-    Return an iterable over event objects for the specified source.
 
-    Parameters
-    ----------
-    source_type : str
-        Type of event source. Currently supports: "file".
-    source_path : Optional[Path]
-        Path to the source file (for source_type="file").
-    logger : logging.Logger
-        Logger instance.
+    compliant: bool
+    rule_id: Optional[str]
+    details: str
+    threshold_limit: Optional[Any]
 
-    Returns
-    -------
-    Iterable[Dict[str, Any]]
-        Iterable of JSON-compatible events.
 
-    Raises
-    ------
-    SystemExit
-        If source_type is unsupported or parameters are invalid.
+def _severity_rank(severity: Any) -> Optional[int]:
     """
-    if source_type == "file":
-        if not source_path:
-            logger.error("source_path is required when source_type is 'file'.")
-            raise SystemExit(1)
-        return read_events_from_file(source_path, logger)
+    Rank of a severity name, or None for unknown/non-string severities.
+    """
+    return SEVERITY_RANKS.get(severity) if isinstance(severity, str) else None
 
-    logger.error("Unsupported source_type: %s", source_type)
-    raise SystemExit(1)
 
+def _build_verdict(
+    event_type: Any,
+    severity: Any,
+    rule: Dict[str, Any],
+    thresholds: Dict[str, Any],
+) -> RuleVerdict:
+    """
+    Evaluate one (event type, severity) pair against a rule.
 
-# -----------------------------
-# Compliance evaluation engine
-# -----------------------------
+    Unknown event or allowed severities are treated as non-compliant.
+    """
+    allowed_severity = rule.get("max_allowed_severity", "medium")
+    event_rank = _severity_rank(severity)
+    allowed_rank = _severity_rank(allowed_severity)
+    if event_rank is None or allowed_rank is None:
+        compliant = False
+    else:
+        compliant = event_rank <= allowed_rank
+
+    threshold_rule = thresholds.get("severity_thresholds", {})
+    limit_rule = threshold_rule.get(severity, {}) if isinstance(severity, str) else {}
+    threshold_limit = limit_rule.get("max_per_minute", None) if isinstance(limit_rule, dict) else None
+
+    if compliant:
+        details = COMPLIANT_DETAILS
+    else:
+        details = (
+            f"Event severity '{severity}' exceeds allowed '{allowed_severity}' "
+            f"for type '{event_type}'."
+        )
+    return RuleVerdict(compliant, rule.get("id", None), details, threshold_limit)
+
+
+class RuleIndex:
+    """
+    Rules and thresholds compiled once into read-only lookup tables.
+
+    Every configured event type maps to a per-severity table of
+    RuleVerdict objects, so evaluating an event costs two dict lookups.
+    Event types without a rule fall back to the default rule; their
+    verdicts are computed on first use and cached (bounded). Severities
+    outside SEVERITY_ORDER take the slow path and are never compliant.
+
+    Parameters
+    ----------
+    rules : Dict[str, Any]
+        Rules configuration ("event_type_rules", "default_rule").
+    thresholds : Dict[str, Any]
+        Alert thresholds configuration ("severity_thresholds").
+    """
+
+    __slots__ = ("_rules", "_thresholds", "_default_rule", "_table", "_fallback")
+
+    def __init__(self, rules: Dict[str, Any], thresholds: Dict[str, Any]) -> None:
+        self._rules = rules
+        self._thresholds = thresholds
+        self._default_rule: Dict[str, Any] = rules.get("default_rule", {})
+
+        table: Dict[Any, Mapping[str, RuleVerdict]] = {}
+        for event_type, rule in (rules.get("event_type_rules", {}) or {}).items():
+            table[event_type] = MappingProxyType(
+                {
+                    severity: _build_verdict(event_type, severity, rule, thresholds)
+                    for severity in SEVERITY_ORDER
+                }
+            )
+        self._table: Mapping[Any, Mapping[str, RuleVerdict]] = MappingProxyType(table)
+        self._fallback: Dict[Tuple[str, str], RuleVerdict] = {}
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def verdict(self, event_type: Any, severity: Any) -> RuleVerdict:
+        """
+        Return the verdict for an event type and severity.
+
+        Parameters
+        ----------
+        event_type : Any
+            Event "type" field.
+        severity : Any
+            Event "severity" field.
+
+        Returns
+        -------
+        RuleVerdict
+            Compliance outcome, rule id, details and rate limit.
+        """
+        if isinstance(event_type, str) and isinstance(severity, str):
+            per_severity = self._table.get(event_type)
+            if per_severity is not None:
+                verdict = per_severity.get(severity)
+                if verdict is not None:
+                    return verdict
+                rule = self._rules["event_type_rules"][event_type]
+                return _build_verdict(event_type, severity, rule, self._thresholds)
+
+            key = (event_type, severity)
+            verdict = self._fallback.get(key)
+            if verdict is None:
+                verdict = _build_verdict(event_type, severity, self._default_rule, self._thresholds)
+                if len(self._fallback) < MAX_FALLBACK_VERDICTS:
+                    self._fallback[key] = verdict
+            return verdict
+
+        rule = self._default_rule
+        if isinstance(event_type, Hashable):
+            rule = (self._rules.get("event_type_rules", {}) or {}).get(event_type, rule)
+        return _build_verdict(event_type, severity, rule, self._thresholds)
 
 
 def evaluate_event_against_rules(
     event: Dict[str, Any],
-    rules: Dict[str, Any],
-    thresholds: Dict[str, Any],
+    rule_index: RuleIndex,
     logger: logging.Logger,
-) -> Dict[str, Any]:
+    event_fields: Optional[Sequence[str]] = None,
+    only_noncompliant: bool = False,
+) -> Optional[Dict[str, Any]]:
     """
-    Evaluate a single event against compliance rules and thresholds.
+    Evaluate a single event against the compiled compliance rules.
 
     This function is intentionally simple and should be replaced or extended
     with your organization's domain-specific logic.
@@ -225,87 +341,63 @@ def evaluate_event_against_rules(
     ----------
     event : Dict[str, Any]
         Event payload to evaluate. Expected to contain fields like "type", "severity".
-    rules : Dict[str, Any]
-        Generic rules configuration loaded from YAML.
-    thresholds : Dict[str, Any]
-        Alert threshold rules loaded from YAML.
+    rule_index : RuleIndex
+        Rules and thresholds compiled at startup.
     logger : logging.Logger
         Logger instance for debug details.
+    event_fields : Optional[Sequence[str]]
+        Event fields to embed in the finding; None embeds the whole event
+        and an empty sequence omits it.
+    only_noncompliant : bool
+        Return None instead of a finding for compliant events.
 
     Returns
     -------
-    Dict[str, Any]
-        Finding record containing:
-        - event: original event
+    Optional[Dict[str, Any]]
+        Finding record (None if suppressed) containing:
+        - event: original (or projected) event, unless omitted
         - compliant: bool
         - severity: str
         - rule_id: str or None
         - details: str
+        - threshold_limit: max_per_minute for the severity, or None
     """
-    event_type = event.get("type", "unknown")
     event_severity = event.get("severity", "low")
+    verdict = rule_index.verdict(event.get("type", "unknown"), event_severity)
+    if only_noncompliant and verdict.compliant:
+        return None
 
-    # Resolve rule by event type; fallback to default rule.
-    type_rules = rules.get("event_type_rules", {})
-    rule = type_rules.get(event_type, rules.get("default_rule", {}))
-
-    allowed_severity = rule.get("max_allowed_severity", "medium")
-
-    severity_order = ["low", "medium", "high", "critical"]
-    try:
-        event_sev_index = severity_order.index(event_severity)
-        allowed_index = severity_order.index(allowed_severity)
-    except ValueError:
-        logger.debug(
-            "Unknown severity encountered. event_severity=%s allowed_severity=%s",
-            event_severity,
-            allowed_severity,
-        )
-        # Treat unknown severities as non-compliant.
-        event_sev_index = len(severity_order)
-        allowed_index = len(severity_order) - 1
-
-    compliant = event_sev_index <= allowed_index
-
-    # Determine if we should escalate based on thresholds.
-    threshold_rule = thresholds.get("severity_thresholds", {})
-    threshold_limit = threshold_rule.get(event_severity, {}).get("max_per_minute", None)
-
-    finding = {
-        "event": event,
-        "compliant": compliant,
+    finding: Dict[str, Any] = {
+        "compliant": verdict.compliant,
         "severity": event_severity,
-        "rule_id": rule.get("id", None),
-        "details": "",
-        "threshold_limit": threshold_limit,
+        "rule_id": verdict.rule_id,
+        "details": verdict.details,
+        "threshold_limit": verdict.threshold_limit,
     }
+    if event_fields is None:
+        finding["event"] = event
+    elif event_fields:
+        finding["event"] = {name: event[name] for name in event_fields if name in event}
 
-    if not compliant:
-        finding["details"] = (
-            f"Event severity '{event_severity}' exceeds allowed '{allowed_severity}' "
-            f"for type '{event_type}'."
-        )
-    else:
-        finding["details"] = "Event is compliant with configured rules."
-
-    logger.debug("Evaluated event. finding=%s", finding)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Evaluated event. finding=%s", finding)
     return finding
 
 
-def emit_finding(finding: Dict[str, Any], output: str, logger: logging.Logger) -> None:
+def emit_finding(finding: Dict[str, Any], sink: JsonlSink, logger: logging.Logger) -> None:
     """
     Emit a compliance finding to the configured output channel.
 
-    For simplicity, this implementation:
-    - Writes JSON to stdout or
-    - Appends JSON to a file
+    Findings are handed to a long-lived JsonlSink, which buffers and writes
+    them to stdout or a file in batches instead of reopening the file for
+    every record.
 
     Parameters
     ----------
     finding : Dict[str, Any]
         Evaluation result to emit.
-    output : str
-        Either "stdout" or a filesystem path.
+    sink : JsonlSink
+        Output sink opened once at startup.
     logger : logging.Logger
         Logger instance.
 
@@ -314,21 +406,1084 @@ def emit_finding(finding: Dict[str, Any], output: str, logger: logging.Logger) -
     SystemExit
         If writing to the file fails.
     """
-    serialized = json.dumps(finding, separators=(",", ":"), sort_keys=True)
+    try:
+        sink.write(finding)
+    except OSError as exc:
+        logger.error("Failed to write finding to %s: %s", sink.destination, exc)
+        raise SystemExit(1)
+
+
+# -----------------------------
+# Event-time rate limiting
+# -----------------------------
+
+
+# Length of the sliding window that max_per_minute applies to.
+RATE_WINDOW_SECONDS = 60
+
+# Upper bound on per-event-type rate windows, so that unexpected event type
+# cardinality cannot grow memory; further types are only counted per severity.
+MAX_EVENT_TYPE_WINDOWS = 1024
+
+_NO_FINDINGS: Sequence[Dict[str, Any]] = ()
+
+
+class EventRateWindow:
+    """
+    Event-time sliding window count backed by a ring of per-second buckets.
+
+    The ring covers ``window + lateness + 1`` seconds, so memory is fixed.
+    The newest event second seen so far is the head. Events up to
+    ``lateness`` seconds behind the head are still counted; older ones are
+    dropped (counted in ``late``). Once the head has moved more than
+    ``lateness`` seconds past a second, the window ending at that second is
+    final and is checked against ``limit``. Saturation is
+    edge-triggered: it is reported once when the count first exceeds the
+    limit and re-armed when the count falls back to the limit or below.
+
+    Adding an event is O(1); advancing the watermark is O(1) per second of
+    event time, capped at one pass over the ring for large jumps.
+
+    Parameters
+    ----------
+    limit : int
+        Maximum events allowed per window.
+    window : int
+        Window length in seconds.
+    lateness : int
+        Allowed lateness in seconds for out-of-order events.
+    """
+
+    __slots__ = ("limit", "window", "lateness", "late", "saturated", "_size", "_counts", "_head", "_total")
+
+    def __init__(self, limit: int, window: int = RATE_WINDOW_SECONDS, lateness: int = 0) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive.")
+        if lateness < 0:
+            raise ValueError("lateness must not be negative.")
+
+        self.limit = limit
+        self.window = window
+        self.lateness = lateness
+        self.late = 0
+        self.saturated = False
+        self._size = window + lateness + 1
+        self._counts = array("q", bytes(8 * self._size))
+        self._head: Optional[int] = None
+        self._total = 0
+
+    def add(self, second: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Count one event at epoch ``second``.
+
+        Parameters
+        ----------
+        second : int
+            Event time, truncated to whole seconds.
+
+        Returns
+        -------
+        Optional[List[Tuple[int, int]]]
+            (window_end_second, count) for each window that became
+            saturated as the watermark advanced, or None.
+        """
+        head = self._head
+        saturations = None
+        if head is None:
+            self._head = second
+        elif second > head:
+            saturations = self._advance(second)
+        elif second < head - self.lateness:
+            self.late += 1
+            return None
+        self._counts[second % self._size] += 1
+        return saturations
+
+    def _advance(self, new_head: int) -> Optional[List[Tuple[int, int]]]:
+        """
+        Move the head to ``new_head``, closing the windows the watermark passes.
+        """
+        counts = self._counts
+        size = self._size
+        window = self.window
+        lateness = self.lateness
+        limit = self.limit
+        total = self._total
+        saturated = self.saturated
+        saturations = None
+
+        # After ``size`` steps every bucket has been recycled and the total
+        # is zero, so longer gaps in event time need no further work.
+        last = min(new_head, self._head + size)
+        for step_head in range(self._head + 1, last + 1):
+            closing = step_head - lateness - 1
+            total += counts[closing % size] - counts[(closing - window) % size]
+            if total > limit:
+                if not saturated:
+                    saturated = True
+                    if saturations is None:
+                        saturations = []
+                    saturations.append((closing, total))
+            else:
+                saturated = False
+            counts[step_head % size] = 0
+
+        self._head = new_head
+        self._total = total
+        self.saturated = saturated
+        return saturations
+
+
+class EventRateLimiter:
+    """
+    Per-severity and per-(event type, severity) max_per_minute enforcement.
+
+    Limits come from ``severity_thresholds.<severity>.max_per_minute`` in the
+    thresholds YAML; severities without a limit are not tracked. Event time
+    is read from ``timestamp_field`` (epoch or ISO 8601) and falls back to
+    the wall clock for events without a usable timestamp.
+
+    Parameters
+    ----------
+    thresholds : Dict[str, Any]
+        Alert thresholds configuration.
+    lateness : int
+        Allowed lateness in seconds for out-of-order events.
+    timestamp_field : str
+        Event field holding the event time.
+    logger : logging.Logger
+        Logger instance.
+    """
+
+    def __init__(
+        self,
+        thresholds: Dict[str, Any],
+        lateness: int,
+        timestamp_field: str,
+        logger: logging.Logger,
+    ) -> None:
+        self.lateness = lateness
+        self.timestamp_field = timestamp_field
+        self.logger = logger
+        self.limits: Dict[str, int] = {}
+        for severity, rule in (thresholds.get("severity_thresholds") or {}).items():
+            if isinstance(rule, dict) and rule.get("max_per_minute") is not None:
+                self.limits[severity] = int(rule["max_per_minute"])
+
+        self._severity_windows = {
+            severity: EventRateWindow(limit, RATE_WINDOW_SECONDS, lateness)
+            for severity, limit in self.limits.items()
+        }
+        self._type_windows: Dict[Tuple[str, str], EventRateWindow] = {}
+        self._type_overflow = False
+        self._last_raw_time: Any = None
+        self._last_second = 0
+
+    def inherit(self, previous: "EventRateLimiter") -> None:
+        """
+        Take over the windows of a limiter built from an older configuration.
+
+        Windows of severities that are still limited keep their counts and
+        switch to the new limit; severities without a limit are dropped.
+
+        Parameters
+        ----------
+        previous : EventRateLimiter
+            Limiter being replaced.
+        """
+        for severity, window in previous._severity_windows.items():
+            if severity in self._severity_windows:
+                window.limit = self.limits[severity]
+                self._severity_windows[severity] = window
+        for (event_type, severity), window in previous._type_windows.items():
+            if severity in self.limits:
+                window.limit = self.limits[severity]
+                self._type_windows[(event_type, severity)] = window
+        self._type_overflow = previous._type_overflow
+
+    def _event_second(self, event: Dict[str, Any]) -> int:
+        """
+        Event time in whole epoch seconds; consecutive equal raw timestamps
+        are parsed once.
+        """
+        raw_time = event.get(self.timestamp_field)
+        if raw_time is not None and raw_time == self._last_raw_time:
+            return self._last_second
+        event_time = parse_event_time(raw_time)
+        if event_time is None:
+            return int(time.time())
+        second = int(math.floor(event_time))
+        self._last_raw_time = raw_time
+        self._last_second = second
+        return second
+
+    def _type_window(self, event_type: str, severity: str) -> Optional[EventRateWindow]:
+        """
+        Return (creating if allowed) the window for an event type/severity.
+        """
+        key = (event_type, severity)
+        window = self._type_windows.get(key)
+        if window is None:
+            if len(self._type_windows) >= MAX_EVENT_TYPE_WINDOWS:
+                if not self._type_overflow:
+                    self._type_overflow = True
+                    self.logger.warning(
+                        "More than %d event type/severity rate windows; further "
+                        "event types are only rate-limited per severity.",
+                        MAX_EVENT_TYPE_WINDOWS,
+                    )
+                return None
+            window = EventRateWindow(self.limits[severity], RATE_WINDOW_SECONDS, self.lateness)
+            self._type_windows[key] = window
+        return window
+
+    def observe(self, event: Dict[str, Any]) -> Sequence[Dict[str, Any]]:
+        """
+        Count an event and return any saturation findings it triggers.
+
+        Parameters
+        ----------
+        event : Dict[str, Any]
+            Event payload; "severity" and "type" select the windows.
+
+        Returns
+        -------
+        Sequence[Dict[str, Any]]
+            Saturation findings (usually empty).
+        """
+        severity = event.get("severity", "low")
+        severity_window = self._severity_windows.get(severity) if isinstance(severity, str) else None
+        if severity_window is None:
+            return _NO_FINDINGS
+
+        second = self._event_second(event)
+        findings: List[Dict[str, Any]] = []
+        saturations = severity_window.add(second)
+        if saturations:
+            for window_end, count in saturations:
+                findings.append(self._saturation_finding(severity, None, window_end, count))
+
+        event_type = event.get("type", "unknown")
+        if not isinstance(event_type, str):
+            event_type = str(event_type)
+        type_window = self._type_window(event_type, severity)
+        if type_window is not None:
+            saturations = type_window.add(second)
+            if saturations:
+                for window_end, count in saturations:
+                    findings.append(self._saturation_finding(severity, event_type, window_end, count))
+
+        return findings or _NO_FINDINGS
+
+    def _saturation_finding(
+        self,
+        severity: str,
+        event_type: Optional[str],
+        window_end: int,
+        count: int,
+    ) -> Dict[str, Any]:
+        """
+        Build the finding emitted when a window exceeds max_per_minute.
+        """
+        limit = self.limits[severity]
+        window_start = window_end - RATE_WINDOW_SECONDS + 1
+        scope = f"'{severity}' events" if event_type is None else f"'{severity}' events of type '{event_type}'"
+        return {
+            "finding_type": "rate_saturation",
+            "compliant": False,
+            "severity": severity,
+            "event_type": event_type,
+            "rule_id": None,
+            "event_count": count,
+            "threshold_limit": limit,
+            "window_start": _format_epoch(window_start),
+            "window_end": _format_epoch(window_end + 1),
+            "details": (
+                f"{count} {scope} in {RATE_WINDOW_SECONDS}s exceed max_per_minute {limit}."
+            ),
+        }
+
+    @property
+    def late_events(self) -> int:
+        """
+        Events dropped from rate counting for arriving after the lateness bound.
+        """
+        return sum(window.late for window in self._severity_windows.values())
+
+
+def _format_epoch(second: int) -> str:
+    """
+    Format epoch seconds as an ISO 8601 UTC timestamp.
+    """
+    return datetime.fromtimestamp(second, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+# -----------------------------
+# Correlation rules
+# -----------------------------
+
+
+CORRELATION_TYPES = ("threshold", "sequence", "absence")
+
+# Default number of time buckets a correlation window is divided into.
+CORRELATION_BUCKETS = 12
+
+# Upper bound on tracked keys per correlation rule; the least recently
+# updated keys are evicted first, so memory stays bounded.
+MAX_CORRELATION_KEYS = 100_000
+
 
-    if output == "stdout":
-        print(serialized)
-        return
+class EventMatcher:
+    """
+    Conjunction of field conditions compiled from a ``match`` mapping.
+
+    Each field maps to one value or a list of accepted values. The
+    ``type`` condition is kept apart so rules can be indexed by event type.
+
+    Parameters
+    ----------
+    spec : Mapping[str, Any]
+        Field conditions, e.g. ``{"type": "auth_failure", "outcome": ["deny", "error"]}``.
+    """
+
+    __slots__ = ("types", "conditions")
+
+    def __init__(self, spec: Mapping[str, Any]) -> None:
+        if not isinstance(spec, Mapping) or not spec:
+            raise ValueError("match must be a non-empty mapping of field conditions.")
 
-    # Treat output as file path
-    output_path = Path(output)
+        def accepted(value: Any) -> frozenset:
+            values = value if isinstance(value, list) else [value]
+            try:
+                return frozenset(values)
+            except TypeError:
+                raise ValueError(f"match values must be scalars or lists of scalars, got {value!r}.")
+
+        self.types: Optional[frozenset] = accepted(spec["type"]) if "type" in spec else None
+        self.conditions: Tuple[Tuple[str, frozenset], ...] = tuple(
+            (str(field), accepted(value)) for field, value in spec.items() if field != "type"
+        )
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        """
+        Check the non-type conditions (the type is matched by the index).
+        """
+        for field, accepted in self.conditions:
+            try:
+                if event.get(field) not in accepted:
+                    return False
+            except TypeError:  # unhashable field value
+                return False
+        return True
+
+
+class _SequenceState:
+    """
+    Per-key state of a threshold/sequence rule.
+
+    ``counts`` is a ring of time buckets counting first-step matches in
+    the window ending at bucket ``head``; ``total`` is their sum. Later
+    steps are tracked by ``stage`` and ``stage_count``.
+    """
+
+    __slots__ = ("counts", "head", "total", "stage", "stage_count", "matched", "deadline", "last_seen")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = array("q", bytes(8 * buckets))
+        self.head = -(1 << 62)
+        self.total = 0
+        self.stage = 0
+        self.stage_count = 0
+        self.matched = 0
+        self.deadline = 0.0
+        self.last_seen = 0.0
+
+    def advance(self, bucket: int) -> None:
+        """
+        Move the window end to ``bucket``, clearing buckets that left it.
+        """
+        head = self.head
+        if bucket <= head:
+            return
+        counts = self.counts
+        buckets = len(counts)
+        if bucket - head >= buckets:
+            for slot in range(buckets):
+                counts[slot] = 0
+            self.total = 0
+        else:
+            total = self.total
+            for passed in range(head + 1, bucket + 1):
+                slot = passed % buckets
+                total -= counts[slot]
+                counts[slot] = 0
+            self.total = total
+        self.head = bucket
+
+    def add(self, bucket: int) -> int:
+        """
+        Count one match in ``bucket`` and return the window count (-1 if
+        the bucket has already left the window).
+        """
+        self.advance(bucket)
+        counts = self.counts
+        if bucket <= self.head - len(counts):
+            return -1
+        counts[bucket % len(counts)] += 1
+        self.total += 1
+        return self.total
+
+    def oldest_bucket(self) -> int:
+        """
+        Oldest bucket in the window holding matches.
+        """
+        counts = self.counts
+        buckets = len(counts)
+        for bucket in range(self.head - buckets + 1, self.head):
+            if counts[bucket % buckets]:
+                return bucket
+        return self.head
+
+    def reset(self) -> None:
+        for slot in range(len(self.counts)):
+            self.counts[slot] = 0
+        self.total = 0
+        self.stage = 0
+        self.stage_count = 0
+        self.matched = 0
+
+
+class _AbsenceState:
+    """
+    Per-key state of an absence rule: the last expected event, and a ring
+    of time buckets counting unresolved triggers in the buckets ending at
+    ``head``; ``pending`` is their sum.
+    """
+
+    __slots__ = ("last_expect", "counts", "head", "pending", "last_seen")
+
+    def __init__(self, slots: int) -> None:
+        self.last_expect = -math.inf
+        self.counts = array("q", bytes(8 * slots))
+        self.head = -(1 << 62)
+        self.pending = 0
+        self.last_seen = 0.0
+
+
+class CorrelationRule:
+    """
+    One compiled correlation rule with its keyed state table.
+
+    ``threshold`` and ``sequence`` rules advance a per-key state machine:
+    the first step counts matches in a sliding window of ``buckets`` time
+    buckets covering ``within`` seconds; once its count is reached, the
+    following steps must match in order before the window that started
+    with the oldest counted match ends. ``absence`` rules fire when a
+    ``match`` event has no ``expect`` event for the same key within
+    ``within`` seconds before or after it. Unresolved triggers are counted
+    per time bucket (a ring covering twice ``within``); an ``expect`` event
+    clears the buckets its window overlaps, and once event time passes a
+    bucket's deadline, the key's expired buckets are reported as one
+    finding.
+
+    Keys idle for longer than the window are expired as event time
+    advances, and at most MAX_CORRELATION_KEYS keys are kept (least
+    recently updated first out), so memory per rule is bounded.
+
+    Parameters
+    ----------
+    spec : Mapping[str, Any]
+        Rule configuration (see CorrelationEngine).
+    logger : logging.Logger
+        Logger instance.
+    """
+
+    def __init__(self, spec: Mapping[str, Any], logger: logging.Logger) -> None:
+        if not isinstance(spec, Mapping):
+            raise ValueError("each correlation rule must be a mapping.")
+        self.spec = spec
+        self.rule_id = spec.get("id")
+        if not self.rule_id:
+            raise ValueError("correlation rules need an 'id'.")
+        self.kind = spec.get("type", "threshold")
+        if self.kind not in CORRELATION_TYPES:
+            raise ValueError(f"rule {self.rule_id}: unsupported type {self.kind!r}.")
+        self.severity = spec.get("severity", "high")
+        if self.severity not in SEVERITY_RANKS:
+            raise ValueError(f"rule {self.rule_id}: unknown severity {self.severity!r}.")
+        self.description = spec.get("description")
+        self.logger = logger
+
+        key = spec.get("key") or []
+        self.key_fields: Tuple[str, ...] = (key,) if isinstance(key, str) else tuple(key)
+        try:
+            self.within = float(spec["within"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"rule {self.rule_id}: 'within' (seconds) is required.")
+        if self.within <= 0:
+            raise ValueError(f"rule {self.rule_id}: 'within' must be positive.")
+        self.buckets = int(spec.get("buckets", CORRELATION_BUCKETS))
+        if self.buckets < 1:
+            raise ValueError(f"rule {self.rule_id}: 'buckets' must be at least 1.")
+        self.width = self.within / self.buckets
+
+        # (matcher, count) per step; absence rules use steps[0] as the
+        # trigger and steps[1] as the expected event.
+        if self.kind == "threshold":
+            steps = [{"match": spec.get("match"), "count": spec.get("count", 1)}]
+        elif self.kind == "sequence":
+            steps = spec.get("steps") or []
+            if len(steps) < 2:
+                raise ValueError(f"rule {self.rule_id}: a sequence needs at least two steps.")
+        else:
+            steps = [{"match": spec.get("match")}, {"match": spec.get("expect")}]
+        try:
+            self.steps: Tuple[Tuple[EventMatcher, int], ...] = tuple(
+                (EventMatcher(step.get("match")), int(step.get("count", 1))) for step in steps
+            )
+        except (AttributeError, TypeError, ValueError) as exc:
+            raise ValueError(f"rule {self.rule_id}: {exc}")
+        if any(count < 1 for _, count in self.steps):
+            raise ValueError(f"rule {self.rule_id}: step counts must be at least 1.")
+
+        self.states: "OrderedDict[Any, Any]" = OrderedDict()
+        self.evicted = 0
+        self.fired = 0
+        self._deadlines: List[Tuple[float, int, Any, int]] = []
+        self._deadline_seq = 0
+
+    def inherit(self, previous: "CorrelationRule") -> None:
+        """
+        Take over the keyed state of an identical rule from an older configuration.
+        """
+        self.states = previous.states
+        self.evicted = previous.evicted
+        self.fired = previous.fired
+        self._deadlines = previous._deadlines
+        self._deadline_seq = previous._deadline_seq
+
+    def key_of(self, event: Dict[str, Any]) -> Any:
+        """
+        Correlation key of an event, or None if a key field is missing.
+        """
+        if len(self.key_fields) == 1:
+            value = event.get(self.key_fields[0])
+            return value if value is not None and isinstance(value, Hashable) else None
+        values = tuple(event.get(field) for field in self.key_fields)
+        if None in values or not all(isinstance(value, Hashable) for value in values):
+            return None
+        return values
+
+    def _state(self, key: Any, event_time: float) -> Any:
+        states = self.states
+        state = states.get(key)
+        if state is None:
+            if len(states) >= MAX_CORRELATION_KEYS:
+                states.popitem(last=False)
+                self.evicted += 1
+                if self.evicted == 1:
+                    self.logger.warning(
+                        "Correlation rule %s tracks more than %d keys; evicting the least recently updated.",
+                        self.rule_id,
+                        MAX_CORRELATION_KEYS,
+                    )
+            if self.kind == "absence":
+                state = _AbsenceState(2 * self.buckets)
+            else:
+                state = _SequenceState(self.buckets)
+            states[key] = state
+        else:
+            states.move_to_end(key)
+        if event_time > state.last_seen:
+            state.last_seen = event_time
+        return state
+
+    def observe(self, step: int, key: Any, event_time: float, findings: List[Dict[str, Any]]) -> None:
+        """
+        Apply an event that matched ``steps[step]`` for ``key``.
+        """
+        state = self._state(key, event_time)
+        if self.kind == "absence":
+            self._observe_absence(state, step, key, event_time, findings)
+            return
+
+        bucket = int(event_time // self.width)
+        if step == 0:
+            count = state.add(bucket)
+            if state.stage == 0 and count >= self.steps[0][1]:
+                self._arm(state, bucket, count, key, event_time, findings)
+            return
+
+        if state.stage != step:
+            return
+        if event_time > state.deadline:
+            # The armed window ran out; newer first-step matches may still qualify.
+            state.advance(bucket)
+            count = state.total
+            state.stage = 0
+            if count < self.steps[0][1]:
+                return
+            self._arm(state, bucket, count, key, event_time, findings)
+            if state.stage != step:
+                return
+        state.stage_count += 1
+        state.matched += 1
+        if state.stage_count >= self.steps[step][1]:
+            state.stage += 1
+            state.stage_count = 0
+            if state.stage == len(self.steps):
+                start = state.oldest_bucket() * self.width
+                findings.append(self._finding(key, state.matched, start, event_time))
+                state.reset()
+
+    def _arm(
+        self,
+        state: _SequenceState,
+        bucket: int,
+        count: int,
+        key: Any,
+        event_time: float,
+        findings: List[Dict[str, Any]],
+    ) -> None:
+        """
+        The first step reached its count: fire (threshold) or await step 2.
+        """
+        start = state.oldest_bucket() * self.width
+        if len(self.steps) == 1:
+            findings.append(self._finding(key, count, start, event_time))
+            state.reset()
+            return
+        state.stage = 1
+        state.stage_count = 0
+        state.matched = count
+        state.deadline = start + self.within
+
+    def _observe_absence(
+        self,
+        state: _AbsenceState,
+        step: int,
+        key: Any,
+        event_time: float,
+        findings: List[Dict[str, Any]],
+    ) -> None:
+        counts = state.counts
+        slots = len(counts)
+        if step == 1:
+            if event_time > state.last_expect:
+                state.last_expect = event_time
+            if state.pending:
+                # Resolve every bucket the expected event's window overlaps.
+                first = max(int((event_time - self.within) // self.width), state.head - slots + 1)
+                last = min(int((event_time + self.within) // self.width), state.head)
+                for bucket in range(first, last + 1):
+                    slot = bucket % slots
+                    state.pending -= counts[slot]
+                    counts[slot] = 0
+            return
+        if state.last_expect >= event_time - self.within:
+            return
+
+        bucket = int(event_time // self.width)
+        if not state.pending:
+            state.head = bucket
+        elif bucket > state.head:
+            # Buckets leaving the ring are decided now; with lateness below
+            # ``within`` their deadlines have already passed.
+            self._decide_absence(state, key, bucket - slots, findings)
+            state.head = bucket
+        elif bucket <= state.head - slots:
+            # A trigger older than the ring is decided at once.
+            findings.append(self._finding(key, 1, event_time, event_time))
+            return
+        slot = bucket % slots
+        if not counts[slot]:
+            self._deadline_seq += 1
+            deadline = (bucket + 1) * self.width + self.within
+            heapq.heappush(self._deadlines, (deadline, self._deadline_seq, key, bucket))
+        counts[slot] += 1
+        state.pending += 1
+
+    def _decide_absence(
+        self,
+        state: _AbsenceState,
+        key: Any,
+        last_bucket: int,
+        findings: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Report the unresolved triggers in buckets up to ``last_bucket`` as one finding.
+        """
+        counts = state.counts
+        slots = len(counts)
+        count = 0
+        first = last = 0
+        for bucket in range(state.head - slots + 1, min(last_bucket, state.head) + 1):
+            slot = bucket % slots
+            if counts[slot]:
+                if not count:
+                    first = bucket
+                last = bucket
+                count += counts[slot]
+                counts[slot] = 0
+        if count:
+            state.pending -= count
+            findings.append(self._finding(key, count, first * self.width, (last + 1) * self.width))
+
+    def expire(self, watermark: float, findings: List[Dict[str, Any]]) -> None:
+        """
+        Fire absence deadlines before ``watermark`` and drop idle keys.
+        """
+        deadlines = self._deadlines
+        # Buckets up to this one have deadlines before the watermark.
+        last_bucket = math.ceil((watermark - self.within) / self.width) - 2
+        while deadlines and deadlines[0][0] < watermark:
+            _, _, key, _bucket = heapq.heappop(deadlines)
+            state = self.states.get(key)
+            # Entries of buckets resolved or reported since are stale.
+            if state is not None and state.pending:
+                self._decide_absence(state, key, last_bucket, findings)
+
+        cutoff = watermark - self.within - self.width
+        states = self.states
+        while states:
+            key, state = next(iter(states.items()))
+            if state.last_seen >= cutoff or getattr(state, "pending", 0):
+                break
+            del states[key]
+
+    def _finding(self, key: Any, count: int, window_start: float, window_end: float) -> Dict[str, Any]:
+        """
+        Build the finding emitted when the rule fires.
+        """
+        self.fired += 1
+        values = key if len(self.key_fields) > 1 else (key,)
+        key_map = dict(zip(self.key_fields, values))
+        if self.description:
+            details = f"{self.description} ({', '.join(f'{k}={v}' for k, v in key_map.items()) or 'all events'})"
+        elif self.kind == "absence":
+            details = f"{count} triggering events without an expected event within {self.within:g}s."
+        else:
+            details = f"{count} correlated events matched {len(self.steps)} step(s) within {self.within:g}s."
+        return {
+            "finding_type": "correlation",
+            "compliant": False,
+            "severity": self.severity,
+            "rule_id": self.rule_id,
+            "correlation_type": self.kind,
+            "key": key_map,
+            "event_count": count,
+            "window_start": _format_epoch(window_start),
+            "window_end": _format_epoch(window_end),
+            "details": details,
+        }
+
+
+class CorrelationEngine:
+    """
+    Stateful correlation rules evaluated over the event stream.
+
+    Rules come from ``correlation_rules`` in the rules YAML::
+
+        correlation_rules:
+          - id: "CORR-BRUTE-FORCE"
+            type: sequence            # threshold | sequence | absence
+            key: ["principal"]        # fields that partition the state
+            within: 300               # window in seconds
+            severity: high
+            steps:
+              - match: {type: auth_failure}
+                count: 5
+              - match: {type: auth_success}
+          - id: "CORR-PRIV-NO-TICKET"
+            type: absence
+            key: ["principal"]
+            within: 3600
+            match: {type: privilege_change}
+            expect: {type: change_ticket}
+
+    ``threshold`` rules take ``match`` and ``count`` directly; ``buckets``
+    (default CORRELATION_BUCKETS) sets the window resolution. Event time is
+    read from ``timestamp_field`` (falling back to the wall clock), and
+    state expires once the newest event time minus ``lateness`` moves past
+    it. Rules are indexed by their ``type`` conditions, so an event is only
+    checked against rules that can match it.
+
+    Parameters
+    ----------
+    rules : Dict[str, Any]
+        Rules configuration.
+    lateness : int
+        Allowed lateness in seconds for out-of-order events.
+    timestamp_field : str
+        Event field holding the event time.
+    logger : logging.Logger
+        Logger instance.
+
+    Raises
+    ------
+    ValueError
+        If a correlation rule is invalid.
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, Any],
+        lateness: int,
+        timestamp_field: str,
+        logger: logging.Logger,
+    ) -> None:
+        self.lateness = lateness
+        self.timestamp_field = timestamp_field
+        specs = rules.get("correlation_rules") or []
+        if not isinstance(specs, list):
+            raise ValueError("correlation_rules must be a list.")
+        self.rules = [CorrelationRule(spec, logger) for spec in specs]
+
+        by_type: Dict[Any, List[Tuple[CorrelationRule, int, EventMatcher]]] = {}
+        untyped: List[Tuple[CorrelationRule, int, EventMatcher]] = []
+        for rule in self.rules:
+            for step, (matcher, _) in enumerate(rule.steps):
+                entry = (rule, step, matcher)
+                if matcher.types is None:
+                    untyped.append(entry)
+                else:
+                    for event_type in matcher.types:
+                        by_type.setdefault(event_type, []).append(entry)
+        self._by_type = MappingProxyType({k: tuple(v) for k, v in by_type.items()})
+        self._untyped = tuple(untyped)
+
+        self._watermark = -math.inf
+        self._next_expiry = -math.inf
+        self._last_raw_time: Any = None
+        self._last_time = 0.0
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def inherit(self, previous: "CorrelationEngine") -> int:
+        """
+        Keep the state of rules whose id and definition are unchanged.
+
+        Parameters
+        ----------
+        previous : CorrelationEngine
+            Engine built from the older configuration.
+
+        Returns
+        -------
+        int
+            Number of rules whose state was carried over.
+        """
+        old_rules = {rule.rule_id: rule for rule in previous.rules}
+        carried = 0
+        for rule in self.rules:
+            old = old_rules.get(rule.rule_id)
+            if old is not None and old.spec == rule.spec:
+                rule.inherit(old)
+                carried += 1
+        self._watermark = previous._watermark
+        self._next_expiry = previous._next_expiry
+        return carried
+
+    def _event_time(self, event: Dict[str, Any]) -> float:
+        raw_time = event.get(self.timestamp_field)
+        if raw_time is not None and raw_time == self._last_raw_time:
+            return self._last_time
+        event_time = parse_event_time(raw_time)
+        if event_time is None:
+            return time.time()
+        self._last_raw_time = raw_time
+        self._last_time = event_time
+        return event_time
+
+    def observe(self, event: Dict[str, Any]) -> Sequence[Dict[str, Any]]:
+        """
+        Apply an event to every rule step it matches.
+
+        Parameters
+        ----------
+        event : Dict[str, Any]
+            Event payload.
+
+        Returns
+        -------
+        Sequence[Dict[str, Any]]
+            Correlation findings (usually empty).
+        """
+        event_type = event.get("type")
+        try:
+            typed = self._by_type.get(event_type, ())
+        except TypeError:
+            typed = ()
+        event_time = self._event_time(event)
+        findings: List[Dict[str, Any]] = []
+
+        for candidates in (typed, self._untyped):
+            for rule, step, matcher in candidates:
+                if matcher.conditions and not matcher.matches(event):
+                    continue
+                key = rule.key_of(event) if rule.key_fields else ()
+                if key is None:
+                    continue
+                rule.observe(step, key, event_time, findings)
+
+        watermark = event_time - self.lateness
+        if watermark > self._watermark:
+            self._watermark = watermark
+            # Expiry passes run at most once per second of event time.
+            if watermark >= self._next_expiry:
+                self._next_expiry = watermark + 1.0
+                for rule in self.rules:
+                    rule.expire(watermark, findings)
+
+        return findings or _NO_FINDINGS
+
+    @property
+    def active_keys(self) -> int:
+        """
+        Keys currently holding correlation state across all rules.
+        """
+        return sum(len(rule.states) for rule in self.rules)
+
+
+# -----------------------------
+# Configuration snapshots
+# -----------------------------
+
+
+class MonitorConfig(NamedTuple):
+    """
+    Immutable snapshot of everything compiled from the configuration files.
+
+    The monitor holds one snapshot at a time and replaces it as a whole on
+    reload, so every event is evaluated against a single consistent
+    configuration.
+    """
+
+    generation: int
+    rule_index: RuleIndex
+    rate_limiter: EventRateLimiter
+    correlation: CorrelationEngine
+
+
+def compile_monitor_config(
+    rules_config: Dict[str, Any],
+    thresholds_config: Dict[str, Any],
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    previous: Optional[MonitorConfig] = None,
+) -> MonitorConfig:
+    """
+    Compile rules and thresholds into a MonitorConfig.
+
+    With ``previous``, rate windows and the state of unchanged correlation
+    rules are carried over, so a reload does not reset counts.
+
+    Parameters
+    ----------
+    rules_config : Dict[str, Any]
+        Rules configuration.
+    thresholds_config : Dict[str, Any]
+        Alert thresholds configuration.
+    args : argparse.Namespace
+        Parsed arguments (lateness and timestamp field).
+    logger : logging.Logger
+        Logger instance.
+    previous : Optional[MonitorConfig]
+        Snapshot being replaced, if any.
+
+    Returns
+    -------
+    MonitorConfig
+        New snapshot; ``previous`` is left untouched if compilation fails.
+
+    Raises
+    ------
+    ConfigError
+        If the configuration is invalid.
+    """
     try:
-        with output_path.open("a", encoding="utf-8") as f:
-            f.write(serialized + "\n")
-        logger.debug("Appended finding to %s", output_path)
-    except Exception as exc:
-        logger.error("Failed to write finding to file: %s", exc)
-        raise SystemExit(1)
+        rule_index = RuleIndex(rules_config, thresholds_config)
+        rate_limiter = EventRateLimiter(
+            thresholds_config, args.allowed_lateness, args.timestamp_field, logger
+        )
+        correlation = CorrelationEngine(
+            rules_config, args.allowed_lateness, args.timestamp_field, logger
+        )
+    except (AttributeError, KeyError, TypeError, ValueError) as exc:
+        raise ConfigError(f"invalid rules or thresholds: {exc}") from exc
+
+    generation = 1
+    if previous is not None:
+        generation = previous.generation + 1
+        rate_limiter.inherit(previous.rate_limiter)
+        carried = correlation.inherit(previous.correlation)
+        logger.info(
+            "Carried over state of %d of %d correlation rules.", carried, len(correlation)
+        )
+    return MonitorConfig(generation, rule_index, rate_limiter, correlation)
+
+
+def reload_monitor_config(
+    current: MonitorConfig,
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    metrics: ReloadMetrics,
+    requested_at: float,
+) -> MonitorConfig:
+    """
+    Re-read both configuration files and return the snapshot to use next.
+
+    An unreadable or invalid configuration is rejected with an error log
+    and ``current`` stays active.
+
+    Parameters
+    ----------
+    current : MonitorConfig
+        Active snapshot.
+    args : argparse.Namespace
+        Parsed arguments (configuration paths).
+    logger : logging.Logger
+        Logger instance.
+    metrics : ReloadMetrics
+        Reload metrics to update.
+    requested_at : float
+        time.monotonic() of the reload trigger.
+
+    Returns
+    -------
+    MonitorConfig
+        The new snapshot, or ``current`` if the reload was rejected.
+    """
+    try:
+        snapshot = compile_monitor_config(
+            read_yaml_mapping(args.config),
+            read_yaml_mapping(args.thresholds),
+            args,
+            logger,
+            previous=current,
+        )
+    except ConfigError as exc:
+        latency = time.monotonic() - requested_at
+        metrics.record(False, latency)
+        logger.error(
+            "Rejected configuration reload; generation %d stays active: %s",
+            current.generation,
+            exc,
+        )
+        return current
+
+    latency = time.monotonic() - requested_at
+    metrics.record(True, latency)
+    logger.info(
+        "Reloaded configuration generation %d in %.3fs: %d event types, %d correlation rules, rate limits %s.",
+        snapshot.generation,
+        latency,
+        len(snapshot.rule_index),
+        len(snapshot.correlation),
+        snapshot.rate_limiter.limits or "-",
+    )
+    return snapshot
 
 
 # -----------------------------
@@ -372,27 +1527,175 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
         "--source-type",
         choices=["file"],
         default="file",
-        help="Event source type. Currently supports: file.",
+        help="Type of --source-path. Currently supports: file.",
     )
 
     parser.add_argument(
         "--source-path",
         type=Path,
-        required=True,
+        default=None,
         help="Path to event source (e.g., log file) when source-type=file.",
     )
 
+    parser.add_argument(
+        "--source",
+        action="append",
+        type=parse_source_spec,
+        default=None,
+        metavar="SPEC",
+        help=(
+            "Event source, repeatable and read concurrently: file:PATH (globs "
+            "expanded at startup), stdin, unix:PATH, tcp:[HOST:]PORT (listening "
+            "sockets for JSON lines) or an http(s):// long-poll URL."
+        ),
+    )
+
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_BATCHES,
+        help=(
+            "Capacity of the ingestion queue in batches of up to 1024 events; "
+            "sources wait while it is full."
+        ),
+    )
+
+    parser.add_argument(
+        "--http-timeout",
+        type=float,
+        default=60.0,
+        help="Timeout in seconds for one HTTP long-poll request.",
+    )
+
+    parser.add_argument(
+        "--json-decoder",
+        choices=DECODER_CHOICES,
+        default="auto",
+        help="JSON decoder backend; auto prefers orjson, then msgspec, then stdlib json.",
+    )
+
     parser.add_argument(
         "--output",
         default="stdout",
         help="Output channel: 'stdout' or a file path for JSON findings.",
     )
 
+    parser.add_argument(
+        "--only-noncompliant",
+        action="store_true",
+        help="Emit findings only for non-compliant events (and rate saturation).",
+    )
+
+    parser.add_argument(
+        "--event-fields",
+        type=lambda value: [f.strip() for f in value.split(",") if f.strip()],
+        default=None,
+        help=(
+            "Comma-separated event fields to embed in findings (default: the "
+            "whole event; an empty string omits the event)."
+        ),
+    )
+
+    parser.add_argument(
+        "--timestamp-field",
+        default="timestamp",
+        help="Event field holding the event time (epoch or ISO 8601) used for rate limits.",
+    )
+
+    parser.add_argument(
+        "--allowed-lateness",
+        type=int,
+        default=5,
+        help=(
+            "Seconds an out-of-order event may lag the newest event time and "
+            "still count towards max_per_minute rate limits."
+        ),
+    )
+
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=1.0,
+        help=(
+            "Seconds between checks of --config/--thresholds for changes to "
+            "hot-reload (0 disables file watching; SIGHUP always reloads)."
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=None,
+        help="Write configuration reload metrics here (Prometheus textfile format).",
+    )
+
     parser.add_argument(
         "--poll-interval",
         type=float,
         default=1.0,
-        help="Polling interval in seconds for supported sources.",
+        help=(
+            "Polling interval in seconds when inotify is unavailable; also the "
+            "longest wait between rotation checks with inotify."
+        ),
+    )
+
+    parser.add_argument(
+        "--tail-backend",
+        choices=TAIL_BACKENDS,
+        default="auto",
+        help="Change notification for file sources; auto uses inotify on Linux, else polling.",
+    )
+
+    parser.add_argument(
+        "--start-position",
+        choices=START_POSITIONS,
+        default="end",
+        help="Where to start reading a file source when no offset checkpoint applies.",
+    )
+
+    parser.add_argument(
+        "--offset-file",
+        type=Path,
+        default=None,
+        help=(
+            "Checkpoint the processed byte offset and inode of the file source "
+            "here; a restart resumes right after the last processed event."
+        ),
+    )
+
+    parser.add_argument(
+        "--offset-dir",
+        type=Path,
+        default=None,
+        help="Directory for per-file offset checkpoints when tailing several files.",
+    )
+
+    parser.add_argument(
+        "--flush-records",
+        type=int,
+        default=1000,
+        help="Flush buffered findings after this many records.",
+    )
+
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=1.0,
+        help="Flush buffered findings at least this often, in seconds (0 disables).",
+    )
+
+    parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default="never",
+        help="fsync policy for file output: never, after every batch, or on close.",
+    )
+
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSION_CHOICES,
+        default="none",
+        help="Compression for file output (zstd requires the zstandard package).",
     )
 
     parser.add_argument(
@@ -422,27 +1725,145 @@ def main() -> None:
     rules_config = load_yaml_config(args.config, logger)
     thresholds_config = load_yaml_config(args.thresholds, logger)
 
-    event_stream = get_event_stream(args.source_type, args.source_path, logger)
+    try:
+        decoder = select_decoder(args.json_decoder)
+    except ValueError as exc:
+        logger.error("%s", exc)
+        raise SystemExit(1)
+    logger.info("Using JSON decoder: %s", decoder.name)
+
+    if args.allowed_lateness < 0:
+        logger.error("--allowed-lateness must not be negative.")
+        raise SystemExit(1)
+
+    try:
+        config = compile_monitor_config(rules_config, thresholds_config, args, logger)
+    except ConfigError as exc:
+        logger.error("%s", exc)
+        raise SystemExit(1)
+    logger.info("Compiled rules for %d event types.", len(config.rule_index))
+    logger.info(
+        "Rate limits (max_per_minute): %s; allowed lateness %ss.",
+        config.rate_limiter.limits or "-",
+        args.allowed_lateness,
+    )
+    logger.info("Compiled %d correlation rules.", len(config.correlation))
+
+    if args.reload_interval < 0:
+        logger.error("--reload-interval must not be negative.")
+        raise SystemExit(1)
+    reload_metrics = ReloadMetrics("compliance_monitor", args.metrics_file, logger)
+    reload_metrics.write()
+    reload_trigger = ReloadTrigger([args.config, args.thresholds], logger, args.reload_interval)
+
+    if args.poll_interval <= 0:
+        logger.error("--poll-interval must be positive.")
+        raise SystemExit(1)
+    if args.queue_size < 1:
+        logger.error("--queue-size must be at least 1.")
+        raise SystemExit(1)
 
-    # The poll interval is used in the file reader internals in this version.
-    # It remains a parameter here to avoid breaking compatibility if additional
-    # source types are implemented.
-    _ = args.poll_interval
+    sources = resolve_sources(args, logger)
+    logger.info("Event sources: %s", ", ".join(str(spec) for spec in sources))
 
     try:
-        for event in event_stream:
+        sink = JsonlSink(
+            args.output,
+            logger,
+            append=True,
+            flush_records=args.flush_records,
+            flush_interval=args.flush_interval,
+            fsync=args.fsync,
+            compression=args.compression,
+        )
+    except (OSError, ValueError) as exc:
+        logger.error("Failed to initialize output sink: %s", exc)
+        raise SystemExit(1)
+
+    def apply_reload() -> None:
+        nonlocal config
+        requested_at = reload_trigger.poll()
+        if requested_at is not None:
+            logger.info("Reloading configuration (%s).", reload_trigger.reason)
+            config = reload_monitor_config(config, args, logger, reload_metrics, requested_at)
+
+    def process_events(events: List[Any]) -> None:
+        # Batches are the swap points: a reload never splits the evaluation
+        # of one event across two configurations.
+        apply_reload()
+        rule_index = config.rule_index
+        observe_rate = config.rate_limiter.observe
+        correlate = config.correlation.observe if len(config.correlation) else None
+        for event in events:
             finding = evaluate_event_against_rules(
                 event=event,
-                rules=rules_config,
-                thresholds=thresholds_config,
+                rule_index=rule_index,
                 logger=logger,
+                event_fields=args.event_fields,
+                only_noncompliant=args.only_noncompliant,
             )
-            emit_finding(finding, args.output, logger)
+            if finding is not None:
+                emit_finding(finding, sink, logger)
+            for saturation in observe_rate(event):
+                logger.warning("Rate saturation: %s", saturation["details"])
+                emit_finding(saturation, sink, logger)
+            if correlate is not None:
+                for correlated in correlate(event):
+                    logger.warning("Correlation %s: %s", correlated["rule_id"], correlated["details"])
+                    emit_finding(correlated, sink, logger)
+
+    ingestor: Optional[EventIngestor] = None
+    stopped_by: Optional[int] = None
+    try:
+        ingestor = EventIngestor(
+            sources,
+            decoder,
+            logger,
+            queue_size=args.queue_size,
+            poll_interval=args.poll_interval,
+            start_at=args.start_position,
+            backend=args.tail_backend,
+            offset_file=args.offset_file,
+            offset_dir=args.offset_dir,
+            http_timeout=args.http_timeout,
+            before_checkpoint=sink.flush,
+        )
+        stopped_by = asyncio.run(ingestor.run(process_events, housekeeping=apply_reload))
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, shutting down.")
     except Exception as exc:
         logger.exception("Fatal error in monitoring loop: %s", exc)
         raise SystemExit(1)
+    finally:
+        if config.rate_limiter.late_events:
+            logger.info(
+                "Dropped %d late events from rate counting.",
+                config.rate_limiter.late_events,
+            )
+        for rule in config.correlation.rules:
+            logger.info(
+                "Correlation rule %s fired %d times; %d active keys, %d evicted.",
+                rule.rule_id,
+                rule.fired,
+                len(rule.states),
+                rule.evicted,
+            )
+        try:
+            if ingestor is not None:
+                for source, count in ingestor.counts.items():
+                    logger.info("Processed %d events from %s.", count, source)
+                for source, count in ingestor.malformed.items():
+                    logger.warning("Skipped %d malformed lines from %s.", count, source)
+                # Final offset checkpoints flush the sink first; the sink
+                # is closed afterwards.
+                ingestor.close()
+            sink.close()
+        except OSError as exc:
+            logger.error("Failed to flush findings: %s", exc)
+            raise SystemExit(1)
+
+    if stopped_by is not None:
+        raise SystemExit(128 + stopped_by)
 
 
 if __name__ == "__main__":
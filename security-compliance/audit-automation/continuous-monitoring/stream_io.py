@@ -0,0 +1,495 @@
+"""
+stream_io.py
+
+Shared streaming I/O helpers for the continuous monitoring tools:
+- anomaly-detector.py
+- real-time-compliance-monitor.py
+
+Responsibilities:
+- Decode JSON lines input through a pluggable decoder (orjson or msgspec
+  when installed, stdlib json otherwise), reading large binary chunks;
+  the speedup comes from the fast decoders: with stdlib json, chunked
+  reads are about as fast as a plain line loop, and on some machines
+  slower
+- Provide a long-lived, buffered JSON lines output sink with configurable
+  flush size/interval, fsync policy and optional gzip/zstd compression
+- Flush buffered records cleanly on SIGTERM and at end of input
+- Parse event timestamps (epoch or ISO 8601) for event-time processing
+
+The scripts in this directory import this module by name; it is resolved
+from the script directory, so no installation step is required.
+"""
+
+import gzip
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+FSYNC_POLICIES = ("never", "batch", "close")
+COMPRESSION_CHOICES = ("none", "gzip", "zstd")
+DECODER_CHOICES = ("auto", "orjson", "msgspec", "json")
+
+# Bytes read per call when splitting JSON lines input.
+READ_CHUNK_BYTES = 1 << 20
+
+
+# -----------------------------
+# Input decoding
+# -----------------------------
+
+
+class JsonDecoder:
+    """
+    A JSON decoder backend that accepts raw ``bytes``.
+
+    Parameters
+    ----------
+    name : str
+        Backend name ("orjson", "msgspec" or "json").
+    loads : Callable[[bytes], Any]
+        Decode function.
+    errors : Tuple[type, ...]
+        Exception types raised for malformed input.
+    """
+
+    __slots__ = ("name", "loads", "errors")
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[bytes], Any],
+        errors: Tuple[type, ...],
+    ) -> None:
+        self.name = name
+        self.loads = loads
+        self.errors = errors
+
+
+def select_decoder(preference: str = "auto") -> JsonDecoder:
+    """
+    Resolve a JSON decoder backend.
+
+    With "auto", orjson is preferred, then msgspec, then stdlib json.
+    Requesting a backend that is not installed raises ValueError.
+
+    Parameters
+    ----------
+    preference : str
+        One of DECODER_CHOICES.
+
+    Returns
+    -------
+    JsonDecoder
+        Selected backend.
+    """
+    if preference not in DECODER_CHOICES:
+        raise ValueError(f"Unsupported JSON decoder: {preference}")
+
+    if preference in ("auto", "orjson"):
+        try:
+            import orjson  # type: ignore
+
+            return JsonDecoder("orjson", orjson.loads, (orjson.JSONDecodeError,))
+        except ImportError:
+            if preference == "orjson":
+                raise ValueError(
+                    "orjson is not installed. Install with `pip install orjson`."
+                )
+
+    if preference in ("auto", "msgspec"):
+        try:
+            import msgspec  # type: ignore
+
+            return JsonDecoder(
+                "msgspec", msgspec.json.Decoder().decode, (msgspec.DecodeError,)
+            )
+        except ImportError:
+            if preference == "msgspec":
+                raise ValueError(
+                    "msgspec is not installed. Install with `pip install msgspec`."
+                )
+
+    return JsonDecoder("json", _stdlib_loads, (ValueError,))
+
+
+_STDLIB_DECODE = json.JSONDecoder().decode
+
+
+def _stdlib_loads(line: bytes) -> Any:
+    """
+    stdlib json fallback; decodes UTF-8 directly instead of sniffing the
+    encoding the way ``json.loads(bytes)`` does.
+    """
+    return _STDLIB_DECODE(line.decode("utf-8"))
+
+
+def iter_raw_line_chunks(stream: BinaryIO, chunk_size: int = READ_CHUNK_BYTES) -> Iterator[List[bytes]]:
+    """
+    Split a binary stream into non-blank lines, one list per read.
+
+    Each list holds the complete lines that one read made available, so a
+    consumer sees lines as soon as they arrive on a pipe rather than only
+    once a fixed number has accumulated. The trailing partial line of each
+    chunk is carried into the next read.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+        Binary input stream.
+    chunk_size : int
+        Bytes requested per read.
+
+    Yields
+    ------
+    List[bytes]
+        Lines without their newline terminators (possibly empty).
+    """
+    read = getattr(stream, "read1", stream.read)
+    carry = b""
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        lines = (carry + chunk if carry else chunk).split(b"\n")
+        carry = lines.pop()
+        yield [line for line in lines if line and not line.isspace()]
+    if carry and not carry.isspace():
+        yield [carry]
+
+
+def iter_raw_lines(stream: BinaryIO, chunk_size: int = READ_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Split a binary stream into non-blank lines using large chunked reads.
+
+    Lines stay as ``bytes`` (no per-line str decode); the trailing partial
+    line of each chunk is carried into the next read.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+        Binary input stream.
+    chunk_size : int
+        Bytes requested per read.
+
+    Yields
+    ------
+    bytes
+        One line without its newline terminator.
+    """
+    for lines in iter_raw_line_chunks(stream, chunk_size):
+        yield from lines
+
+
+def iter_decoded_events(
+    lines: Iterator[bytes],
+    decoder: JsonDecoder,
+    logger: logging.Logger,
+) -> Iterator[Any]:
+    """
+    Decode raw JSON lines, skipping (and warning about) malformed ones.
+
+    Debug logging of every event is only performed when the logger is
+    enabled for DEBUG, so the common path does no per-event log calls.
+
+    Parameters
+    ----------
+    lines : Iterator[bytes]
+        Raw lines, e.g. from iter_raw_lines.
+    decoder : JsonDecoder
+        Decoder backend.
+    logger : logging.Logger
+        Logger instance.
+
+    Yields
+    ------
+    Any
+        Decoded JSON documents.
+    """
+    loads = decoder.loads
+    errors = decoder.errors
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for line in lines:
+        try:
+            event = loads(line)
+        except errors as exc:
+            logger.warning("Skipping invalid JSON line: %r | error=%s", line[:512], exc)
+            continue
+        if debug:
+            logger.debug("Read event: %s", event)
+        yield event
+
+
+def parse_event_time(raw_value: Any) -> Optional[float]:
+    """
+    Convert an event timestamp to epoch seconds.
+
+    Accepts epoch seconds or milliseconds (int/float) and ISO 8601 strings;
+    naive timestamps are treated as UTC.
+
+    Parameters
+    ----------
+    raw_value : Any
+        Timestamp field value from the event.
+
+    Returns
+    -------
+    Optional[float]
+        Epoch seconds, or None when the value cannot be interpreted.
+    """
+    if isinstance(raw_value, bool) or raw_value is None:
+        return None
+    if isinstance(raw_value, (int, float)):
+        value = float(raw_value)
+        return value / 1000.0 if value > 1e11 else value
+    if isinstance(raw_value, str):
+        try:
+            parsed = datetime.fromisoformat(raw_value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return None
+
+
+# -----------------------------
+# Output sink
+# -----------------------------
+
+
+def serialize_record(record: Dict[str, Any]) -> str:
+    """
+    Serialize a record as one compact, key-sorted JSON line (no newline).
+    """
+    return json.dumps(record, separators=(",", ":"), sort_keys=True)
+
+
+class JsonlSink:
+    """
+    Buffered JSON lines writer for stdout or a file.
+
+    Records are serialized on ``write`` and accumulated in memory; the
+    buffer is written out in one call once ``flush_records`` records are
+    pending or ``flush_interval`` seconds have passed since the last flush
+    (checked on write and by a background flusher thread). The output file
+    is opened once for the lifetime of the sink.
+
+    Parameters
+    ----------
+    destination : str
+        Either "stdout" or a filesystem path.
+    logger : logging.Logger
+        Logger instance.
+    append : bool
+        Append to an existing file instead of truncating it.
+    flush_records : int
+        Maximum number of buffered records before a flush.
+    flush_interval : float
+        Maximum seconds a record may sit in the buffer (0 disables the
+        time-based flush).
+    fsync : str
+        "never", "batch" (fsync after every flush) or "close".
+    compression : str
+        "none", "gzip" or "zstd" (requires the ``zstandard`` package).
+        Ignored for stdout.
+    """
+
+    def __init__(
+        self,
+        destination: str,
+        logger: logging.Logger,
+        append: bool = True,
+        flush_records: int = 1000,
+        flush_interval: float = 1.0,
+        fsync: str = "never",
+        compression: str = "none",
+    ) -> None:
+        if flush_records <= 0:
+            raise ValueError("flush_records must be positive.")
+        if flush_interval < 0:
+            raise ValueError("flush_interval must not be negative.")
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unsupported fsync policy: {fsync}")
+        if compression not in COMPRESSION_CHOICES:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+        self.destination = destination
+        self.logger = logger
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.compression = compression
+        self.records_written = 0
+
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._raw: Optional[BinaryIO] = None
+        self._stream: Any = None
+
+        if destination == "stdout":
+            self._stream = None
+        else:
+            self._open_file(Path(destination), append)
+
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                name="jsonl-sink-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def _open_file(self, path: Path, append: bool) -> None:
+        """
+        Open the destination file and wrap it with the compressor.
+        """
+        self._raw = path.open("ab" if append else "wb")
+        if self.compression == "gzip":
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb")
+        elif self.compression == "zstd":
+            try:
+                import zstandard  # type: ignore
+            except ImportError as exc:
+                self._raw.close()
+                raise ValueError(
+                    "zstd compression requires zstandard. "
+                    "Install with `pip install zstandard`."
+                ) from exc
+            self._stream = zstandard.ZstdCompressor().stream_writer(
+                self._raw, closefd=False
+            )
+        else:
+            self._stream = self._raw
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Serialize and buffer a single record.
+
+        Parameters
+        ----------
+        record : Dict[str, Any]
+            JSON-serializable record.
+        """
+        self.write_serialized(serialize_record(record))
+
+    def write_serialized(self, serialized: str) -> None:
+        """
+        Buffer a record that was already serialized with serialize_record.
+
+        Parameters
+        ----------
+        serialized : str
+            A single JSON document without a trailing newline.
+        """
+        with self._lock:
+            self._buffer.append(serialized)
+            if (
+                len(self._buffer) >= self.flush_records
+                or (
+                    self.flush_interval > 0
+                    and time.monotonic() - self._last_flush >= self.flush_interval
+                )
+            ):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """
+        Write out all buffered records.
+        """
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """
+        Flush implementation; the caller must hold the lock.
+        """
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        payload = "\n".join(self._buffer) + "\n"
+        count = len(self._buffer)
+        self._buffer.clear()
+
+        if self._stream is None:
+            sys.stdout.write(payload)
+            sys.stdout.flush()
+        else:
+            self._stream.write(payload.encode("utf-8"))
+            self._stream.flush()
+            if self._raw is not self._stream:
+                self._raw.flush()
+            if self.fsync == "batch":
+                os.fsync(self._raw.fileno())
+
+        self.records_written += count
+        self.logger.debug("Flushed %d records to %s", count, self.destination)
+
+    def _flush_periodically(self) -> None:
+        """
+        Background loop that enforces ``flush_interval`` while input is idle.
+        """
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as exc:
+                self.logger.error("Background flush to %s failed: %s", self.destination, exc)
+
+    def close(self) -> None:
+        """
+        Flush pending records, apply the fsync policy and release the file.
+        """
+        if self._closed:
+            return
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+
+        with self._lock:
+            self._flush_locked()
+            self._closed = True
+            if self._raw is None:
+                return
+            if self._stream is not self._raw:
+                self._stream.close()
+            self._raw.flush()
+            if self.fsync in ("batch", "close"):
+                os.fsync(self._raw.fileno())
+            self._raw.close()
+        self.logger.debug(
+            "Closed sink %s after %d records.", self.destination, self.records_written
+        )
+
+
+def install_termination_handler(logger: logging.Logger) -> None:
+    """
+    Turn SIGTERM into SystemExit so ``finally``/``with`` blocks flush sinks.
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        Logger instance.
+    """
+
+    def _handle_sigterm(signum: int, _frame: Any) -> None:
+        logger.info("Received signal %s, flushing output and shutting down.", signum)
+        raise SystemExit(128 + signum)
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
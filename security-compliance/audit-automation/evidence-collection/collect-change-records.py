@@ -6,20 +6,60 @@ Aggregates change management evidence from:
 - Ticketing/export files (CSV/JSON)
 - Local change logs (e.g., deployment logs)
 Produces a normalized JSON evidence bundle for audits.
+
+Ticket sources are parsed concurrently in a bounded thread pool, each
+streamed record by record into a spool file; the bundle is then assembled
+in source order, with local change logs copied in chunks, so memory use
+does not depend on the size of the sources.
+
+Incremental mode (--incremental) keeps per-source watermarks in a state
+file: the latest ticket end_time seen per ticket source, and the byte
+offset plus device/inode per local change log. Each run collects only
+records past the watermarks and appends them to the day's evidence
+partition (change-evidence-YYYYMMDD/, JSON lines).
+
+With --evidence-store, each ticket source (normalized records, JSON lines)
+and each local change log (raw bytes) is saved as its own file in the
+shared content-addressed evidence store (see evidence_store.py) instead
+of a bundle, so sources that did not change since the last run are
+stored only once.
 """
 
 import argparse
+import codecs
 import csv
 import datetime
+import io
 import json
 import logging
 import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from evidence_store import EvidenceStore, RunManifest, new_run_manifest
 
 DEFAULT_CONFIG_FILE = "./collect-change-records.json"
 DEFAULT_OUTPUT_DIR = "/var/tmp/evidence-change-records"
 DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_WORKERS = 4
+
+# Characters read from a ticket source or spool file at a time.
+READ_CHUNK_CHARS = 1 << 20
+
+# Bytes read from a local change log at a time.
+READ_CHUNK_BYTES = 1 << 20
+
+DEFAULT_STATE_FILE_NAME = "change-records-state.json"
+STATE_VERSION = 1
+
+EVIDENCE_CATEGORY = "change_records"
+
+# Indentation of a ticket record inside the bundle's "tickets" array.
+TICKET_INDENT = "\n    "
 
 
 # -----------------------------
@@ -53,7 +93,11 @@ def load_json_config(path: str) -> Dict[str, Any]:
         "/var/log/deployments.log",
         "/var/log/config-changes.log"
       ],
-      "output_dir": "/var/tmp/evidence-change-records"
+      "output_dir": "/var/tmp/evidence-change-records",
+      "max_workers": 4,
+      "incremental": false,
+      "state_file": "/var/tmp/evidence-change-records/change-records-state.json",
+      "evidence_store": "/var/lib/evidence-store"
     }
     """
     if not os.path.exists(path):
@@ -69,134 +113,695 @@ def load_json_config(path: str) -> Dict[str, Any]:
         return {}
 
 
+# -----------------------------
+# Streaming JSON reader
+# -----------------------------
+
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+class StreamingJsonReader:
+    """
+    Incremental (ijson-style) reader over a JSON text stream.
+
+    The stream is read in chunks of READ_CHUNK_CHARS and values are decoded
+    one at a time with the C decoder, so arrays can be iterated without
+    holding the whole document.
+    """
+
+    def __init__(self, fh: TextIO) -> None:
+        self._fh = fh
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self) -> None:
+        chunk = self._fh.read(READ_CHUNK_CHARS)
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ("" at the end)."""
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            if self._eof:
+                self._pos = len(self._buffer)
+                return ""
+            self._read_more()
+
+    def expect(self, allowed: str) -> str:
+        """Consume the next character, which must be one of `allowed`."""
+        char = self.peek()
+        if not char or char not in allowed:
+            raise ValueError(f"expected one of {allowed!r}, found {char or 'end of data'!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete value."""
+        if not self.peek():
+            raise ValueError("unexpected end of data")
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._read_more()
+                continue
+            if not self._eof:
+                # A number may continue in the next chunk: only accept the
+                # value once the character following it has been read.
+                following = _NON_WHITESPACE.search(self._buffer, end)
+                if following is None or following.group() not in ",]}:":
+                    self._read_more()
+                    continue
+            self._pos = end
+            return value
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(",]") == "]":
+                return
+
+
+def iter_json_change_items(fh: TextIO, path: Path) -> Iterator[Any]:
+    """
+    Yield the change items of a JSON document: a list of objects, or an
+    object with a "changes" list. Other top-level keys are skipped.
+    """
+    reader = StreamingJsonReader(fh)
+    first = reader.peek()
+    if first == "[":
+        yield from reader.iter_array()
+        return
+
+    found = False
+    if first == "{":
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.expect("}")
+        else:
+            while True:
+                key = reader.value()
+                reader.expect(":")
+                if key == "changes" and not found and reader.peek() == "[":
+                    found = True
+                    yield from reader.iter_array()
+                else:
+                    reader.value()
+                if reader.expect(",}") == "}":
+                    break
+    if not found:
+        logging.warning(
+            "JSON structure for %s not recognized; expected list or {\"changes\": [...]}",
+            path,
+        )
+
+
 # -----------------------------
 # Ticket source parsing
 # -----------------------------
 
-def parse_csv_ticket_source(path: Path) -> List[Dict[str, Any]]:
-    """Parse a CSV file of change records into a standardized dict list."""
-    records: List[Dict[str, Any]] = []
+def normalize_ticket(item: Dict[str, Any], raw_source: str, path: Path) -> Dict[str, Any]:
+    """Map a raw CSV row or JSON object to the standardized record layout."""
+    return {
+        "id": item.get("id") or item.get("ticket_id"),
+        "summary": item.get("summary") or item.get("title"),
+        "status": item.get("status"),
+        "change_type": item.get("change_type"),
+        "requested_by": item.get("requested_by"),
+        "implemented_by": item.get("implemented_by"),
+        "start_time": item.get("start_time"),
+        "end_time": item.get("end_time"),
+        "raw_source": raw_source,
+        "source_path": str(path),
+        "raw_record": item,
+    }
+
+
+def iter_csv_ticket_source(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream standardized change records from a CSV file."""
     if not path.exists():
         logging.warning("CSV ticket source not found: %s", path)
-        return records
+        return
 
     logging.info("Parsing CSV ticket source: %s", path)
     try:
         with path.open("r", encoding="utf-8") as fh:
-            reader = csv.DictReader(fh)
-            for row in reader:
-                record = {
-                    "id": row.get("id") or row.get("ticket_id"),
-                    "summary": row.get("summary") or row.get("title"),
-                    "status": row.get("status"),
-                    "change_type": row.get("change_type"),
-                    "requested_by": row.get("requested_by"),
-                    "implemented_by": row.get("implemented_by"),
-                    "start_time": row.get("start_time"),
-                    "end_time": row.get("end_time"),
-                    "raw_source": "csv",
-                    "source_path": str(path),
-                    "raw_record": row,
-                }
-                records.append(record)
+            for row in csv.DictReader(fh):
+                yield normalize_ticket(row, "csv", path)
     except Exception as exc:  # noqa: BLE001
         logging.error("Failed to parse CSV %s: %s", path, exc)
 
-    return records
-
 
-def parse_json_ticket_source(path: Path) -> List[Dict[str, Any]]:
-    """Parse a JSON file of change records."""
-    records: List[Dict[str, Any]] = []
+def iter_json_ticket_source(path: Path) -> Iterator[Dict[str, Any]]:
+    """Stream standardized change records from a JSON file."""
     if not path.exists():
         logging.warning("JSON ticket source not found: %s", path)
-        return records
+        return
 
     logging.info("Parsing JSON ticket source: %s", path)
     try:
         with path.open("r", encoding="utf-8") as fh:
-            data = json.load(fh)
+            for item in iter_json_change_items(fh, path):
+                if isinstance(item, dict):
+                    yield normalize_ticket(item, "json", path)
+    except Exception as exc:  # noqa: BLE001
+        logging.error("Failed to parse JSON %s: %s", path, exc)
 
-        # Accept either list of objects or object with "changes" list
-        if isinstance(data, dict) and "changes" in data:
-            items = data["changes"]
-        elif isinstance(data, list):
-            items = data
-        else:
-            logging.warning(
-                "JSON structure for %s not recognized; expected list or {\"changes\": [...]}",
-                path,
+
+TICKET_PARSERS = {
+    "csv": iter_csv_ticket_source,
+    "json": iter_json_ticket_source,
+}
+
+
+def ticket_source_key(src: Dict[str, Any]) -> str:
+    """Identify a ticket source in the watermark state."""
+    return f"{src.get('type')}:{src.get('path')}"
+
+
+def encode_bundle_ticket(record: Dict[str, Any]) -> str:
+    """Format a record as an element of the bundle's "tickets" array."""
+    return "," + TICKET_INDENT + json.dumps(record, indent=2).replace("\n", TICKET_INDENT)
+
+
+def encode_ticket_line(record: Dict[str, Any]) -> str:
+    """Format a record as one JSON line."""
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def spool_ticket_source(
+    src: Dict[str, Any],
+    spool_dir: Path,
+    encode: Callable[[Dict[str, Any]], str] = encode_bundle_ticket,
+    watermark: Optional["TicketWatermark"] = None,
+) -> Tuple[Optional[Path], int]:
+    """
+    Parse one ticket source into a spool file of encoded records, so that
+    spools can be concatenated into the output in source order.
+
+    With a watermark, only the records it admits are spooled.
+
+    Returns the spool path (None if the source was skipped) and the number
+    of records written.
+    """
+    src_type = src.get("type")
+    src_path = src.get("path")
+    if not src_type or not src_path:
+        logging.warning("Skipping ticket source with missing type/path: %s", src)
+        return None, 0
+    path = Path(src_path)
+    parser = TICKET_PARSERS.get(src_type)
+    if parser is None:
+        logging.warning("Unknown ticket source type '%s' for path %s", src_type, path)
+        return None, 0
+
+    fd, spool_name = tempfile.mkstemp(prefix=".tickets-", suffix=".spool", dir=spool_dir)
+    count = 0
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as spool:
+            for record in parser(path):
+                if watermark is not None and not watermark.admit(record):
+                    continue
+                spool.write(encode(record))
+                count += 1
+    except BaseException:
+        os.unlink(spool_name)
+        raise
+    logging.debug("Spooled %d records from %s", count, path)
+    return Path(spool_name), count
+
+
+def iter_ticket_spools(
+    sources: List[Dict[str, Any]],
+    spool_dir: Path,
+    workers: int,
+    encode: Callable[[Dict[str, Any]], str] = encode_bundle_ticket,
+    watermarks: Optional[Dict[str, "TicketWatermark"]] = None,
+) -> Iterator[Tuple[int, Path, int]]:
+    """
+    Parse ticket sources concurrently into spool files and yield
+    (source index, spool path, record count) in source order, leaving out
+    skipped sources. Each spool is deleted once the consumer moves on.
+
+    With `watermarks` (keyed by ticket_source_key), each source only spools
+    the records its watermark admits.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ticket-source") as pool:
+        futures = [
+            pool.submit(
+                spool_ticket_source,
+                src,
+                spool_dir,
+                encode,
+                watermarks.get(ticket_source_key(src)) if watermarks is not None else None,
             )
-            return records
+            for src in sources
+        ]
+        try:
+            for index, future in enumerate(futures):
+                spool_path, records = future.result()
+                if spool_path is None:
+                    continue
+                try:
+                    yield index, spool_path, records
+                finally:
+                    spool_path.unlink(missing_ok=True)
+        finally:
+            for future in futures:
+                future.cancel()
+            for future in futures:
+                if not future.cancelled() and future.exception() is None:
+                    spool_path, _ = future.result()
+                    if spool_path is not None:
+                        spool_path.unlink(missing_ok=True)
+
+
+def write_ticket_sources(
+    out: TextIO,
+    sources: List[Dict[str, Any]],
+    spool_dir: Path,
+    workers: int,
+    encode: Callable[[Dict[str, Any]], str] = encode_bundle_ticket,
+    separator: str = ",",
+    watermarks: Optional[Dict[str, "TicketWatermark"]] = None,
+) -> int:
+    """
+    Parse all configured ticket sources concurrently and write their
+    encoded records to `out` in source order.
 
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-            record = {
-                "id": item.get("id") or item.get("ticket_id"),
-                "summary": item.get("summary") or item.get("title"),
-                "status": item.get("status"),
-                "change_type": item.get("change_type"),
-                "requested_by": item.get("requested_by"),
-                "implemented_by": item.get("implemented_by"),
-                "start_time": item.get("start_time"),
-                "end_time": item.get("end_time"),
-                "raw_source": "json",
-                "source_path": str(path),
-                "raw_record": item,
-            }
-            records.append(record)
-    except Exception as exc:  # noqa: BLE001
-        logging.error("Failed to parse JSON %s: %s", path, exc)
+    `separator` is the prefix `encode` puts before every record, dropped
+    from the very first one (a comma for the bundle's JSON array).
 
-    return records
+    Returns the number of records written.
+    """
+    count = 0
+    for _index, spool_path, records in iter_ticket_spools(sources, spool_dir, workers, encode, watermarks):
+        with spool_path.open("r", encoding="utf-8") as spool:
+            if records and count == 0:
+                spool.read(len(separator))
+            shutil.copyfileobj(spool, out, READ_CHUNK_CHARS)
+        count += records
+    return count
 
 
-def load_ticket_sources(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Load and parse all configured ticket sources."""
-    all_records: List[Dict[str, Any]] = []
-    for src in sources:
-        src_type = src.get("type")
-        src_path = src.get("path")
-        if not src_type or not src_path:
-            logging.warning("Skipping ticket source with missing type/path: %s", src)
+# -----------------------------
+# Local change log collection
+# -----------------------------
+
+def open_local_change_logs(paths: List[str]) -> List[Tuple[str, BinaryIO]]:
+    """Open the local change logs that exist and are readable, keyed by filename."""
+    opened: List[Tuple[str, BinaryIO]] = []
+    seen = set()
+    for p in paths:
+        path = Path(p)
+        if str(path) in seen:
             continue
-        path = Path(src_path)
-        if src_type == "csv":
-            all_records.extend(parse_csv_ticket_source(path))
-        elif src_type == "json":
-            all_records.extend(parse_json_ticket_source(path))
-        else:
-            logging.warning("Unknown ticket source type '%s' for path %s", src_type, path)
-    return all_records
+        if not path.exists():
+            logging.warning("Local change log not found: %s", path)
+            continue
+        try:
+            opened.append((str(path), path.open("rb")))
+        except Exception as exc:  # noqa: BLE001
+            logging.error("Failed to read %s: %s", path, exc)
+            continue
+        seen.add(str(path))
+    return opened
+
+
+def _text_decoder(errors: str) -> io.IncrementalNewlineDecoder:
+    # UTF-8 with universal newlines, as in text-mode reads.
+    return io.IncrementalNewlineDecoder(codecs.getincrementaldecoder("utf-8")(errors), translate=True)
+
+
+def copy_log_as_json_string(
+    fh: BinaryIO,
+    name: str,
+    out: TextIO,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> None:
+    """
+    Copy bytes [start, end) of a log (to EOF without `end`) into `out` as
+    the body of a JSON string, decoding in chunks.
+
+    Invalid UTF-8 is replaced (with a warning) rather than dropping the log.
+    """
+    fh.seek(start)
+    remaining = None if end is None else end - start
+    decoder = _text_decoder("strict")
+    while True:
+        size = READ_CHUNK_BYTES if remaining is None else min(READ_CHUNK_BYTES, remaining)
+        chunk = fh.read(size) if size else b""
+        if remaining is not None:
+            remaining -= len(chunk)
+        final = not chunk
+        state = decoder.getstate()
+        try:
+            text = decoder.decode(chunk, final)
+        except UnicodeDecodeError:
+            logging.warning("%s is not valid UTF-8; invalid bytes were replaced.", name)
+            decoder = _text_decoder("replace")
+            decoder.setstate(state)
+            text = decoder.decode(chunk, final)
+        if text:
+            out.write(json.dumps(text)[1:-1])
+        if final:
+            return
+
+
+def write_local_change_logs(out: TextIO, logs: List[Tuple[str, BinaryIO]]) -> None:
+    """Stream local change logs into `out` as the members of a JSON object."""
+    for index, (name, fh) in enumerate(logs):
+        out.write(("," if index else "") + TICKET_INDENT + json.dumps(name) + ': "')
+        try:
+            copy_log_as_json_string(fh, name, out)
+        except OSError as exc:
+            logging.error("Failed to read %s: %s", name, exc)
+        out.write('"')
 
 
 # -----------------------------
-# Local change log collection
+# Incremental collection
 # -----------------------------
 
-def read_text_file(path: Path) -> Optional[str]:
-    """Read text file content if present."""
-    if not path.exists():
-        logging.warning("Local change log not found: %s", path)
+def parse_end_time(value: Any) -> Optional[datetime.datetime]:
+    """Parse an ISO 8601 end_time (naive values are UTC); None if unusable."""
+    if not isinstance(value, str) or not value.strip():
         return None
-
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
     try:
-        return path.read_text(encoding="utf-8")
-    except Exception as exc:  # noqa: BLE001
-        logging.error("Failed to read %s: %s", path, exc)
+        parsed = datetime.datetime.fromisoformat(text)
+    except ValueError:
         return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.astimezone(datetime.timezone.utc)
 
 
-def collect_local_change_logs(paths: List[str]) -> Dict[str, str]:
-    """Collect raw text of local change logs keyed by filename."""
-    collected: Dict[str, str] = {}
-    for p in paths:
-        path = Path(p)
-        content = read_text_file(path)
-        if content is not None:
-            collected[str(path)] = content
-    return collected
+class TicketWatermark:
+    """
+    Latest ticket end_time collected from one source.
+
+    Records ending after the mark are new. The ids of records ending
+    exactly at the mark are kept, so a record sharing that timestamp but
+    exported later is still collected once. Records without an end_time
+    (typically changes still in progress) are deferred until they have
+    one. Records whose end_time is not ISO 8601 would be deferred forever,
+    so they are collected once, with a warning, and their ids kept.
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None) -> None:
+        state = state or {}
+        self.mark = parse_end_time(state.get("end_time"))
+        self.ids_at_mark = set(state.get("ids_at_mark", [])) if self.mark is not None else set()
+        self.unparsed_ids = set(state.get("unparsed_ids", []))
+        self.new_mark = self.mark
+        self.new_ids_at_mark = set(self.ids_at_mark)
+        self.new_unparsed_ids = set(self.unparsed_ids)
+        self.deferred = 0
+
+    def admit(self, record: Dict[str, Any]) -> bool:
+        """Return True if the record is new, advancing the pending mark."""
+        raw_end_time = record.get("end_time")
+        end_time = parse_end_time(raw_end_time)
+        record_id = str(record.get("id"))
+        if end_time is None:
+            if raw_end_time is None or (isinstance(raw_end_time, str) and not raw_end_time.strip()):
+                self.deferred += 1
+                return False
+            if record_id in self.new_unparsed_ids:
+                return False
+            logging.warning(
+                "Ticket record %s has an end_time that is not ISO 8601 (%r); collecting it once.",
+                record_id,
+                raw_end_time,
+            )
+            self.new_unparsed_ids.add(record_id)
+            return True
+        if self.mark is not None and (
+            end_time < self.mark or (end_time == self.mark and record_id in self.ids_at_mark)
+        ):
+            return False
+        if self.new_mark is None or end_time > self.new_mark:
+            self.new_mark = end_time
+            self.new_ids_at_mark = {record_id}
+        elif end_time == self.new_mark:
+            self.new_ids_at_mark.add(record_id)
+        return True
+
+    def state(self) -> Optional[Dict[str, Any]]:
+        """Watermark to persist once the run's records are written."""
+        if self.new_mark is None and not self.new_unparsed_ids:
+            return None
+        state: Dict[str, Any] = {
+            "end_time": self.new_mark.isoformat() if self.new_mark is not None else None,
+            "ids_at_mark": sorted(self.new_ids_at_mark),
+        }
+        if self.new_unparsed_ids:
+            state["unparsed_ids"] = sorted(self.new_unparsed_ids)
+        return state
+
+
+def log_delta_range(name: str, fh: BinaryIO, state: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Return the byte range of a log not collected yet, ending after its last
+    complete line.
+
+    The watermark offset applies while the file keeps its device/inode and
+    is not shorter than the offset; after rotation or truncation the file
+    is collected from the start.
+    """
+    stat = os.fstat(fh.fileno())
+    start = 0
+    if state is not None:
+        if (state.get("device"), state.get("inode")) != (stat.st_dev, stat.st_ino):
+            logging.info("%s was rotated since the last run; collecting it from the start.", name)
+        elif state.get("offset", 0) > stat.st_size:
+            logging.warning("%s is shorter than its watermark; collecting it from the start.", name)
+        else:
+            start = state.get("offset", 0)
+
+    # Hold back a trailing partial line until its newline is written.
+    end = stat.st_size
+    while end > start:
+        block_start = max(start, end - READ_CHUNK_BYTES)
+        fh.seek(block_start)
+        newline = fh.read(end - block_start).rfind(b"\n")
+        if newline >= 0:
+            return start, block_start + newline + 1
+        end = block_start
+    return start, start
+
+
+def load_state(path: Path) -> Dict[str, Any]:
+    """Read the watermark state; a missing or unreadable file starts empty."""
+    empty: Dict[str, Any] = {"version": STATE_VERSION, "tickets": {}, "logs": {}}
+    if not path.exists():
+        logging.info("No watermark state at %s; collecting everything.", path)
+        return empty
+    try:
+        with path.open("r", encoding="utf-8") as fh:
+            state = json.load(fh)
+    except (OSError, json.JSONDecodeError) as exc:
+        logging.error("Failed to load watermark state %s: %s; collecting everything.", path, exc)
+        return empty
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        logging.warning("Ignoring watermark state %s with unknown version.", path)
+        return empty
+    state.setdefault("tickets", {})
+    state.setdefault("logs", {})
+    return state
+
+
+def save_state(path: Path, state: Dict[str, Any]) -> None:
+    """Atomically write the watermark state (temp file, fsync, rename)."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("w", encoding="utf-8") as fh:
+        json.dump(state, fh, indent=2, sort_keys=True)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp_path, path)
+
+
+def open_partition_file(path: Path) -> Tuple[TextIO, int]:
+    """
+    Open a partition file for appending and return it with its size.
+
+    A partial last line (left by an interrupted run) is cut off first.
+    """
+    if path.exists():
+        with path.open("r+b") as fh:
+            size = fh.seek(0, os.SEEK_END)
+            if size:
+                fh.seek(max(0, size - READ_CHUNK_BYTES))
+                tail = fh.read()
+                if not tail.endswith(b"\n"):
+                    keep = size - len(tail) + tail.rfind(b"\n") + 1
+                    logging.warning("Removing a partial record at the end of %s.", path)
+                    fh.truncate(keep)
+    out = path.open("a", encoding="utf-8")
+    return out, out.tell()
+
+
+def collect_incremental(
+    output_dir: Path,
+    state_file: Path,
+    ticket_sources: List[Dict[str, Any]],
+    local_logs: List[Tuple[str, BinaryIO]],
+    workers: int,
+) -> None:
+    """
+    Append the records past the watermarks to today's evidence partition,
+    then advance the watermarks.
+
+    The state is only saved once the partition files are flushed to disk;
+    if the run fails, the appended data is rolled back.
+    """
+    state = load_state(state_file)
+    now = datetime.datetime.utcnow()
+    partition = output_dir / f"change-evidence-{now.strftime('%Y%m%d')}"
+    partition.mkdir(parents=True, exist_ok=True)
+    logging.info("Appending to evidence partition: %s", partition)
+
+    watermarks = {
+        ticket_source_key(src): TicketWatermark(state["tickets"].get(ticket_source_key(src)))
+        for src in ticket_sources
+    }
+
+    opened: List[Tuple[TextIO, int]] = []
+    try:
+        for name in ("tickets.jsonl", "local-logs.jsonl", "runs.jsonl"):
+            opened.append(open_partition_file(partition / name))
+        (tickets_out, _), (logs_out, _), (runs_out, _) = opened
+
+        logging.info("Loading ticket sources with %d workers...", max(1, workers))
+        ticket_count = write_ticket_sources(
+            tickets_out, ticket_sources, output_dir, workers,
+            encode=encode_ticket_line, separator="", watermarks=watermarks,
+        )
+        deferred = sum(watermark.deferred for watermark in watermarks.values())
+        if deferred:
+            logging.info("Deferred %d ticket records without an end_time.", deferred)
+
+        logging.info("Collecting local change log deltas...")
+        log_states: Dict[str, Dict[str, Any]] = {}
+        log_bytes = 0
+        for name, fh in local_logs:
+            start, end = log_delta_range(name, fh, state["logs"].get(name))
+            stat = os.fstat(fh.fileno())
+            log_states[name] = {"device": stat.st_dev, "inode": stat.st_ino, "offset": end}
+            if end == start:
+                continue
+            header = {
+                "path": name,
+                "device": stat.st_dev,
+                "inode": stat.st_ino,
+                "start_offset": start,
+                "end_offset": end,
+            }
+            logs_out.write(json.dumps(header)[:-1] + ', "content": "')
+            copy_log_as_json_string(fh, name, logs_out, start, end)
+            logs_out.write('"}\n')
+            log_bytes += end - start
+
+        run = {
+            "generated_at_utc": now.isoformat() + "Z",
+            "ticket_source_count": len(ticket_sources),
+            "ticket_record_count": ticket_count,
+            "deferred_ticket_record_count": deferred,
+            "local_change_log_count": len(local_logs),
+            "local_change_log_bytes": log_bytes,
+        }
+        runs_out.write(json.dumps(run) + "\n")
+
+        for out, _ in opened:
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        for out, size in opened:
+            out.truncate(size)
+            out.close()
+        raise
+    for out, _ in opened:
+        out.close()
+
+    for key, watermark in watermarks.items():
+        mark = watermark.state()
+        if mark is not None:
+            state["tickets"][key] = mark
+    state["logs"].update(log_states)
+    state["updated_at_utc"] = now.isoformat() + "Z"
+    save_state(state_file, state)
+
+    logging.info(
+        "Collected %d new ticket records and %d bytes of local change logs.", ticket_count, log_bytes
+    )
+
+
+# -----------------------------
+# Evidence store
+# -----------------------------
+
+def evidence_file_name(prefix: str, index: int, path: str) -> str:
+    """Name a source's file in a run manifest, unique by source position."""
+    return f"{prefix}/{index:03d}-{Path(path).name or 'source'}"
+
+
+def store_change_records(
+    store: EvidenceStore,
+    spool_dir: Path,
+    ticket_sources: List[Dict[str, Any]],
+    local_logs: List[Tuple[str, BinaryIO]],
+    workers: int,
+) -> Tuple[RunManifest, Path, int]:
+    """
+    Save each ticket source and local change log as a file of one run in
+    the evidence store, then write the run manifest.
+
+    Returns the manifest, its path and the number of ticket records.
+    """
+    manifest = new_run_manifest(
+        EVIDENCE_CATEGORY,
+        "collect-change-records.py",
+        {
+            "ticket_source_count": len(ticket_sources),
+            "local_change_log_count": len(local_logs),
+        },
+    )
+
+    logging.info("Loading ticket sources with %d workers...", max(1, workers))
+    ticket_count = 0
+    spools = iter_ticket_spools(ticket_sources, spool_dir, workers, encode_ticket_line)
+    for index, spool_path, records in spools:
+        path = str(ticket_sources[index].get("path"))
+        store.add_file(manifest, evidence_file_name("tickets", index, path) + ".jsonl", spool_path, source=path)
+        ticket_count += records
+
+    logging.info("Storing local change logs...")
+    for index, (name, fh) in enumerate(local_logs):
+        try:
+            store.add_stream(manifest, evidence_file_name("local_logs", index, name), fh, source=name)
+        except OSError as exc:
+            logging.error("Failed to read %s: %s", name, exc)
+
+    manifest.metadata["ticket_record_count"] = ticket_count
+    return manifest, store.write_manifest(manifest), ticket_count
 
 
 # -----------------------------
@@ -219,6 +824,26 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_OUTPUT_DIR,
         help=f"Output directory (default: {DEFAULT_OUTPUT_DIR})",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Ticket sources parsed concurrently (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Collect only records past the saved watermarks into today's partition.",
+    )
+    parser.add_argument(
+        "--state-file",
+        help=f"Watermark state for --incremental (default: <output-dir>/{DEFAULT_STATE_FILE_NAME})",
+    )
+    parser.add_argument(
+        "--evidence-store",
+        help="Content-addressed evidence store to save the sources in, instead of a bundle.",
+    )
     parser.add_argument(
         "--log-level",
         default=DEFAULT_LOG_LEVEL,
@@ -236,36 +861,84 @@ def main() -> int:
     output_dir = Path(config.get("output_dir", args.output_dir))
     ticket_sources = config.get("ticket_sources", [])
     local_change_logs = config.get("local_change_logs", [])
+    workers = int(config.get("max_workers", args.workers))
+    incremental = bool(config.get("incremental", args.incremental))
+    state_file = Path(
+        config.get("state_file", args.state_file or output_dir / DEFAULT_STATE_FILE_NAME)
+    )
+    store_root = config.get("evidence_store", args.evidence_store)
 
+    if incremental and store_root:
+        logging.error("Incremental collection cannot be combined with an evidence store.")
+        return 1
+
+    local_logs: List[Tuple[str, BinaryIO]] = []
+    tmp_file: Optional[Path] = None
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
         logging.info("Using output directory: %s", output_dir)
 
-        timestamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-        evidence_file = output_dir / f"change-evidence-{timestamp}.json"
+        if incremental:
+            local_logs = open_local_change_logs(local_change_logs)
+            collect_incremental(output_dir, state_file, ticket_sources, local_logs, workers)
+            return 0
 
-        logging.info("Loading ticket sources...")
-        tickets = load_ticket_sources(ticket_sources)
+        if store_root:
+            local_logs = open_local_change_logs(local_change_logs)
+            manifest, manifest_path, ticket_count = store_change_records(
+                EvidenceStore(Path(store_root)), output_dir, ticket_sources, local_logs, workers
+            )
+            logging.info(
+                "Collected %d ticket records and %d local change logs.", ticket_count, len(local_logs)
+            )
+            logging.info(
+                "Stored %d evidence files as run %s: %s",
+                len(manifest.entries),
+                manifest.run_id,
+                manifest_path,
+            )
+            return 0
 
-        logging.info("Collecting local change logs...")
-        local_logs = collect_local_change_logs(local_change_logs)
+        timestamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        evidence_file = output_dir / f"change-evidence-{timestamp}.json"
+        tmp_file = evidence_file.with_name(evidence_file.name + ".tmp")
 
-        evidence_bundle = {
-            "metadata": {
-                "generated_at_utc": datetime.datetime.utcnow().isoformat() + "Z",
-                "ticket_source_count": len(ticket_sources),
-                "local_change_log_count": len(local_logs),
-            },
-            "tickets": tickets,
-            "local_logs": local_logs,
+        local_logs = open_local_change_logs(local_change_logs)
+        metadata = {
+            "generated_at_utc": datetime.datetime.utcnow().isoformat() + "Z",
+            "ticket_source_count": len(ticket_sources),
+            "local_change_log_count": len(local_logs),
         }
 
-        evidence_file.write_text(json.dumps(evidence_bundle, indent=2), encoding="utf-8")
+        # Same layout as json.dumps(bundle, indent=2), written piece by piece.
+        with tmp_file.open("w", encoding="utf-8") as out:
+            out.write('{\n  "metadata": ' + json.dumps(metadata, indent=2).replace("\n", "\n  "))
+
+            logging.info("Loading ticket sources with %d workers...", max(1, workers))
+            out.write(',\n  "tickets": [')
+            ticket_count = write_ticket_sources(out, ticket_sources, output_dir, workers)
+            out.write("\n  ]" if ticket_count else "]")
+
+            logging.info("Collecting local change logs...")
+            out.write(',\n  "local_logs": {')
+            write_local_change_logs(out, local_logs)
+            out.write("\n  }" if local_logs else "}")
+            out.write("\n}")
+        os.replace(tmp_file, evidence_file)
+
+        logging.info(
+            "Collected %d ticket records and %d local change logs.", ticket_count, len(local_logs)
+        )
         logging.info("Change management evidence written to: %s", evidence_file)
         return 0
     except Exception as exc:  # noqa: BLE001
         logging.exception("Unexpected error during change record collection: %s", exc)
+        if tmp_file is not None:
+            tmp_file.unlink(missing_ok=True)
         return 1
+    finally:
+        for _, fh in local_logs:
+            fh.close()
 
 
 if __name__ == "__main__":
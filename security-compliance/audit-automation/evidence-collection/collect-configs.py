@@ -6,18 +6,58 @@ Collects system configuration snapshots for audit evidence:
 - OS details, kernel, installed packages (where supported)
 - Network configuration, mounted filesystems
 - Configurable inclusion/exclusion via config file and CLI
+
+Snapshots are registered in SNAPSHOT_REGISTRY and run concurrently in a
+bounded thread pool. Every command they run has a timeout, so a hung
+command (e.g. `mount` or `df` on a stale NFS export) fails its snapshot
+instead of stalling the collection. Each run writes run-manifest.json
+with per-snapshot status, wall-clock timing and command outcomes; the exit
+status is 2 when any snapshot failed or was incomplete.
+
+With --evidence-store (or [general] evidence_store), snapshots go into the
+shared content-addressed evidence store (see evidence_store.py) instead of
+a new directory per run: unchanged snapshots are stored once and each run
+adds only a manifest.
+
+Fleet mode (--inventory) runs the same snapshots against many hosts
+concurrently over SSH (see fleet_transport.py), one ControlMaster
+connection per host, with a fleet-wide connection rate limit and retries
+for unreachable hosts. Each host gets its own output directory (or its own
+run in the evidence store), and fleet-manifest.json records every host's
+outcome. `--transport local` runs the fleet against this machine instead,
+to try out an inventory without real hosts.
 """
 
 import argparse
 import configparser
 import datetime
+import json
 import logging
 import os
-import platform
-import subprocess
+import random
+import re
+import shlex
+import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+from evidence_store import EvidenceStore, new_run_manifest, store_directory
+from fleet_transport import (
+    TRANSPORT_CHOICES,
+    InventoryHost,
+    LocalTransport,
+    RateLimiter,
+    SshTransport,
+    Transport,
+    TransportError,
+    load_inventory,
+)
 
 # -----------------------------
 # Defaults
@@ -26,6 +66,69 @@ from typing import List, Optional
 DEFAULT_CONFIG_FILE = "./collect-configs.ini"
 DEFAULT_OUTPUT_DIR = "/var/tmp/evidence-configs"
 DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_WORKERS = 4
+DEFAULT_COMMAND_TIMEOUT = 60.0
+EVIDENCE_CATEGORY = "configs"
+RUN_MANIFEST_NAME = "run-manifest.json"
+FLEET_MANIFEST_NAME = "fleet-manifest.json"
+
+DEFAULT_FLEET_CONCURRENCY = 16
+DEFAULT_TRANSPORT = "ssh"
+DEFAULT_RETRIES = 2
+DEFAULT_CONNECT_RATE = 5.0
+DEFAULT_CONNECT_TIMEOUT = 10.0
+
+# Retry delays double from RETRY_BACKOFF_SECONDS up to the maximum, with
+# jitter so that hosts failing together do not retry together.
+RETRY_BACKOFF_SECONDS = 2.0
+RETRY_BACKOFF_MAX_SECONDS = 60.0
+
+# Exit status when the collection completed but some snapshots did not.
+EXIT_PARTIAL = 2
+
+
+# -----------------------------
+# Snapshot results
+# -----------------------------
+
+@dataclass
+class SnapshotResult:
+    """Outcome of one snapshot, as recorded in the run manifest."""
+    name: str
+    command_timeout_seconds: Optional[float]
+    status: str = "ok"  # ok | partial | failed
+    started_at_utc: str = ""
+    duration_seconds: float = 0.0
+    files: List[str] = field(default_factory=list)
+    commands: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    def record_problem(self, message: str, status: str = "partial") -> None:
+        self.errors.append(message)
+        if status == "failed" or self.status == "ok":
+            self.status = status
+
+
+# The snapshot running in the current thread; commands and written files
+# are recorded on it.
+_current_snapshot: ContextVar[Optional[SnapshotResult]] = ContextVar("current_snapshot", default=None)
+
+# The host the current thread's snapshot runs against; this machine by default.
+_current_transport: ContextVar[Optional[Transport]] = ContextVar("current_transport", default=None)
+_local_transport = LocalTransport()
+
+# Set for evidence store runs: snapshot files then leave out collection
+# timestamps (recorded in the store manifest instead), so unchanged
+# evidence deduplicates.
+_stable_content: ContextVar[bool] = ContextVar("stable_content", default=False)
+
+
+def current_transport() -> Transport:
+    return _current_transport.get() or _local_transport
+
+
+def utc_now() -> str:
+    return datetime.datetime.utcnow().isoformat() + "Z"
 
 
 # -----------------------------
@@ -46,34 +149,62 @@ def setup_logger(log_level: str) -> None:
 # Command execution helper
 # -----------------------------
 
-def run_command(command: List[str]) -> str:
+def run_command(command: List[str], timeout: Optional[float] = None) -> str:
     """
     Run a system command safely and return stdout as text.
 
     - Raises no exceptions; returns an error message on failure.
     - Use for introspection commands (ip, ifconfig, etc.).
+    - Runs on the host of the current snapshot's transport (this machine
+      outside fleet mode).
+    - Inside a snapshot, the snapshot's command timeout applies unless
+      `timeout` is given, and the outcome is recorded on the snapshot.
+      A command that times out is killed; its partial output is returned
+      followed by an error line.
     """
-    logging.debug("Executing command: %s", " ".join(command))
+    snapshot = _current_snapshot.get()
+    transport = current_transport()
+    if timeout is None and snapshot is not None:
+        timeout = snapshot.command_timeout_seconds
+    description = transport.describe(command)
+    outcome: Dict[str, Any] = {"command": command, "returncode": None, "timed_out": False}
+    started = time.monotonic()
+    logging.debug("Executing command: %s", description)
     try:
-        result = subprocess.run(
-            command,
-            check=False,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        if result.returncode != 0:
-            logging.warning(
-                "Command failed (code=%s): %s; stderr=%s",
-                result.returncode,
-                " ".join(command),
-                result.stderr.strip(),
-            )
-        return result.stdout
+        output = transport.run(command, timeout)
     except Exception as exc:  # noqa: BLE001
-        logging.error("Failed to execute %s: %s", command, exc)
+        logging.error("Failed to execute %s: %s", description, exc)
+        if snapshot is not None:
+            outcome["error"] = str(exc)
+            outcome["duration_seconds"] = round(time.monotonic() - started, 3)
+            snapshot.commands.append(outcome)
+            snapshot.record_problem(f"Failed to execute {' '.join(command)}: {exc}")
         return f"ERROR: Failed to execute {command}: {exc}\n"
 
+    outcome["returncode"] = output.returncode
+    outcome["timed_out"] = output.timed_out
+    outcome["duration_seconds"] = round(time.monotonic() - started, 3)
+    if snapshot is not None:
+        snapshot.commands.append(outcome)
+
+    if output.timed_out:
+        message = f"Command timed out after {timeout:g}s: {' '.join(command)}"
+        logging.error("%s (%s)", message, transport.name)
+        if snapshot is not None:
+            snapshot.record_problem(message)
+        return output.stdout + f"ERROR: {message}\n"
+
+    if output.returncode != 0:
+        logging.warning(
+            "Command failed (code=%s): %s; stderr=%s",
+            output.returncode,
+            description,
+            output.stderr.strip(),
+        )
+        if snapshot is not None:
+            snapshot.record_problem(f"Command failed (code={output.returncode}): {' '.join(command)}")
+    return output.stdout
+
 
 # -----------------------------
 # Configuration loading
@@ -96,28 +227,25 @@ def load_config(config_file: str) -> configparser.ConfigParser:
 
 def write_text_file(output_dir: Path, name: str, content: str) -> None:
     """Write content to a file under output_dir with basic error handling."""
+    snapshot = _current_snapshot.get()
     try:
         output_dir.mkdir(parents=True, exist_ok=True)
         file_path = output_dir / name
         file_path.write_text(content, encoding="utf-8")
         logging.info("Wrote configuration snapshot: %s", file_path)
+        if snapshot is not None:
+            snapshot.files.append(name)
     except Exception as exc:  # noqa: BLE001
         logging.error("Failed to write snapshot %s: %s", name, exc)
+        if snapshot is not None:
+            snapshot.record_problem(f"Failed to write {name}: {exc}", "failed")
 
 
 def snapshot_system_info(output_dir: Path) -> None:
     """Collect OS, kernel, Python version, and hardware basics."""
     logging.info("Collecting system information...")
-    info_lines = [
-        f"Timestamp: {datetime.datetime.utcnow().isoformat()}Z",
-        f"System: {platform.system()}",
-        f"Node: {platform.node()}",
-        f"Release: {platform.release()}",
-        f"Version: {platform.version()}",
-        f"Machine: {platform.machine()}",
-        f"Processor: {platform.processor()}",
-        f"Python Version: {platform.python_version()}",
-    ]
+    info_lines = [] if _stable_content.get() else [f"Timestamp: {utc_now()}"]
+    info_lines += [f"{name}: {value}" for name, value in current_transport().system_info().items()]
     write_text_file(output_dir, "system-info.txt", "\n".join(info_lines) + "\n")
 
 
@@ -166,13 +294,14 @@ def snapshot_installed_packages(output_dir: Path) -> None:
     """
     logging.info("Collecting installed packages (best-effort)...")
 
-    if shutil_which("dpkg-query"):
+    transport = current_transport()
+    if transport.which("dpkg-query"):
         logging.debug("Using dpkg-query to list packages.")
         pkgs = run_command(["dpkg-query", "-W", "-f", "${Package} ${Version}\n"])
         write_text_file(output_dir, "installed-packages.txt", pkgs)
         return
 
-    if shutil_which("rpm"):
+    if transport.which("rpm"):
         logging.debug("Using rpm to list packages.")
         pkgs = run_command(["rpm", "-qa"])
         write_text_file(output_dir, "installed-packages.txt", pkgs)
@@ -188,11 +317,347 @@ def snapshot_installed_packages(output_dir: Path) -> None:
     )
 
 
-def shutil_which(cmd: str) -> Optional[str]:
-    """Simple wrapper for shutil.which with lazy import to keep top clean."""
-    import shutil  # lazy import
+# -----------------------------
+# Snapshot registry and runner
+# -----------------------------
+
+@dataclass(frozen=True)
+class SnapshotSpec:
+    """A registered snapshot: a name and a function writing into a directory."""
+    name: str
+    collect: Callable[[Path], None]
+    # Minimum command timeout for this snapshot, for commands that are
+    # legitimately slow; the [timeouts] config section overrides it.
+    command_timeout: Optional[float] = None
+
+
+SNAPSHOT_REGISTRY: List[SnapshotSpec] = [
+    SnapshotSpec("system_info", snapshot_system_info),
+    SnapshotSpec("network", snapshot_network),
+    SnapshotSpec("filesystems", snapshot_filesystems),
+    SnapshotSpec("installed_packages", snapshot_installed_packages, command_timeout=300.0),
+]
+
+
+def snapshot_command_timeout(
+    spec: SnapshotSpec,
+    default_timeout: Optional[float],
+    overrides: Dict[str, float],
+) -> Optional[float]:
+    """Resolve a snapshot's command timeout; None (or 0 in config) means no timeout."""
+    if spec.name in overrides:
+        return overrides[spec.name] or None
+    if default_timeout is None or spec.command_timeout is None:
+        return default_timeout
+    return max(default_timeout, spec.command_timeout)
+
+
+def run_snapshot(
+    spec: SnapshotSpec,
+    output_dir: Path,
+    command_timeout: Optional[float],
+    transport: Optional[Transport] = None,
+    stable_content: bool = False,
+) -> SnapshotResult:
+    """Run one snapshot, recording its commands, files, timing and errors."""
+    result = SnapshotResult(spec.name, command_timeout, started_at_utc=utc_now())
+    started = time.monotonic()
+    token = _current_snapshot.set(result)
+    transport_token = _current_transport.set(transport)
+    stable_token = _stable_content.set(stable_content)
+    try:
+        spec.collect(output_dir)
+    except Exception as exc:  # noqa: BLE001
+        logging.exception("Snapshot %s failed: %s", spec.name, exc)
+        result.record_problem(f"{type(exc).__name__}: {exc}", "failed")
+    finally:
+        _stable_content.reset(stable_token)
+        _current_transport.reset(transport_token)
+        _current_snapshot.reset(token)
+        result.duration_seconds = round(time.monotonic() - started, 3)
+    return result
+
+
+def collect_snapshots(
+    output_dir: Path,
+    specs: List[SnapshotSpec],
+    workers: int,
+    command_timeout: Optional[float],
+    timeout_overrides: Optional[Dict[str, float]] = None,
+    transport: Optional[Transport] = None,
+    stable_content: bool = False,
+) -> Dict[str, Any]:
+    """
+    Run snapshots concurrently (at most `workers` at a time) into
+    output_dir and return the run manifest. Commands run on `transport`'s
+    host, this machine by default. With `stable_content` (evidence store
+    runs), files carry no collection timestamp.
+
+    The run's status is "ok" if every snapshot succeeded, "failed" if all
+    failed and "partial" otherwise.
+    """
+    overrides = timeout_overrides or {}
+    started_at = utc_now()
+    started = time.monotonic()
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(workers, len(specs))), thread_name_prefix="snapshot"
+    ) as pool:
+        futures = [
+            pool.submit(
+                run_snapshot,
+                spec,
+                output_dir,
+                snapshot_command_timeout(spec, command_timeout, overrides),
+                transport,
+                stable_content,
+            )
+            for spec in specs
+        ]
+        results = [future.result() for future in futures]
+
+    statuses = {result.status for result in results}
+    if statuses <= {"ok"}:
+        status = "ok"
+    elif statuses == {"failed"}:
+        status = "failed"
+    else:
+        status = "partial"
+    return {
+        "host": (transport or _local_transport).name,
+        "status": status,
+        "started_at_utc": started_at,
+        "finished_at_utc": utc_now(),
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "workers": workers,
+        "command_timeout_seconds": command_timeout,
+        "snapshots": [asdict(result) for result in results],
+    }
+
+
+def log_run_summary(run: Dict[str, Any], prefix: str = "") -> None:
+    """Log per-snapshot timing and any failures."""
+    for snapshot in run["snapshots"]:
+        logging.info(
+            "%sSnapshot %-20s %-8s %8.3fs",
+            prefix,
+            snapshot["name"],
+            snapshot["status"],
+            snapshot["duration_seconds"],
+        )
+        for error in snapshot["errors"]:
+            logging.warning("%sSnapshot %s: %s", prefix, snapshot["name"], error)
+    logging.info("%sCollection %s in %.3fs.", prefix, run["status"], run["duration_seconds"])
+
+
+def write_run_manifest(evidence_dir: Path, run: Dict[str, Any]) -> Path:
+    """Write the run manifest next to the snapshots."""
+    path = evidence_dir / RUN_MANIFEST_NAME
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(run, fh, indent=2)
+        fh.write("\n")
+    logging.info("Wrote run manifest: %s", path)
+    return path
+
+
+def store_run(store_root: str, evidence_dir: Path, run: Dict[str, Any], skip_packages: bool) -> None:
+    """
+    Save a run's snapshots to the evidence store. The run manifest (timings
+    differ on every run) goes into the store manifest's metadata rather
+    than into a blob; the manifest's created_at_utc is the collection time
+    that system-info.txt records outside store mode.
+    """
+    manifest = new_run_manifest(
+        EVIDENCE_CATEGORY,
+        "collect-configs.py",
+        {"host": run["host"], "skip_packages": skip_packages, "run": run},
+        host=run["host"],
+    )
+    manifest_path = store_directory(EvidenceStore(Path(store_root)), evidence_dir, manifest)
+    logging.info(
+        "Stored %d snapshots as run %s: %s",
+        len(manifest.entries),
+        manifest.run_id,
+        manifest_path,
+    )
+
+
+# -----------------------------
+# Fleet mode
+# -----------------------------
 
-    return shutil.which(cmd)
+@dataclass
+class FleetOptions:
+    """Settings of a fleet run."""
+    specs: List[SnapshotSpec]
+    workers: int
+    command_timeout: Optional[float]
+    timeout_overrides: Dict[str, float]
+    transport: str
+    retries: int
+    connect_timeout: float
+    ssh_options: List[str]
+    skip_packages: bool
+    store_root: Optional[str] = None
+
+
+def host_dir_name(name: str) -> str:
+    """A host's output directory name."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+
+
+def make_transport(host: InventoryHost, options: FleetOptions, control_dir: Path) -> Transport:
+    if (host.transport or options.transport) == "local":
+        return LocalTransport(host.name)
+    return SshTransport(
+        host.name,
+        host.address,
+        control_dir,
+        user=host.user,
+        port=host.port,
+        options=options.ssh_options + host.ssh_options,
+        connect_timeout=options.connect_timeout,
+    )
+
+
+def collect_host(
+    host: InventoryHost,
+    fleet_dir: Path,
+    options: FleetOptions,
+    limiter: RateLimiter,
+    control_dir: Path,
+) -> Dict[str, Any]:
+    """
+    Collect the snapshots of one host, retrying when it cannot be reached
+    or the connection drops mid-collection. Returns the host's entry of
+    the fleet manifest.
+    """
+    transport = make_transport(host, options, control_dir)
+    if options.store_root:
+        host_dir = Path(tempfile.mkdtemp(prefix=f"config-snapshot-{host_dir_name(host.name)}-"))
+    else:
+        host_dir = fleet_dir / host_dir_name(host.name)
+    outcome: Dict[str, Any] = {"host": host.name, "status": "unreachable", "attempts": 0, "error": None}
+    started = time.monotonic()
+    try:
+        for attempt in range(1, options.retries + 2):
+            if attempt > 1:
+                delay = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_SECONDS * 2 ** (attempt - 2))
+                time.sleep(delay * random.uniform(0.5, 1.0))
+            outcome["attempts"] = attempt
+            limiter.acquire()
+            try:
+                transport.connect(options.connect_timeout)
+            except (TransportError, OSError) as exc:
+                outcome["error"] = str(exc)
+                logging.warning("%s: attempt %d failed: %s", host.name, attempt, exc)
+                continue
+
+            # A retry starts from an empty directory, not a half-written one.
+            shutil.rmtree(host_dir, ignore_errors=True)
+            host_dir.mkdir(parents=True)
+            try:
+                run = collect_snapshots(
+                    host_dir,
+                    options.specs,
+                    options.workers,
+                    options.command_timeout,
+                    options.timeout_overrides,
+                    transport,
+                    stable_content=bool(options.store_root),
+                )
+            finally:
+                transport.close()
+            outcome["error"] = "connection lost during collection" if transport.connection_lost else None
+            if transport.connection_lost and attempt <= options.retries:
+                logging.warning("%s: attempt %d failed: %s", host.name, attempt, outcome["error"])
+                continue
+
+            log_run_summary(run, prefix=f"{host.name}: ")
+            if options.store_root:
+                store_run(options.store_root, host_dir, run, options.skip_packages)
+            else:
+                write_run_manifest(host_dir, run)
+                outcome["output_dir"] = str(host_dir)
+            outcome["status"] = run["status"]
+            break
+        else:
+            logging.error(
+                "%s: unreachable after %d attempts: %s", host.name, outcome["attempts"], outcome["error"]
+            )
+    except Exception as exc:  # noqa: BLE001
+        logging.exception("%s: unexpected error: %s", host.name, exc)
+        outcome["status"] = "failed"
+        outcome["error"] = str(exc)
+    finally:
+        if options.store_root:
+            shutil.rmtree(host_dir, ignore_errors=True)
+    outcome["duration_seconds"] = round(time.monotonic() - started, 3)
+    return outcome
+
+
+def collect_fleet(
+    hosts: List[InventoryHost],
+    output_dir: Path,
+    options: FleetOptions,
+    concurrency: int,
+    connect_rate: float,
+) -> Dict[str, Any]:
+    """
+    Collect every inventory host, at most `concurrency` at a time, into
+    output_dir/fleet-<timestamp>/<host>/, and write the fleet manifest there.
+    """
+    timestamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    fleet_dir = output_dir / f"fleet-{timestamp}"
+    fleet_dir.mkdir(parents=True, exist_ok=True)
+    logging.info(
+        "Collecting %d hosts (%d at a time, transport %s) into %s",
+        len(hosts),
+        concurrency,
+        options.transport,
+        fleet_dir,
+    )
+
+    limiter = RateLimiter(connect_rate)
+    started_at = utc_now()
+    started = time.monotonic()
+    # ControlMaster sockets; short path, as socket paths are length-limited.
+    control_dir = Path(tempfile.mkdtemp(prefix="cc-ssh-"))
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="host") as pool:
+            futures = [
+                pool.submit(collect_host, host, fleet_dir, options, limiter, control_dir)
+                for host in hosts
+            ]
+            results = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(control_dir, ignore_errors=True)
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    fleet = {
+        "status": "ok" if set(counts) <= {"ok"} else "partial",
+        "started_at_utc": started_at,
+        "finished_at_utc": utc_now(),
+        "duration_seconds": round(time.monotonic() - started, 3),
+        "transport": options.transport,
+        "concurrency": concurrency,
+        "host_count": len(hosts),
+        "status_counts": counts,
+        "hosts": results,
+    }
+    path = fleet_dir / FLEET_MANIFEST_NAME
+    with path.open("w", encoding="utf-8") as fh:
+        json.dump(fleet, fh, indent=2)
+        fh.write("\n")
+    logging.info(
+        "Fleet collection %s in %.3fs: %s; manifest: %s",
+        fleet["status"],
+        fleet["duration_seconds"],
+        ", ".join(f"{count} {status}" for status, count in sorted(counts.items())) or "no hosts",
+        path,
+    )
+    return fleet
 
 
 # -----------------------------
@@ -225,6 +690,65 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Skip collection of installed packages snapshot.",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Snapshots collected concurrently (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--command-timeout",
+        type=float,
+        default=DEFAULT_COMMAND_TIMEOUT,
+        help=f"Seconds before a snapshot command is killed; 0 disables (default: {DEFAULT_COMMAND_TIMEOUT:g})",
+    )
+    fleet = parser.add_argument_group("fleet mode")
+    fleet.add_argument(
+        "--inventory",
+        help="Inventory file, one '[user@]host[:port] [key=value ...]' per line; enables fleet mode.",
+    )
+    fleet.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_FLEET_CONCURRENCY,
+        help=f"Hosts collected concurrently (default: {DEFAULT_FLEET_CONCURRENCY})",
+    )
+    fleet.add_argument(
+        "--transport",
+        choices=TRANSPORT_CHOICES,
+        default=DEFAULT_TRANSPORT,
+        help="Default host transport; 'local' is a stand-in running on this machine (default: ssh)",
+    )
+    fleet.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries per unreachable host (default: {DEFAULT_RETRIES})",
+    )
+    fleet.add_argument(
+        "--connect-rate",
+        type=float,
+        default=DEFAULT_CONNECT_RATE,
+        help=f"New host connections per second across the fleet; 0 disables (default: {DEFAULT_CONNECT_RATE:g})",
+    )
+    fleet.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help=f"Seconds to establish an SSH connection (default: {DEFAULT_CONNECT_TIMEOUT:g})",
+    )
+    fleet.add_argument(
+        "--ssh-option",
+        action="append",
+        default=[],
+        metavar="OPTION",
+        help="Extra ssh -o option (e.g. StrictHostKeyChecking=yes); repeatable.",
+    )
+    parser.add_argument(
+        "--evidence-store",
+        help="Content-addressed evidence store to save snapshots in, instead of the output directory.",
+    )
     return parser.parse_args(argv)
 
 
@@ -246,30 +770,101 @@ def main(argv: Optional[List[str]] = None) -> int:
     skip_packages = config.getboolean(
         "general", "skip_packages", fallback=args.skip_packages
     )
+    store_root = config.get("general", "evidence_store", fallback=args.evidence_store)
+    workers = config.getint("general", "max_workers", fallback=args.workers)
+    command_timeout = config.getfloat("general", "command_timeout", fallback=args.command_timeout) or None
+    timeout_overrides = (
+        {name: float(value) for name, value in config.items("timeouts")}
+        if config.has_section("timeouts")
+        else {}
+    )
+
+    inventory = config.get("fleet", "inventory", fallback=args.inventory)
 
-    logging.info("Using output directory: %s", output_dir)
+    if store_root:
+        logging.info("Using evidence store: %s", store_root)
+    else:
+        logging.info("Using output directory: %s", output_dir)
     logging.debug("Skip packages: %s", skip_packages)
 
-    try:
-        timestamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-        evidence_dir = output_dir / f"config-snapshot-{timestamp}"
-        evidence_dir.mkdir(parents=True, exist_ok=True)
-        logging.info("Created evidence directory: %s", evidence_dir)
+    specs = SNAPSHOT_REGISTRY
+    if skip_packages:
+        logging.info("Skipping installed packages snapshot as requested.")
+        specs = [spec for spec in specs if spec.name != "installed_packages"]
+
+    if inventory:
+        try:
+            hosts = load_inventory(Path(inventory))
+        except (OSError, ValueError) as exc:
+            logging.error("Failed to load inventory %s: %s", inventory, exc)
+            return 1
+        ssh_options = [arg for option in args.ssh_option for arg in ("-o", option)]
+        ssh_options += shlex.split(config.get("fleet", "ssh_options", fallback=""))
+        options = FleetOptions(
+            specs=specs,
+            workers=workers,
+            command_timeout=command_timeout,
+            timeout_overrides=timeout_overrides,
+            transport=config.get("fleet", "transport", fallback=args.transport),
+            retries=config.getint("fleet", "retries", fallback=args.retries),
+            connect_timeout=config.getfloat("fleet", "connect_timeout", fallback=args.connect_timeout),
+            ssh_options=ssh_options,
+            skip_packages=skip_packages,
+            store_root=store_root,
+        )
+        if options.transport not in TRANSPORT_CHOICES:
+            logging.error("Unknown transport: %s", options.transport)
+            return 1
+        try:
+            fleet = collect_fleet(
+                hosts,
+                output_dir,
+                options,
+                config.getint("fleet", "concurrency", fallback=args.concurrency),
+                config.getfloat("fleet", "connect_rate", fallback=args.connect_rate),
+            )
+        except Exception as exc:  # noqa: BLE001
+            logging.exception("Unexpected error during fleet config collection: %s", exc)
+            return 1
+        return 0 if fleet["status"] == "ok" else EXIT_PARTIAL
 
-        snapshot_system_info(evidence_dir)
-        snapshot_network(evidence_dir)
-        snapshot_filesystems(evidence_dir)
+    evidence_dir: Optional[Path] = None
+    try:
+        if store_root:
+            # Snapshots are staged in a scratch directory, then stored.
+            evidence_dir = Path(tempfile.mkdtemp(prefix="config-snapshot-"))
+        else:
+            timestamp = datetime.datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+            evidence_dir = output_dir / f"config-snapshot-{timestamp}"
+            evidence_dir.mkdir(parents=True, exist_ok=True)
+            logging.info("Created evidence directory: %s", evidence_dir)
+
+        run = collect_snapshots(
+            evidence_dir,
+            specs,
+            workers,
+            command_timeout,
+            timeout_overrides,
+            stable_content=bool(store_root),
+        )
+        log_run_summary(run)
 
-        if not skip_packages:
-            snapshot_installed_packages(evidence_dir)
+        if store_root:
+            store_run(store_root, evidence_dir, run, skip_packages)
         else:
-            logging.info("Skipping installed packages snapshot as requested.")
+            write_run_manifest(evidence_dir, run)
 
+        if run["status"] != "ok":
+            logging.error("Configuration evidence collection completed with failed snapshots.")
+            return EXIT_PARTIAL
         logging.info("Configuration evidence collection completed successfully.")
         return 0
     except Exception as exc:  # noqa: BLE001
         logging.exception("Unexpected error during config collection: %s", exc)
         return 1
+    finally:
+        if store_root and evidence_dir is not None:
+            shutil.rmtree(evidence_dir, ignore_errors=True)
 
 
 if __name__ == "__main__":
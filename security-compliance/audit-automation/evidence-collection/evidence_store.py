@@ -0,0 +1,522 @@
+"""
+evidence_store.py
+
+Content-addressed evidence store shared by the evidence collectors:
+- collect-configs.py
+- collect-change-records.py
+
+Layout under the store root:
+- blobs/sha256/<ab>/<digest>.gz: gzip-compressed evidence, named by the
+  SHA-256 of the uncompressed content, so identical evidence from any run
+  or host is stored once
+- manifests/<category>/<YYYYMMDD>/<run_id>.json: one manifest per
+  collector run, listing each evidence file by name, digest and size,
+  plus run metadata
+- store.lock: shared while collectors add blobs, exclusive while garbage
+  collection deletes them
+
+A run whose evidence did not change costs only its manifest. Retention
+(evidence-retention-policy.yaml) is applied to manifests by category;
+blobs that no remaining manifest references are then garbage collected.
+See manage-evidence-store.py.
+
+The scripts in this directory import this module by name; it is resolved
+from the script directory, so no installation step is required.
+"""
+
+import ast
+import contextlib
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import platform
+import re
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - only needed for retention
+    yaml = None  # type: ignore
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no store locking on Windows
+    fcntl = None  # type: ignore
+
+MANIFEST_VERSION = 1
+
+# Bytes read from evidence at a time while hashing and compressing.
+READ_CHUNK_BYTES = 1 << 20
+
+# gzip level for blobs; evidence is mostly text and compresses well.
+COMPRESS_LEVEL = 6
+
+# Unreferenced blobs younger than this are kept by garbage collection, so
+# a collector that has stored blobs but not yet written its manifest is
+# not raced.
+DEFAULT_GC_GRACE_SECONDS = 24 * 3600
+
+
+class EvidenceStoreError(RuntimeError):
+    """Raised when the evidence store or retention policy cannot be used."""
+
+
+# -----------------------------
+# Manifests
+# -----------------------------
+
+@dataclass
+class ManifestEntry:
+    """One evidence file of a run."""
+    name: str
+    sha256: str
+    size: int
+    source: Optional[str] = None
+
+
+@dataclass
+class RunManifest:
+    """The evidence collected by one collector run."""
+    run_id: str
+    category: str
+    collector: str
+    created_at_utc: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    entries: List[ManifestEntry] = field(default_factory=list)
+
+    @property
+    def created_at(self) -> datetime.datetime:
+        return parse_utc(self.created_at_utc)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["version"] = MANIFEST_VERSION
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RunManifest":
+        if data.get("version") != MANIFEST_VERSION:
+            raise EvidenceStoreError(f"Unsupported manifest version: {data.get('version')!r}")
+        return cls(
+            run_id=data["run_id"],
+            category=data["category"],
+            collector=data["collector"],
+            created_at_utc=data["created_at_utc"],
+            metadata=data.get("metadata") or {},
+            entries=[ManifestEntry(**entry) for entry in data.get("entries", [])],
+        )
+
+
+def parse_utc(value: str) -> datetime.datetime:
+    """Parse an ISO 8601 UTC timestamp as written in manifests."""
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def new_run_manifest(
+    category: str,
+    collector: str,
+    metadata: Optional[Dict[str, Any]] = None,
+    host: Optional[str] = None,
+) -> RunManifest:
+    """Start a manifest for a run beginning now."""
+    now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    host = re.sub(r"[^A-Za-z0-9_.-]+", "_", host or platform.node() or "unknown")
+    run_id = f"{now.strftime('%Y%m%d-%H%M%S')}-{host}-{uuid.uuid4().hex[:8]}"
+    return RunManifest(
+        run_id=run_id,
+        category=category,
+        collector=collector,
+        created_at_utc=now.isoformat().replace("+00:00", "Z"),
+        metadata=dict(metadata or {}),
+    )
+
+
+# -----------------------------
+# Store
+# -----------------------------
+
+class EvidenceStore:
+    """A content-addressed evidence store rooted at a directory."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs" / "sha256"
+        self.manifest_dir = self.root / "manifests"
+        self.tmp_dir = self.root / "tmp"
+        self.lock_path = self.root / "store.lock"
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        """
+        Hold the store lock: shared while a collector adds or refreshes a
+        blob, exclusive while garbage collection deletes blobs.
+        """
+        if fcntl is None:
+            yield
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a") as fh:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.gz"
+
+    def has_blob(self, digest: str) -> bool:
+        return self.blob_path(digest).exists()
+
+    def put_stream(self, fh: BinaryIO) -> Tuple[str, int]:
+        """
+        Store the rest of a binary stream; return its digest and size.
+
+        Content is hashed and compressed in one pass, so a file that grows
+        while it is read is still stored consistently with its digest. If
+        the blob already exists, only its mtime is refreshed; this happens
+        under the shared store lock, so garbage collection cannot delete
+        the blob in between.
+        """
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir, prefix="blob-", suffix=".gz")
+        tmp_path = Path(tmp_name)
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(
+                filename="", mode="wb", fileobj=raw, compresslevel=COMPRESS_LEVEL, mtime=0
+            ) as out:
+                while True:
+                    chunk = fh.read(READ_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            hexdigest = digest.hexdigest()
+            blob = self.blob_path(hexdigest)
+            with self._locked(exclusive=False):
+                if blob.exists():
+                    os.utime(blob)
+                    tmp_path.unlink()
+                else:
+                    blob.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(tmp_path, blob)
+            return hexdigest, size
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def put_file(self, path: Path) -> Tuple[str, int]:
+        """Store a file's content; return its digest and size."""
+        with Path(path).open("rb") as fh:
+            return self.put_stream(fh)
+
+    def add_file(
+        self,
+        manifest: RunManifest,
+        name: str,
+        path: Path,
+        source: Optional[str] = None,
+    ) -> ManifestEntry:
+        """Store a file and record it in the manifest under `name`."""
+        digest, size = self.put_file(path)
+        entry = ManifestEntry(name=name, sha256=digest, size=size, source=source)
+        manifest.entries.append(entry)
+        return entry
+
+    def add_stream(
+        self,
+        manifest: RunManifest,
+        name: str,
+        fh: BinaryIO,
+        source: Optional[str] = None,
+    ) -> ManifestEntry:
+        """Store the rest of a stream and record it in the manifest under `name`."""
+        digest, size = self.put_stream(fh)
+        entry = ManifestEntry(name=name, sha256=digest, size=size, source=source)
+        manifest.entries.append(entry)
+        return entry
+
+    def open_blob(self, digest: str) -> BinaryIO:
+        """Open a blob for reading its uncompressed content."""
+        path = self.blob_path(digest)
+        if not path.exists():
+            raise EvidenceStoreError(f"Missing blob {digest}")
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+
+    # Manifests
+
+    def manifest_path(self, manifest: RunManifest) -> Path:
+        day = manifest.created_at.strftime("%Y%m%d")
+        return self.manifest_dir / manifest.category / day / f"{manifest.run_id}.json"
+
+    def write_manifest(self, manifest: RunManifest, path: Optional[Path] = None) -> Path:
+        """
+        Atomically write a manifest (temp file, fsync, rename), to its
+        standard location unless `path` is given.
+
+        Write it only after all of its blobs are stored.
+        """
+        path = path or self.manifest_path(manifest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as fh:
+            json.dump(manifest.to_dict(), fh, indent=2)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+        return path
+
+    def iter_manifests(
+        self,
+        category: Optional[str] = None,
+        strict: bool = False,
+    ) -> Iterator[Tuple[Path, RunManifest]]:
+        """
+        Yield (path, manifest) for every readable manifest, oldest day first.
+
+        Unreadable manifests are logged and skipped, or with `strict` raise
+        EvidenceStoreError.
+        """
+        roots = [self.manifest_dir / category] if category else sorted(self.manifest_dir.glob("*"))
+        for root in roots:
+            for path in sorted(root.glob("*/*.json")):
+                try:
+                    with path.open("r", encoding="utf-8") as fh:
+                        manifest = RunManifest.from_dict(json.load(fh))
+                except Exception as exc:  # noqa: BLE001
+                    if strict:
+                        raise EvidenceStoreError(f"Unreadable manifest {path}: {exc}") from exc
+                    logging.error("Skipping unreadable manifest %s: %s", path, exc)
+                    continue
+                yield path, manifest
+
+    def find_manifest(self, run_id: str) -> Tuple[Path, RunManifest]:
+        for path, manifest in self.iter_manifests():
+            if manifest.run_id == run_id:
+                return path, manifest
+        raise EvidenceStoreError(f"No manifest for run {run_id}")
+
+    def delete_manifest(self, path: Path) -> None:
+        path.unlink()
+        try:
+            path.parent.rmdir()  # drop the day directory once it is empty
+        except OSError:
+            pass
+
+    # Garbage collection
+
+    def referenced_digests(self) -> Set[str]:
+        """
+        Digests referenced by any manifest.
+
+        Raises EvidenceStoreError if a manifest cannot be read: its blobs
+        would otherwise look unreferenced.
+        """
+        digests: Set[str] = set()
+        for _path, manifest in self.iter_manifests(strict=True):
+            digests.update(entry.sha256 for entry in manifest.entries)
+        return digests
+
+    def collect_garbage(
+        self,
+        grace_seconds: float = DEFAULT_GC_GRACE_SECONDS,
+        dry_run: bool = True,
+    ) -> Tuple[int, int]:
+        """
+        Remove blobs no manifest references, and stale temporary files,
+        older than `grace_seconds`.
+
+        Returns the number of blobs and the compressed bytes removed (or
+        that would be removed with dry_run). Raises EvidenceStoreError,
+        removing nothing, if any manifest cannot be read.
+
+        Blobs are checked and deleted under the exclusive store lock. A
+        manifest written after the references were read only references
+        blobs its collector stored or refreshed just before, which are
+        inside the grace period.
+        """
+        referenced = self.referenced_digests()
+        cutoff = time.time() - grace_seconds
+        count = 0
+        freed = 0
+        with self._locked(exclusive=True):
+            for blob in self.blob_dir.glob("*/*.gz"):
+                if blob.name[: -len(".gz")] in referenced:
+                    continue
+                try:
+                    stat = blob.stat()
+                except FileNotFoundError:
+                    continue
+                if stat.st_mtime > cutoff:
+                    continue
+                count += 1
+                freed += stat.st_size
+                if not dry_run:
+                    blob.unlink()
+                    try:
+                        blob.parent.rmdir()
+                    except OSError:
+                        pass
+        if not dry_run:
+            for tmp in self.tmp_dir.glob("blob-*"):
+                if tmp.stat().st_mtime <= cutoff:
+                    tmp.unlink(missing_ok=True)
+        return count, freed
+
+
+def store_directory(
+    store: EvidenceStore,
+    directory: Path,
+    manifest: RunManifest,
+) -> Path:
+    """
+    Store every file under `directory` (names relative to it) and write the
+    manifest; returns the manifest path.
+    """
+    directory = Path(directory)
+    for path in sorted(p for p in directory.rglob("*") if p.is_file()):
+        store.add_file(manifest, path.relative_to(directory).as_posix(), path)
+    return store.write_manifest(manifest)
+
+
+def restore_manifest(store: EvidenceStore, manifest: RunManifest, destination: Path) -> int:
+    """
+    Write a run's evidence files under `destination`, verifying each
+    digest; returns the number of files written.
+    """
+    destination = Path(destination).resolve()
+    for entry in manifest.entries:
+        target = (destination / entry.name).resolve()
+        if destination not in target.parents:
+            raise EvidenceStoreError(f"Refusing to restore {entry.name!r} outside {destination}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        with store.open_blob(entry.sha256) as blob, target.open("wb") as out:
+            while True:
+                chunk = blob.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        if digest.hexdigest() != entry.sha256:
+            raise EvidenceStoreError(f"Blob {entry.sha256} is corrupt (restoring {entry.name})")
+    return len(manifest.entries)
+
+
+# -----------------------------
+# Retention
+# -----------------------------
+
+_CONDITION_RE = re.compile(r"^\s*(\w+)\s*(==|!=|not in|in)\s*(.+?)\s*$")
+
+
+def condition_matches(condition: str, metadata: Dict[str, Any]) -> bool:
+    """
+    Evaluate a policy exception condition against run metadata.
+
+    Supported forms: "<field> == <value>", "<field> != <value>",
+    "<field> in [<values>]" and "<field> not in [<values>]", with Python or
+    YAML-style literals (null, true, false). A condition that cannot be
+    parsed is treated as matching, which only ever retains evidence longer.
+    """
+    match = _CONDITION_RE.match(condition or "")
+    literal_text = match.group(3) if match else ""
+    literal_text = re.sub(r"\bnull\b", "None", literal_text)
+    literal_text = re.sub(r"\btrue\b", "True", literal_text)
+    literal_text = re.sub(r"\bfalse\b", "False", literal_text)
+    try:
+        expected = ast.literal_eval(literal_text)
+    except (ValueError, SyntaxError):
+        match = None
+    if match is None:
+        logging.warning("Cannot evaluate retention condition %r; treating it as matching.", condition)
+        return True
+
+    value = metadata.get(match.group(1))
+    operator = match.group(2)
+    if operator == "==":
+        return value == expected
+    if operator == "!=":
+        return value != expected
+    members = expected if isinstance(expected, (list, tuple, set)) else [expected]
+    return (value in members) == (operator == "in")
+
+
+@dataclass
+class RetentionDecision:
+    """Whether a run's evidence has outlived its retention."""
+    retention_days: int
+    expired: bool
+    deletable: bool
+    reasons: List[str]
+
+
+class RetentionPolicy:
+    """Retention rules from evidence-retention-policy.yaml."""
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        defaults = data.get("defaults") or {}
+        self.minimum_retention_days = int(defaults.get("minimum_retention_days", 0))
+        self.allow_automatic_deletion = bool(defaults.get("allow_automatic_deletion", False))
+        self.categories: Dict[str, Dict[str, Any]] = data.get("categories") or {}
+        self.exceptions: List[Dict[str, Any]] = data.get("exceptions") or []
+
+    def decide(self, manifest: RunManifest, now: datetime.datetime) -> RetentionDecision:
+        """
+        Apply the category retention (never below the policy minimum) and
+        any exceptions whose condition matches the run metadata.
+
+        Runs of categories the policy does not know are never expired.
+        """
+        reasons: List[str] = []
+        category = self.categories.get(manifest.category)
+        if category is None:
+            return RetentionDecision(0, False, False, [f"unknown category {manifest.category!r}"])
+
+        retention_days = max(int(category.get("retention_days", 0)), self.minimum_retention_days)
+        deletable = self.allow_automatic_deletion
+        for exception in self.exceptions:
+            if not condition_matches(exception.get("condition", ""), manifest.metadata):
+                continue
+            override = exception.get("override") or {}
+            reasons.append(str(exception.get("name", exception.get("condition"))))
+            if "minimum_retention_days" in override:
+                retention_days = max(retention_days, int(override["minimum_retention_days"]))
+            if override.get("allow_automatic_deletion") is False or override.get("require_legal_approval"):
+                deletable = False
+
+        age = now - manifest.created_at
+        expired = age >= datetime.timedelta(days=retention_days)
+        return RetentionDecision(retention_days, expired, deletable, reasons)
+
+
+def load_retention_policy(path: Path) -> RetentionPolicy:
+    """Load a retention policy YAML file."""
+    if yaml is None:
+        raise EvidenceStoreError(
+            "PyYAML is required to read the retention policy. Install with `pip install pyyaml`."
+        )
+    try:
+        with Path(path).open("r", encoding="utf-8") as fh:
+            data = yaml.safe_load(fh) or {}
+    except (OSError, yaml.YAMLError) as exc:
+        raise EvidenceStoreError(f"Failed to load retention policy {path}: {exc}") from exc
+    if not isinstance(data, dict):
+        raise EvidenceStoreError(f"Retention policy {path} must be a mapping.")
+    return RetentionPolicy(data)
@@ -0,0 +1,368 @@
+"""
+fleet_transport.py
+
+Command transports for collect-configs.py, so the same snapshots can run
+against the local machine or against a fleet of hosts:
+- LocalTransport: runs commands on this machine; in fleet mode it is also
+  the stand-in transport for exercising a fleet run without real hosts
+- SshTransport: runs commands on a remote host with the OpenSSH client,
+  multiplexing every command of a host over one ControlMaster connection
+  so only the first command pays for the SSH handshake
+
+Also provides inventory file parsing and a rate limiter for new
+connections.
+
+Commands that time out are killed together with their process group. Over
+SSH this closes the channel; a remote command that ignores the hangup may
+keep running on the host.
+
+The scripts in this directory import this module by name; it is resolved
+from the script directory, so no installation step is required.
+"""
+
+import math
+import os
+import platform
+import shlex
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+TRANSPORT_CHOICES = ("ssh", "local")
+
+# Seconds to wait for a timed-out command to exit after it is killed. A
+# process blocked on a dead NFS mount may never exit; it is then abandoned.
+KILL_GRACE_SECONDS = 5.0
+
+# Exit status of the ssh client when the connection itself failed (a
+# remote command can exit with it too).
+SSH_CONNECTION_ERROR = 255
+
+# Seconds an idle ControlMaster connection stays open. ControlPersist
+# keeps the master in the background between a host's commands; close()
+# ends it once the collection attempt is done, so this only bounds how long
+# a master outlives a collector that died without closing it.
+SSH_CONTROL_PERSIST_SECONDS = 60
+
+# Shell script printing, one per line, the fields of a system-info
+# snapshot (as platform.* reports them locally).
+REMOTE_SYSTEM_INFO_SCRIPT = (
+    "uname -s; uname -n; uname -r; uname -v; uname -m; "
+    "p=$(uname -p 2>/dev/null); [ \"$p\" = unknown ] && p=; echo \"$p\"; "
+    "python3 -c 'import platform; print(platform.python_version())' 2>/dev/null || echo unknown"
+)
+SYSTEM_INFO_FIELDS = ("System", "Node", "Release", "Version", "Machine", "Processor", "Python Version")
+
+
+class TransportError(RuntimeError):
+    """Raised when a transport cannot reach its host."""
+
+
+@dataclass
+class CommandOutput:
+    """Result of one command."""
+    stdout: str
+    stderr: str
+    returncode: Optional[int]
+    timed_out: bool = False
+
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    """Kill a command started in its own session, including its children."""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        process.kill()
+
+
+def execute(argv: Sequence[str], timeout: Optional[float]) -> CommandOutput:
+    """
+    Run a local process, killing its process group after `timeout` seconds.
+
+    On timeout, whatever output was read is returned with timed_out set.
+    Raises OSError if the process cannot be started.
+    """
+    process = subprocess.Popen(
+        list(argv),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+        return CommandOutput(stdout, stderr, process.returncode)
+    except subprocess.TimeoutExpired:
+        kill_process_group(process)
+        try:
+            stdout, stderr = process.communicate(timeout=KILL_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            stdout, stderr = "", f"process {process.pid} did not exit after being killed"
+        return CommandOutput(stdout or "", stderr or "", process.returncode, timed_out=True)
+
+
+# -----------------------------
+# Transports
+# -----------------------------
+
+class Transport:
+    """Runs snapshot commands on one host."""
+
+    name = "localhost"
+
+    # Set when the connection to the host failed during a collection.
+    connection_lost = False
+
+    def argv(self, command: Sequence[str]) -> List[str]:
+        """The local process that runs `command` on the host."""
+        return list(command)
+
+    def describe(self, command: Sequence[str]) -> str:
+        return " ".join(command)
+
+    def run(self, command: Sequence[str], timeout: Optional[float]) -> CommandOutput:
+        return execute(self.argv(command), timeout)
+
+    def connect(self, timeout: Optional[float]) -> None:
+        """Make sure the host is reachable; raise TransportError if not."""
+        self.connection_lost = False
+
+    def close(self) -> None:
+        """Release the connection to the host."""
+
+    def which(self, command: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def system_info(self) -> Dict[str, str]:
+        raise NotImplementedError
+
+
+class LocalTransport(Transport):
+    """
+    Runs commands on this machine.
+
+    Fleet mode (--transport local, or transport=local in the inventory)
+    uses it as a stand-in for a remote host, under that host's name.
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name or platform.node() or "localhost"
+
+    def which(self, command: str) -> Optional[str]:
+        return shutil.which(command)
+
+    def system_info(self) -> Dict[str, str]:
+        return {
+            "System": platform.system(),
+            "Node": platform.node(),
+            "Release": platform.release(),
+            "Version": platform.version(),
+            "Machine": platform.machine(),
+            "Processor": platform.processor(),
+            "Python Version": platform.python_version(),
+        }
+
+
+class SshTransport(Transport):
+    """
+    Runs commands on a remote host with the OpenSSH client.
+
+    All commands share one ControlMaster connection (socket in
+    `control_dir`), so each command is a new session on an established
+    connection rather than a new SSH handshake. Authentication must be
+    non-interactive (BatchMode), e.g. keys or an agent.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        address: str,
+        control_dir: Path,
+        user: Optional[str] = None,
+        port: Optional[int] = None,
+        options: Sequence[str] = (),
+        connect_timeout: float = 10.0,
+    ) -> None:
+        self.name = name
+        self.address = address
+        self.user = user
+        self.port = port
+        self.options = list(options)
+        self.connect_timeout = connect_timeout
+        self.control_dir = Path(control_dir)
+
+    def _ssh(self, *extra: str) -> List[str]:
+        argv = [
+            "ssh",
+            "-o", "BatchMode=yes",
+            # OpenSSH only accepts whole seconds.
+            "-o", f"ConnectTimeout={max(1, math.ceil(self.connect_timeout))}",
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self.control_dir / '%C'}",
+            "-o", f"ControlPersist={SSH_CONTROL_PERSIST_SECONDS}",
+            *self.options,
+        ]
+        if self.port:
+            argv += ["-p", str(self.port)]
+        if self.user:
+            argv += ["-l", self.user]
+        return argv + list(extra) + [self.address]
+
+    def argv(self, command: Sequence[str]) -> List[str]:
+        return self._ssh() + ["--", shlex.join(command)]
+
+    def describe(self, command: Sequence[str]) -> str:
+        return f"{self.name}: {' '.join(command)}"
+
+    def run(self, command: Sequence[str], timeout: Optional[float]) -> CommandOutput:
+        output = super().run(command, timeout)
+        # 255 may also be the remote command's own status; the connection
+        # is lost only if the master connection is gone too.
+        if output.returncode == SSH_CONNECTION_ERROR and not self.master_alive():
+            self.connection_lost = True
+        return output
+
+    def master_alive(self) -> bool:
+        """Whether the ControlMaster connection is still up (ssh -O check)."""
+        try:
+            output = execute(self._ssh("-O", "check"), KILL_GRACE_SECONDS)
+        except OSError:
+            return False
+        return output.returncode == 0 and not output.timed_out
+
+    def connect(self, timeout: Optional[float]) -> None:
+        """Open (or reuse) the master connection."""
+        super().connect(timeout)
+        output = execute(self.argv(["true"]), timeout)
+        if output.timed_out or output.returncode != 0:
+            detail = output.stderr.strip() or (
+                "timed out" if output.timed_out else f"ssh exited with {output.returncode}"
+            )
+            raise TransportError(f"Cannot connect to {self.name}: {detail}")
+
+    def close(self) -> None:
+        try:
+            execute(self._ssh("-O", "exit"), KILL_GRACE_SECONDS)
+        except OSError:
+            pass
+
+    def which(self, command: str) -> Optional[str]:
+        output = self.run(["sh", "-c", f"command -v {shlex.quote(command)}"], self.connect_timeout)
+        path = output.stdout.strip()
+        return path if output.returncode == 0 and path else None
+
+    def system_info(self) -> Dict[str, str]:
+        output = self.run(["sh", "-c", REMOTE_SYSTEM_INFO_SCRIPT], self.connect_timeout)
+        if output.returncode != 0:
+            raise TransportError(
+                f"Cannot read system information from {self.name}: {output.stderr.strip()}"
+            )
+        values = output.stdout.splitlines()
+        values += [""] * (len(SYSTEM_INFO_FIELDS) - len(values))
+        return dict(zip(SYSTEM_INFO_FIELDS, values))
+
+
+# -----------------------------
+# Inventory
+# -----------------------------
+
+@dataclass
+class InventoryHost:
+    """One host of an inventory file."""
+    name: str
+    address: str
+    user: Optional[str] = None
+    port: Optional[int] = None
+    transport: Optional[str] = None
+    ssh_options: List[str] = field(default_factory=list)
+
+
+INVENTORY_KEYS = ("user", "port", "transport", "address", "ssh_options")
+
+
+def parse_inventory_line(line: str) -> Optional[InventoryHost]:
+    """
+    Parse one inventory line: "[user@]host[:port] [key=value ...]".
+
+    Keys: user, port, transport (ssh or local), address (connect to this
+    instead of the host name) and ssh_options (quoted ssh arguments).
+    Blank lines and # comments yield None.
+    """
+    tokens = shlex.split(line, comments=True)
+    if not tokens:
+        return None
+    target, settings = tokens[0], tokens[1:]
+    user, _, host = target.rpartition("@")
+    port: Optional[int] = None
+    if host.count(":") == 1:
+        host, port_text = host.split(":")
+        port = int(port_text)
+    entry = InventoryHost(name=host, address=host, user=user or None, port=port)
+
+    for setting in settings:
+        key, sep, value = setting.partition("=")
+        if not sep or key not in INVENTORY_KEYS:
+            raise ValueError(f"unknown setting {setting!r} (expected one of {', '.join(INVENTORY_KEYS)})")
+        if key == "port":
+            entry.port = int(value)
+        elif key == "transport":
+            if value not in TRANSPORT_CHOICES:
+                raise ValueError(f"unknown transport {value!r}")
+            entry.transport = value
+        elif key == "ssh_options":
+            entry.ssh_options = shlex.split(value)
+        else:
+            setattr(entry, key, value)
+    return entry
+
+
+def load_inventory(path: Path) -> List[InventoryHost]:
+    """
+    Read an inventory file, one host per line.
+
+    Raises ValueError (with the line number) on a malformed line or a
+    duplicate host name.
+    """
+    hosts: List[InventoryHost] = []
+    seen = set()
+    with Path(path).open("r", encoding="utf-8") as fh:
+        for line_number, line in enumerate(fh, start=1):
+            try:
+                host = parse_inventory_line(line)
+            except ValueError as exc:
+                raise ValueError(f"{path}:{line_number}: {exc}") from exc
+            if host is None:
+                continue
+            if host.name in seen:
+                raise ValueError(f"{path}:{line_number}: duplicate host {host.name!r}")
+            seen.add(host.name)
+            hosts.append(host)
+    return hosts
+
+
+# -----------------------------
+# Rate limiting
+# -----------------------------
+
+class RateLimiter:
+    """Spaces out events to at most `rate` per second across threads; 0 disables."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
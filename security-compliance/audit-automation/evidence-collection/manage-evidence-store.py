@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+manage-evidence-store.py
+
+Maintains the content-addressed evidence store written by the evidence
+collectors (see evidence_store.py):
+- list: show the runs recorded in the store
+- restore: write a run's evidence files back out to a directory
+- label: set metadata on a run (e.g. case_id for a legal hold)
+- prune: apply evidence-retention-policy.yaml to run manifests, then
+  garbage collect blobs no remaining manifest references
+
+Pruning is a dry run unless --apply is given, and even then deletes only
+runs the policy allows to be deleted automatically.
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from evidence_store import (
+    DEFAULT_GC_GRACE_SECONDS,
+    EvidenceStore,
+    EvidenceStoreError,
+    load_retention_policy,
+    restore_manifest,
+)
+
+DEFAULT_POLICY_FILE = str(Path(__file__).resolve().parent / "evidence-retention-policy.yaml")
+DEFAULT_LOG_LEVEL = "INFO"
+
+
+# -----------------------------
+# Logging setup
+# -----------------------------
+
+def setup_logging(level: str) -> None:
+    """Configure root logger."""
+    numeric_level = getattr(logging, level.upper(), logging.INFO)
+    logging.basicConfig(
+        level=numeric_level,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
+
+# -----------------------------
+# Commands
+# -----------------------------
+
+def cmd_list(store: EvidenceStore, args: argparse.Namespace) -> int:
+    """Print one line per run: created time, category, run id, files, bytes."""
+    for _path, manifest in store.iter_manifests(args.category):
+        size = sum(entry.size for entry in manifest.entries)
+        print(
+            f"{manifest.created_at_utc}  {manifest.category:<16} {manifest.run_id}  "
+            f"{len(manifest.entries)} files  {size} bytes"
+        )
+    return 0
+
+
+def cmd_restore(store: EvidenceStore, args: argparse.Namespace) -> int:
+    """Restore a run's evidence files."""
+    _path, manifest = store.find_manifest(args.run_id)
+    count = restore_manifest(store, manifest, Path(args.destination))
+    logging.info("Restored %d evidence files of %s to %s", count, manifest.run_id, args.destination)
+    return 0
+
+
+def cmd_label(store: EvidenceStore, args: argparse.Namespace) -> int:
+    """Set (or with an empty value, remove) metadata keys on a run."""
+    path, manifest = store.find_manifest(args.run_id)
+    for label in args.labels:
+        key, sep, value = label.partition("=")
+        if not sep or not key:
+            logging.error("Labels must be KEY=VALUE, got %r", label)
+            return 1
+        if value:
+            manifest.metadata[key] = value
+        else:
+            manifest.metadata.pop(key, None)
+    store.write_manifest(manifest, path)
+    logging.info("Updated metadata of %s: %s", manifest.run_id, json.dumps(manifest.metadata))
+    return 0
+
+
+def cmd_prune(store: EvidenceStore, args: argparse.Namespace) -> int:
+    """Delete expired run manifests, then unreferenced blobs."""
+    policy = load_retention_policy(Path(args.policy))
+    now = datetime.datetime.now(datetime.timezone.utc)
+    dry_run = not args.apply
+
+    expired = 0
+    deleted = 0
+    # Strict: an unreadable manifest (e.g. written by a newer version)
+    # stops the prune rather than being silently passed over.
+    for path, manifest in store.iter_manifests(args.category, strict=True):
+        decision = policy.decide(manifest, now)
+        if not decision.expired:
+            continue
+        expired += 1
+        if not decision.deletable:
+            logging.info(
+                "Retaining expired run %s (%s, %d days): automatic deletion not allowed%s",
+                manifest.run_id,
+                manifest.category,
+                decision.retention_days,
+                f" ({', '.join(decision.reasons)})" if decision.reasons else "",
+            )
+            continue
+        logging.info(
+            "%s expired run %s (%s, %d days)",
+            "Would delete" if dry_run else "Deleting",
+            manifest.run_id,
+            manifest.category,
+            decision.retention_days,
+        )
+        if not dry_run:
+            store.delete_manifest(path)
+        deleted += 1
+
+    # In a dry run, blobs of runs that would be deleted are still referenced.
+    try:
+        blobs, freed = store.collect_garbage(args.grace_hours * 3600, dry_run=dry_run)
+    except EvidenceStoreError as exc:
+        logging.error("Garbage collection aborted, no blobs removed: %s", exc)
+        return 1
+    logging.info(
+        "%s: %d expired runs, %d %s; %d unreferenced blobs (%d bytes) %s.",
+        "Dry run" if dry_run else "Pruned",
+        expired,
+        deleted,
+        "deletable" if dry_run else "deleted",
+        blobs,
+        freed,
+        "would be removed" if dry_run else "removed",
+    )
+    return 0
+
+
+# -----------------------------
+# Arguments and main
+# -----------------------------
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="List, restore, label and prune runs in the evidence store."
+    )
+    parser.add_argument("store", help="Evidence store root directory.")
+    parser.add_argument(
+        "--log-level",
+        default=DEFAULT_LOG_LEVEL,
+        help="Log level (DEBUG, INFO, WARNING, ERROR) (default: INFO)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_p = subparsers.add_parser("list", help="List recorded runs.")
+    list_p.add_argument("--category", help="Only runs of this category (e.g. configs).")
+    list_p.set_defaults(func=cmd_list)
+
+    restore_p = subparsers.add_parser("restore", help="Restore a run's evidence files.")
+    restore_p.add_argument("run_id", help="Run id, as shown by list.")
+    restore_p.add_argument("destination", help="Directory to write the evidence files to.")
+    restore_p.set_defaults(func=cmd_restore)
+
+    label_p = subparsers.add_parser(
+        "label", help="Set run metadata evaluated by retention exceptions (KEY= removes KEY)."
+    )
+    label_p.add_argument("run_id", help="Run id, as shown by list.")
+    label_p.add_argument("labels", nargs="+", metavar="KEY=VALUE")
+    label_p.set_defaults(func=cmd_label)
+
+    prune_p = subparsers.add_parser("prune", help="Apply the retention policy.")
+    prune_p.add_argument(
+        "--policy",
+        default=DEFAULT_POLICY_FILE,
+        help="Retention policy YAML (default: evidence-retention-policy.yaml next to this script)",
+    )
+    prune_p.add_argument("--category", help="Only prune runs of this category.")
+    prune_p.add_argument(
+        "--grace-hours",
+        type=float,
+        default=DEFAULT_GC_GRACE_SECONDS / 3600,
+        help="Keep unreferenced blobs younger than this (default: %(default)s)",
+    )
+    prune_p.add_argument(
+        "--apply",
+        action="store_true",
+        help="Delete expired runs and blobs; without it, only report.",
+    )
+    prune_p.set_defaults(func=cmd_prune)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    setup_logging(args.log_level)
+
+    store = EvidenceStore(Path(args.store))
+    if not store.root.is_dir():
+        logging.error("Evidence store not found: %s", store.root)
+        return 1
+    try:
+        return args.func(store, args)
+    except EvidenceStoreError as exc:
+        logging.error("%s", exc)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())